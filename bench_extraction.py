@@ -0,0 +1,106 @@
+"""Micro-benchmark: per-entity graph lookups vs. the single-pass OntologyGraphIndex
+
+    python bench_extraction.py --properties 100000
+"""
+import argparse
+import time
+from typing import Callable, Dict, List
+
+from rdflib import BNode, Graph, Literal, Namespace, OWL, RDF, RDFS, XSD
+
+from owl_to_python import OntologyGraphIndex, OwlToPythonConverter
+
+EX = Namespace("http://example.org/ontology#")
+
+
+def build_graph(properties: int, per_class: int) -> Graph:
+    g = Graph()
+    classes = max(1, properties // per_class)
+    for i in range(classes):
+        cls = EX[f"Class{i}"]
+        g.add((cls, RDF.type, OWL.Class))
+        g.add((cls, RDFS.comment, Literal(f"Class {i}", lang="en")))
+        if i:
+            g.add((cls, RDFS.subClassOf, EX[f"Class{(i - 1) // 2}"]))
+    for i in range(properties):
+        prop = EX[f"prop{i}"]
+        domain = EX[f"Class{i % classes}"]
+        if i % 3:
+            g.add((prop, RDF.type, OWL.DatatypeProperty))
+            g.add((prop, RDFS.range, XSD.integer))
+        else:
+            g.add((prop, RDF.type, OWL.ObjectProperty))
+            g.add((prop, RDFS.range, EX[f"Class{(i + 1) % classes}"]))
+        g.add((prop, RDFS.domain, domain))
+        g.add((prop, RDFS.comment, Literal(f"Property {i}", lang="en")))
+        if i % 5 == 0:
+            restriction = BNode()
+            g.add((restriction, RDF.type, OWL.Restriction))
+            g.add((restriction, OWL.onProperty, prop))
+            g.add((restriction, OWL.maxCardinality, Literal(4, datatype=XSD.nonNegativeInteger)))
+            g.add((domain, RDFS.subClassOf, restriction))
+    return g
+
+
+def per_entity_lookups(g: Graph) -> List[Dict]:
+    """The previous extraction: several g.value probes for every class and property"""
+    records = []
+    for cls in g.subjects(RDF.type, OWL.Class):
+        records.append({
+            "uri": cls,
+            "parents": [p for p in g.objects(cls, RDFS.subClassOf) if not isinstance(p, BNode)],
+            "comment": g.value(cls, RDFS.comment)
+        })
+    for prop_type in (OWL.ObjectProperty, OWL.DatatypeProperty):
+        for prop in g.subjects(RDF.type, prop_type):
+            max_cardinality = None
+            for restriction in g.subjects(OWL.onProperty, prop):
+                value = g.value(restriction, OWL.maxCardinality)
+                if value is not None:
+                    max_cardinality = int(value)
+                    break
+            records.append({
+                "uri": prop,
+                "domain": g.value(prop, RDFS.domain),
+                "range": g.value(prop, RDFS.range),
+                "comment": g.value(prop, RDFS.comment),
+                "max_cardinality": max_cardinality
+            })
+    return records
+
+
+def single_pass(g: Graph) -> List[Dict]:
+    converter = OwlToPythonConverter()
+    index = OntologyGraphIndex(g)
+    converter._build_class_hierarchy(index)
+    return converter._extract_classes(index) + converter._extract_properties(index)
+
+
+def best_of(repeat: int, fn: Callable[[Graph], List[Dict]], g: Graph) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(g)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark class and property extraction")
+    parser.add_argument("--properties", type=int, default=100000)
+    parser.add_argument("--per-class", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    g = build_graph(args.properties, args.per_class)
+    print(f"graph: {len(g)} triples built in {time.perf_counter() - start:.2f}s")
+
+    lookups = best_of(args.repeat, per_entity_lookups, g)
+    indexed = best_of(args.repeat, single_pass, g)
+    print(f"per-entity lookups: {lookups:.3f}s")
+    print(f"single pass:        {indexed:.3f}s ({lookups / indexed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
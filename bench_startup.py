@@ -0,0 +1,93 @@
+"""Startup benchmark for the GUI and CLI entry points, based on `python -X importtime`
+
+    python bench_startup.py
+    python bench_startup.py ontology_app owl_to_java --repeat 10 --top 15
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ENTRY_POINTS = ("ontology_app", "converter", "owl_to_python", "owl_to_java", "owl_to_cpp", "ontology_targets",
+                "generate_app")
+
+HERE = Path(__file__).resolve().parent
+
+
+def import_profile(module: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """Import a module in a fresh interpreter; return wall time and (name, self_us, cumulative_us) rows"""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=HERE, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return wall, rows
+
+
+def measure(module: str, repeat: int, top: int) -> Dict:
+    walls = []
+    imports = []
+    rows = []
+    # The first run also writes bytecode caches; it is kept out of the statistics
+    import_profile(module)
+    for _ in range(repeat):
+        wall, rows = import_profile(module)
+        walls.append(wall)
+        imports.append(next(cumulative for name, _, cumulative in reversed(rows) if name == module))
+
+    loaded = {name for name, _, _ in rows}
+    return {
+        "module": module,
+        "wall_ms": statistics.median(walls) * 1000,
+        "import_ms": statistics.median(imports) / 1000,
+        "modules": len(rows),
+        "heavy": sorted(name for name in ("rdflib", "jinja2", "yaml", "semver", "hydra", "numpy") if name in loaded),
+        "top": [
+            {"module": name, "self_ms": self_us / 1000}
+            for name, self_us, _ in sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure interpreter startup and import cost of entry points")
+    parser.add_argument("modules", nargs="*", default=list(ENTRY_POINTS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports to list per module")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for module in args.modules:
+        try:
+            results.append(measure(module, args.repeat, args.top))
+        except RuntimeError as e:
+            print(str(e), file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for result in results:
+        print(f"{result['module']}: {result['wall_ms']:.0f} ms process, {result['import_ms']:.1f} ms import, "
+              f"{result['modules']} modules, heavy: {', '.join(result['heavy']) or '-'}")
+        for row in result["top"]:
+            print(f"    {row['self_ms']:8.1f} ms  {row['module']}")
+
+
+if __name__ == "__main__":
+    main()
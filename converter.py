@@ -1,14 +1,52 @@
-from rdflib import Graph, URIRef, Namespace, RDF, OWL, RDFS, XSD, Literal
+from rdflib import Graph, URIRef, BNode, Namespace, RDF, OWL, RDFS, XSD, Literal
+from collections import Counter
+from functools import partial
 from pathlib import Path
-import yaml
 import json
+import os
 import xml.etree.ElementTree as ET
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
+
+# (class name, snapshot, process): equal snapshots of a class produce the same triples
+SourceClass = Tuple[str, Any, Callable[[], None]]
+# Class name and its triples, as converted from one source fragment
+FragmentClass = Tuple[str, List[Tuple]]
+# (kind, property, value) as declared by one fragment, e.g. ('property_domain', 'name', 'Person')
+Declaration = Tuple[str, str, str]
+
+PROPERTY_TYPES = (OWL.ObjectProperty, OWL.DatatypeProperty)
+DECLARATION_KINDS = {RDFS.domain: 'property_domain', RDFS.range: 'property_range'}
+
+
+class OntologyConflict:
+    """Disagreement between source fragments merged into one ontology"""
+
+    def __init__(self, kind: str, name: str, sources: Dict[str, List[str]]):
+        # kind: duplicate_class, property_type, property_domain or property_range
+        self.kind = kind
+        self.name = name
+        # Source file -> what it declares (empty for duplicate classes)
+        self.sources = sources
+
+    def __str__(self) -> str:
+        if self.kind == 'duplicate_class':
+            return f"Class {self.name} is defined in {', '.join(self.sources)}"
+        declared = "; ".join(f"{source}: {', '.join(values)}" for source, values in self.sources.items())
+        return f"Property {self.name} has different {self.kind[len('property_'):]}s: {declared}"
+
 
 class OntologyConverter:
     def __init__(self):
         self.graph = Graph()
         self.base_ns = Namespace("http://example.org/ontology#")
+        self.progress: Optional[Callable[[str, int, int], None]] = None
+        self._triples: List[Tuple] = []
+        # State of the last conversion, used by update()
+        self._source: Optional[Path] = None
+        self._output: Optional[str] = None
+        self._snapshot: Dict[str, List[Any]] = {}
+        self._owned: Dict[str, List[Tuple]] = {}
+        self._owners: Optional[Counter] = None
         self._init_namespaces()
 
     def _init_namespaces(self):
@@ -19,25 +57,169 @@ class OntologyConverter:
         self.graph.add((self.base_ns["Ontology"], RDF.type, OWL.Ontology))
         self.graph.add((self.base_ns["Ontology"], OWL.versionInfo, Literal("1.0.0")))
 
-    def convert(self, input_file: str, output_owl: str, version: str = "1.0.0") -> None:
+    def convert(self, input_file: str, output_owl: str, version: str = "1.0.0",
+                progress: Optional[Callable[[str, int, int], None]] = None, incremental: bool = False) -> None:
+        """Convert a source file to OWL; incremental=True keeps the state update() needs"""
         path = Path(input_file)
+        self.progress = progress
         self.graph = Graph()
         self._init_namespaces()
         self.graph.set((self.base_ns["Ontology"], OWL.versionInfo, Literal(version)))
+        self._source = None
 
         if not path.exists():
             raise FileNotFoundError(f"File not found: {input_file}")
 
+        classes = self._read_classes(path)
+        self._snapshot = {}
+        self._owned = {}
+        self._owners = None
+        for done, (class_name, snapshot, process) in enumerate(classes):
+            self._report("classes", done, len(classes))
+            triples = self._collect(process)
+            if incremental:
+                self._snapshot.setdefault(class_name, []).append(snapshot)
+                self._owned.setdefault(class_name, []).extend(triples)
+            for triple in triples:
+                self.graph.add(triple)
+
+        self._report("serialize")
+        self._serialize(output_owl)
+        if incremental:
+            self._source = path.resolve()
+            self._output = output_owl
+
+    def convert_many(self, input_files: Iterable[str], output_owl: str, version: str = "1.0.0",
+                     progress: Optional[Callable[[str, int, int], None]] = None,
+                     max_workers: Optional[int] = None, strict: bool = False) -> List[OntologyConflict]:
+        """Merge source fragments converted in parallel; returns conflicts, or raises them with strict=True"""
+        paths = [Path(input_file) for input_file in input_files]
+        for path in paths:
+            if not path.exists():
+                raise FileNotFoundError(f"File not found: {path}")
+
+        self.progress = progress
+        self.graph = Graph()
+        self._init_namespaces()
+        self.graph.set((self.base_ns["Ontology"], OWL.versionInfo, Literal(version)))
+        # update() works on a single source; after a merge it starts over with a full conversion
+        self._source = None
+        self._snapshot = {}
+        self._owned = {}
+        self._owners = None
+
+        class_sources: Dict[str, List[str]] = {}
+        declarations: Dict[Tuple[str, str], Dict[str, Set[str]]] = {}
+        fragments = _convert_fragments(paths, max_workers)
+        for done, (path, (fragment, fragment_declarations)) in enumerate(zip(paths, fragments)):
+            self._report("fragments", done, len(paths))
+            source = str(path)
+            for class_name, triples in fragment:
+                sources = class_sources.setdefault(class_name, [])
+                if source not in sources:
+                    sources.append(source)
+                self.graph.addN((*triple, self.graph) for triple in triples)
+            for kind, name, value in fragment_declarations:
+                declarations.setdefault((kind, name), {}).setdefault(source, set()).add(value)
+
+        conflicts = [
+            OntologyConflict('duplicate_class', class_name, {source: [] for source in sources})
+            for class_name, sources in class_sources.items() if len(sources) > 1
+        ]
+        for (kind, name), sources in declarations.items():
+            if len(sources) > 1 and len({frozenset(values) for values in sources.values()}) > 1:
+                conflicts.append(OntologyConflict(
+                    kind, name, {source: sorted(values) for source, values in sources.items()}
+                ))
+        if conflicts and strict:
+            raise ValueError("Conflicting sources:\n" + "\n".join(str(conflict) for conflict in conflicts))
+
+        self._report("serialize")
+        self._serialize(output_owl)
+        return conflicts
+
+    def update(self, input_file: str, output_owl: str, version: str = "1.0.0",
+               progress: Optional[Callable[[str, int, int], None]] = None) -> Dict[str, List[str]]:
+        """Reconvert only the classes changed since the last update() and rewrite the OWL"""
+        path = Path(input_file)
+        if self._source is None or self._source != path.resolve():
+            self.convert(input_file, output_owl, version, progress, incremental=True)
+            return {'added': list(self._snapshot), 'changed': [], 'removed': []}
+
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {input_file}")
+
+        self.progress = progress
+        snapshot: Dict[str, List[Any]] = {}
+        processes: Dict[str, List[Callable[[], None]]] = {}
+        for class_name, class_snapshot, process in self._read_classes(path):
+            snapshot.setdefault(class_name, []).append(class_snapshot)
+            processes.setdefault(class_name, []).append(process)
+
+        added = [name for name in snapshot if name not in self._snapshot]
+        changed = [name for name in snapshot if name in self._snapshot and snapshot[name] != self._snapshot[name]]
+        removed = [name for name in self._snapshot if name not in snapshot]
+
+        # Build the new triples before touching the graph, so a bad class leaves it as it was
+        rebuilt = {}
+        for done, name in enumerate(added + changed):
+            self._report("classes", done, len(added) + len(changed))
+            rebuilt[name] = [triple for process in processes[name] for triple in self._collect(process)]
+
+        # A triple can be produced by several classes, e.g. the type of a shared property
+        owners = self._triple_owners()
+        for name in changed + removed:
+            for triple in self._owned.pop(name):
+                owners[triple] -= 1
+                if not owners[triple]:
+                    del owners[triple]
+                    self.graph.remove(triple)
+        for name, triples in rebuilt.items():
+            self._owned[name] = triples
+            for triple in triples:
+                if triple not in owners:
+                    self.graph.add(triple)
+                owners[triple] += 1
+        self._snapshot = snapshot
+
+        version_literal = Literal(version)
+        if (added or changed or removed or output_owl != self._output or not Path(output_owl).exists()
+                or self.graph.value(self.base_ns["Ontology"], OWL.versionInfo) != version_literal):
+            self.graph.set((self.base_ns["Ontology"], OWL.versionInfo, version_literal))
+            self._report("serialize")
+            self._serialize(output_owl)
+            self._output = output_owl
+        return {'added': added, 'changed': changed, 'removed': removed}
+
+    def _triple_owners(self) -> Counter:
+        if self._owners is None:
+            self._owners = Counter(triple for triples in self._owned.values() for triple in triples)
+        return self._owners
+
+    def _read_classes(self, path: Path) -> List[SourceClass]:
         if path.suffix == '.xml':
-            self._from_xml(path)
+            return self._from_xml(path)
         elif path.suffix in ('.yaml', '.yml'):
-            self._from_yaml(path)
+            return self._from_yaml(path)
         elif path.suffix == '.json':
-            self._from_json(path)
-        else:
-            raise ValueError(f"Unsupported format: {path.suffix}")
+            return self._from_json(path)
+        raise ValueError(f"Unsupported format: {path.suffix}")
 
-        self._serialize(output_owl)
+    def _collect(self, process: Callable[[], None]) -> List[Tuple]:
+        """Run process and return the triples it adds"""
+        self._triples = []
+        try:
+            process()
+            return self._triples
+        finally:
+            self._triples = []
+
+    def _add(self, triple: Tuple):
+        self._triples.append(triple)
+
+    def _report(self, stage: str, done: int = 0, total: int = 0):
+        if self.progress is not None:
+            self.progress(stage, done, total)
 
     def _serialize(self, output_path: str):
         try:
@@ -49,51 +231,61 @@ class OntologyConverter:
         except Exception as e:
             raise IOError(f"Error saving OWL: {str(e)}")
 
-    def _from_xml(self, file_path: Path):
+    def _from_xml(self, file_path: Path) -> List[SourceClass]:
         try:
             tree = ET.parse(file_path)
             root = tree.getroot()
-
-            for cls in root.findall('.//class'):
-                self._process_class(cls)
-
         except ET.ParseError as e:
             raise ValueError(f"XML parsing error: {str(e)}")
 
-    def _from_yaml(self, file_path: Path):
+        return [
+            (cls.get('name'), ET.tostring(cls), partial(self._process_class, cls))
+            for cls in root.findall('.//class')
+        ]
+
+    def _from_yaml(self, file_path: Path) -> List[SourceClass]:
+        import yaml
+
+        # libyaml's loader is several times faster on large sources when it is available
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                self._process_dict(data)
+                data = yaml.load(f, Loader=loader)
         except yaml.YAMLError as e:
             raise ValueError(f"YAML parsing error: {str(e)}")
+        return self._dict_classes(data)
 
-    def _from_json(self, file_path: Path):
+    def _from_json(self, file_path: Path) -> List[SourceClass]:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                self._process_dict(data)
         except json.JSONDecodeError as e:
             raise ValueError(f"JSON parsing error: {str(e)}")
+        return self._dict_classes(data)
 
-    def _process_dict(self, data: Dict[str, Any]):
+    def _dict_classes(self, data: Dict[str, Any]) -> List[SourceClass]:
         if not isinstance(data, dict):
             raise ValueError("Expected dictionary at document root")
 
-        for class_name, class_data in data.get('classes', {}).items():
-            class_uri = self.base_ns[class_name]
-            self.graph.add((class_uri, RDF.type, OWL.Class))
+        return [
+            (class_name, class_data, partial(self._process_dict_class, class_name, class_data))
+            for class_name, class_data in data.get('classes', {}).items()
+        ]
 
-            if 'parent' in class_data:
-                parent_uri = self.base_ns[class_data['parent']]
-                self.graph.add((class_uri, RDFS.subClassOf, parent_uri))
+    def _process_dict_class(self, class_name: str, class_data: Any):
+        class_uri = self.base_ns[class_name]
+        self._add((class_uri, RDF.type, OWL.Class))
+
+        if 'parent' in class_data:
+            parent_uri = self.base_ns[class_data['parent']]
+            self._add((class_uri, RDFS.subClassOf, parent_uri))
 
-            if isinstance(class_data, dict):
-                if 'comment' in class_data:
-                    self._add_comment(class_uri, class_data['comment'])
+        if isinstance(class_data, dict):
+            if 'comment' in class_data:
+                self._add_comment(class_uri, class_data['comment'])
 
-                for prop_name, prop_data in class_data.get('properties', {}).items():
-                    self._process_property(prop_name, prop_data, class_uri)
+            for prop_name, prop_data in class_data.get('properties', {}).items():
+                self._process_property(prop_name, prop_data, class_uri)
 
     def _process_class(self, cls_element):
         class_name = cls_element.get('name')
@@ -101,11 +293,11 @@ class OntologyConverter:
             raise ValueError("Class missing name attribute")
 
         class_uri = self.base_ns[class_name]
-        self.graph.add((class_uri, RDF.type, OWL.Class))
+        self._add((class_uri, RDF.type, OWL.Class))
 
         if 'parent' in cls_element.attrib:
             parent_uri = self.base_ns[cls_element.get('parent')]
-            self.graph.add((class_uri, RDFS.subClassOf, parent_uri))
+            self._add((class_uri, RDFS.subClassOf, parent_uri))
 
         if 'comment' in cls_element.attrib:
             self._add_comment(class_uri, cls_element.get('comment'))
@@ -127,14 +319,16 @@ class OntologyConverter:
                 prop_name,
                 domain_uri,
                 prop_data.get('range'),
-                prop_data.get('comment')
+                prop_data.get('comment'),
+                prop_data.get('maxCardinality')
             )
         else:
             self._add_datatype_property(
                 prop_name,
                 domain_uri,
                 prop_data.get('range', 'string'),
-                prop_data.get('comment')
+                prop_data.get('comment'),
+                prop_data.get('maxCardinality')
             )
 
     def _process_xml_property(self, prop_element, domain_uri: URIRef):
@@ -150,40 +344,64 @@ class OntologyConverter:
                 prop_name,
                 domain_uri,
                 range_val,
-                prop_element.get('comment')
+                prop_element.get('comment'),
+                prop_element.get('maxCardinality')
             )
         else:
             self._add_datatype_property(
                 prop_name,
                 domain_uri,
                 prop_element.get('range', 'string'),
-                prop_element.get('comment')
+                prop_element.get('comment'),
+                prop_element.get('maxCardinality')
             )
 
     def _add_object_property(self, prop_name: str, domain_uri: URIRef,
-                           range_val: str = None, comment: str = None):
+                           range_val: str = None, comment: str = None,
+                           max_cardinality: Any = None):
         prop_uri = self.base_ns[prop_name]
-        self.graph.add((prop_uri, RDF.type, OWL.ObjectProperty))
-        self.graph.add((prop_uri, RDFS.domain, domain_uri))
+        self._add((prop_uri, RDF.type, OWL.ObjectProperty))
+        self._add((prop_uri, RDFS.domain, domain_uri))
 
         if range_val:
-            self.graph.add((prop_uri, RDFS.range, self.base_ns[range_val]))
+            self._add((prop_uri, RDFS.range, self.base_ns[range_val]))
 
         if comment:
             self._add_comment(prop_uri, comment)
 
+        if max_cardinality is not None:
+            self._add_max_cardinality(domain_uri, prop_uri, max_cardinality)
+
     def _add_datatype_property(self, prop_name: str, domain_uri: URIRef,
-                             range_type: str = 'string', comment: str = None):
+                             range_type: str = 'string', comment: str = None,
+                             max_cardinality: Any = None):
         prop_uri = self.base_ns[prop_name]
-        self.graph.add((prop_uri, RDF.type, OWL.DatatypeProperty))
-        self.graph.add((prop_uri, RDFS.domain, domain_uri))
-        self.graph.add((prop_uri, RDFS.range, self._get_xsd_type(range_type)))
+        self._add((prop_uri, RDF.type, OWL.DatatypeProperty))
+        self._add((prop_uri, RDFS.domain, domain_uri))
+        self._add((prop_uri, RDFS.range, self._get_xsd_type(range_type)))
 
         if comment:
             self._add_comment(prop_uri, comment)
 
+        if max_cardinality is not None:
+            self._add_max_cardinality(domain_uri, prop_uri, max_cardinality)
+
+    def _add_max_cardinality(self, class_uri: URIRef, prop_uri: URIRef, max_cardinality: Any):
+        try:
+            value = int(max_cardinality)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid maxCardinality for {prop_uri}: {max_cardinality}")
+        if value < 0:
+            raise ValueError(f"Invalid maxCardinality for {prop_uri}: {max_cardinality}")
+
+        restriction = BNode()
+        self._add((restriction, RDF.type, OWL.Restriction))
+        self._add((restriction, OWL.onProperty, prop_uri))
+        self._add((restriction, OWL.maxCardinality, Literal(value, datatype=XSD.nonNegativeInteger)))
+        self._add((class_uri, RDFS.subClassOf, restriction))
+
     def _add_comment(self, subject: URIRef, comment: str):
-        self.graph.add((subject, RDFS.comment, Literal(comment, lang='en')))
+        self._add((subject, RDFS.comment, Literal(comment, lang='en')))
 
     def _get_xsd_type(self, type_name: str) -> URIRef:
         type_map = {
@@ -199,5 +417,65 @@ class OntologyConverter:
         return type_map.get(type_name.lower(), XSD.string)
 
 
+def _convert_fragment(input_file: str) -> Tuple[List[FragmentClass], List[Declaration]]:
+    """Triples of each class in one fragment, plus its property declarations for conflict checks"""
+    converter = OntologyConverter()
+    try:
+        fragment = [
+            (class_name, converter._collect(process))
+            for class_name, _, process in converter._read_classes(Path(input_file))
+        ]
+    except ValueError as e:
+        # Among hundreds of fragments the message alone does not say which one is broken
+        raise ValueError(f"{input_file}: {str(e)}")
+
+    declarations = set()
+    for _, triples in fragment:
+        for subject, predicate, obj in triples:
+            if predicate == RDF.type and obj in PROPERTY_TYPES:
+                kind = 'property_type'
+            else:
+                kind = DECLARATION_KINDS.get(predicate)
+            if kind is not None and isinstance(subject, URIRef):
+                declarations.add((kind, _local_name(subject), _local_name(obj)))
+    return fragment, sorted(declarations)
+
+
+def _convert_fragments(paths: List[Path],
+                       max_workers: Optional[int] = None) -> Iterator[Tuple[List[FragmentClass], List[Declaration]]]:
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        for path in paths:
+            yield _convert_fragment(str(path))
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers) as pool:
+        yield from pool.map(_convert_fragment, map(str, paths), chunksize=max(1, len(paths) // (workers * 4)))
+
+
+def _local_name(uri: URIRef) -> str:
+    return uri.rpartition('#')[2]
+
+
 if __name__ == "__main__":
-    pass
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Convert XML, YAML or JSON sources into one OWL ontology")
+    parser.add_argument("inputs", nargs="+", help="Source files; several are merged into one ontology")
+    parser.add_argument("-o", "--output", required=True, help="OWL file to write")
+    parser.add_argument("--version", default="1.0.0", help="Ontology version")
+    parser.add_argument("--jobs", type=int, help="Processes converting sources (default: CPU count)")
+    parser.add_argument("--strict", action="store_true", help="Write nothing when sources conflict")
+    args = parser.parse_args()
+
+    try:
+        conflicts = OntologyConverter().convert_many(args.inputs, args.output, args.version,
+                                                     max_workers=args.jobs, strict=args.strict)
+    except (OSError, ValueError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    for conflict in conflicts:
+        print(f"Conflict: {conflict}", file=sys.stderr)
@@ -0,0 +1,73 @@
+import hydra
+from hydra.core.hydra_config import HydraConfig
+from hydra.utils import to_absolute_path
+from omegaconf import DictConfig
+from pathlib import Path
+import json
+import logging
+import time
+from ontology_cache import load_ontology
+from ontology_targets import generate_target
+
+logger = logging.getLogger(__name__)
+
+
+def generate(cfg: DictConfig, ontology, previous=None, migration_rules=None) -> str:
+    options = {
+        "python": dict(
+            hydra_mode=cfg.python.hydra_mode,
+            identity_map=cfg.python.identity_map,
+            columnar=cfg.python.columnar,
+            loaders=cfg.python.loaders,
+            validators=cfg.python.validators,
+            sharded=cfg.python.sharded,
+            schema_yaml=cfg.python.schema_yaml
+        ),
+        "java": dict(
+            package_name=cfg.java.package,
+            equals_hash=cfg.java.equals_hash,
+            immutable=cfg.java.immutable
+        )
+    }
+    return generate_target(
+        cfg.target, ontology, to_absolute_path(cfg.output), previous, migration_rules,
+        cfg.version, cfg.prefix, options.get(cfg.target),
+        subtrees=list(cfg.subtrees) if cfg.subtrees else None
+    )
+
+
+@hydra.main(version_base=None, config_path="conf", config_name="config")
+def main(cfg: DictConfig) -> str:
+    timings = {}
+    started = time.perf_counter()
+    cache_dir = to_absolute_path(cfg.cache_dir) if cfg.cache_dir else None
+
+    ontology = load_ontology(to_absolute_path(cfg.ontology), cache_dir)
+    previous = load_ontology(to_absolute_path(cfg.previous), cache_dir) if cfg.previous else None
+    timings["load"] = time.perf_counter() - started
+
+    step = time.perf_counter()
+    migration_rules = ontology.migration_rules(previous) if previous else None
+    timings["diff"] = time.perf_counter() - step
+
+    step = time.perf_counter()
+    output_dir = generate(cfg, ontology, previous, migration_rules)
+    timings["generate"] = time.perf_counter() - step
+    timings["total"] = time.perf_counter() - started
+
+    job_dir = Path(HydraConfig.get().runtime.output_dir)
+    (job_dir / "timing.json").write_text(json.dumps({
+        "ontology": str(ontology.path),
+        "previous": str(previous.path) if previous else None,
+        "target": cfg.target,
+        "output": output_dir,
+        "graph_source": ontology.source,
+        "seconds": timings
+    }, indent=2), encoding='utf-8')
+
+    logger.info(f"{cfg.target} for {ontology.path.name} in {timings['total']:.2f}s -> {output_dir}")
+    return output_dir
+
+
+if __name__ == "__main__":
+    main()
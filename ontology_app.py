@@ -1,13 +1,222 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from pathlib import Path
-from converter import OntologyConverter
-from owl_to_python import generate_python_classes
-from owl_to_java import generate_java_classes
-from owl_to_cpp import generate_cpp_from_owl
+from concurrent.futures import ThreadPoolExecutor
+import importlib
 import logging
-import semver
-from typing import Optional
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+# rdflib, jinja2 and the generators are imported lazily so the window shows up first
+if TYPE_CHECKING:
+    from ontology_browser import OntologyBrowserModel
+    from ontology_cache import LoadedOntology
+    from ontology_targets import TargetResult
+
+POLL_INTERVAL_MS = 100
+SLOW_PREVIEW_SECONDS = 30
+BROWSER_CHUNK = 500
+FILTER_DELAY_MS = 150
+PRELOAD_DELAY_MS = 250
+PRELOAD_MODULES = ("semver", "converter", "ontology_cache", "ontology_targets",
+                   "owl_to_python", "owl_to_java", "owl_to_cpp")
+
+STAGE_LABELS = {
+    "parse": "Чтение OWL",
+    "extract": "Извлечение классов и свойств",
+    "classes": "Обработка классов",
+    "models": "Генерация моделей",
+    "hydra": "Конфигурация Hydra",
+    "registry": "Реестр объектов",
+    "tables": "Колоночные таблицы",
+    "loaders": "Загрузчики данных",
+    "validators": "Валидаторы",
+    "individuals": "Индивиды",
+    "package": "Сборка пакета",
+    "serialize": "Сохранение OWL"
+}
+
+TARGET_LABELS = {
+    "python": "Python",
+    "java": "Java",
+    "cpp": "C++"
+}
+
+ALL_TARGETS_LABEL = "Все языки"
+
+
+class ConversionJob:
+    def __init__(self, title: str, task: Callable[[Callable[[str, int, int], None]], Any],
+                 on_success: Callable[[Any], None], on_error: Callable[[Exception], None]):
+        self.title = title
+        self.task = task
+        self.on_success = on_success
+        self.on_error = on_error
+        self.cancel_event = threading.Event()
+
+
+class OntologyBrowser:
+    """Class tree over a parsed ontology; rows are inserted only when their parent is expanded"""
+
+    def __init__(self, app: "OntologyApp", model: "OntologyBrowserModel", owl_file: str):
+        self.app = app
+        self.model = model
+        self.owl_file = owl_file
+        self.window = tk.Toplevel(app.root)
+        self.window.title(f"Обзор классов: {Path(owl_file).name}")
+        self.window.geometry("900x600")
+        self.filter = tk.StringVar()
+        self.target = tk.StringVar(value=ALL_TARGETS_LABEL)
+        self.summary = tk.StringVar()
+        self.details = tk.StringVar()
+        self.pending_filter: Optional[str] = None
+        # Tree row id -> class name; a class under several parents gets one row per path
+        self.nodes: Dict[str, str] = {}
+        # "more" row id -> (parent row, names, offset of the next chunk)
+        self.more: Dict[str, Tuple[str, List[str], int]] = {}
+        self.create_widgets()
+        self.show_roots()
+
+    def create_widgets(self):
+        filter_frame = ttk.Frame(self.window)
+        filter_frame.pack(fill=tk.X, padx=5)
+
+        ttk.Label(filter_frame, text="Фильтр:").pack(side=tk.LEFT)
+        ttk.Entry(filter_frame, textvariable=self.filter, width=40).pack(side=tk.LEFT, padx=5)
+        ttk.Label(filter_frame, textvariable=self.summary, anchor=tk.W).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.filter.trace_add("write", lambda *_: self.schedule_filter())
+
+        panes = ttk.PanedWindow(self.window, orient=tk.HORIZONTAL)
+        panes.pack(fill=tk.BOTH, expand=True, padx=5)
+
+        tree_frame = ttk.Frame(panes)
+        self.tree = ttk.Treeview(tree_frame, show="tree", selectmode="extended")
+        tree_scroll = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=tree_scroll.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        tree_scroll.pack(side=tk.LEFT, fill=tk.Y)
+        self.tree.bind("<<TreeviewOpen>>", self.on_open)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        panes.add(tree_frame, weight=1)
+
+        props_frame = ttk.Frame(panes)
+        ttk.Label(props_frame, textvariable=self.details, wraplength=500, anchor=tk.W).pack(fill=tk.X)
+        self.properties = ttk.Treeview(props_frame, columns=("kind", "range", "origin"), show="tree headings")
+        self.properties.heading("#0", text="Свойство")
+        self.properties.heading("kind", text="Вид")
+        self.properties.heading("range", text="Тип")
+        self.properties.heading("origin", text="Объявлено в")
+        props_scroll = ttk.Scrollbar(props_frame, orient=tk.VERTICAL, command=self.properties.yview)
+        self.properties.configure(yscrollcommand=props_scroll.set)
+        self.properties.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        props_scroll.pack(side=tk.LEFT, fill=tk.Y)
+        panes.add(props_frame, weight=2)
+
+        generate_frame = ttk.Frame(self.window)
+        generate_frame.pack(fill=tk.X, padx=5)
+
+        self.generate_btn = ttk.Button(
+            generate_frame,
+            text="Генерировать выбранные поддеревья",
+            command=self.generate,
+            state=tk.DISABLED
+        )
+        self.generate_btn.pack(side=tk.LEFT)
+
+        ttk.Combobox(
+            generate_frame,
+            textvariable=self.target,
+            values=[ALL_TARGETS_LABEL] + list(TARGET_LABELS.values()),
+            state="readonly",
+            width=12
+        ).pack(side=tk.LEFT, padx=10)
+
+    def show_roots(self):
+        roots = self.model.roots()
+        self.insert_classes("", roots)
+        self.summary.set(f"Классов: {len(self.model)}, корневых: {len(roots)}")
+
+    def clear_tree(self):
+        self.tree.delete(*self.tree.get_children())
+        self.nodes.clear()
+        self.more.clear()
+
+    def insert_classes(self, parent: str, names: List[str], offset: int = 0):
+        chunk = names[offset:offset + BROWSER_CHUNK]
+        for name in chunk:
+            iid = f"{parent}/{name}" if parent else name
+            self.tree.insert(parent, tk.END, iid=iid, text=name)
+            self.nodes[iid] = name
+            if self.model.children(name):
+                # Placeholder child so the row gets an expander without loading the subtree
+                self.tree.insert(iid, tk.END, iid=f"{iid}/...", text="...")
+
+        rest = len(names) - offset - len(chunk)
+        if rest > 0:
+            more = f"{parent}/+{offset + len(chunk)}"
+            self.tree.insert(parent, tk.END, iid=more, text=f"... ещё {rest}")
+            self.more[more] = (parent, names, offset + len(chunk))
+
+    def on_open(self, _event=None):
+        iid = self.tree.focus()
+        placeholder = f"{iid}/..."
+        if iid in self.nodes and self.tree.exists(placeholder):
+            self.tree.delete(placeholder)
+            self.insert_classes(iid, self.model.children(self.nodes[iid]))
+
+    def on_select(self, _event=None):
+        for iid in self.tree.selection():
+            if iid in self.more:
+                parent, names, offset = self.more.pop(iid)
+                self.tree.delete(iid)
+                self.insert_classes(parent, names, offset)
+                return
+
+        names = self.selected_classes()
+        self.generate_btn.config(state=tk.NORMAL if names else tk.DISABLED)
+        self.properties.delete(*self.properties.get_children())
+        if len(names) != 1:
+            self.details.set(f"Выбрано классов: {len(names)}" if names else "")
+            return
+
+        name = names[0]
+        self.details.set(f"{name}: {self.model.comment(name) or 'без описания'}")
+        for prop in self.model.properties(name):
+            self.properties.insert("", tk.END, text=prop["name"], values=(
+                "объект" if prop["type"] == "ObjectProperty" else "данные",
+                prop["range"],
+                prop["domain"]
+            ))
+
+    def selected_classes(self) -> List[str]:
+        names = [self.nodes[iid] for iid in self.tree.selection() if iid in self.nodes]
+        return list(dict.fromkeys(names))
+
+    def schedule_filter(self):
+        if self.pending_filter is not None:
+            self.window.after_cancel(self.pending_filter)
+        self.pending_filter = self.window.after(FILTER_DELAY_MS, self.apply_filter)
+
+    def apply_filter(self):
+        self.pending_filter = None
+        text = self.filter.get().strip()
+        self.clear_tree()
+        if not text:
+            self.show_roots()
+            return
+        matches = self.model.search(text)
+        self.insert_classes("", matches)
+        self.summary.set(f"Найдено: {len(matches)} из {len(self.model)}")
+
+    def generate(self):
+        names = self.selected_classes()
+        if not names:
+            return
+        targets = {label: target for target, label in TARGET_LABELS.items()}
+        self.app.generate_subtrees(self.owl_file, names, targets.get(self.target.get()))
+
 
 class OntologyApp:
     def __init__(self, root):
@@ -26,8 +235,20 @@ class OntologyApp:
         self.status = tk.StringVar(value="Готово к работе!")
         self.folder_prefix = tk.StringVar(value="ontology")
         self.java_package = tk.StringVar(value="generated")
+        self.job_status = tk.StringVar(value="")
+        self.preview = tk.StringVar(value="")
+        # Jobs run one at a time in submission order; widgets are only touched from the Tk thread
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ontology-job")
+        # Previews get their own worker so they never wait behind a long generation
+        self.preview_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ontology-preview")
+        self.events: "queue.Queue" = queue.Queue()
+        self.jobs: List[ConversionJob] = []
+        self.browser: Optional[OntologyBrowser] = None
         self.create_widgets()
         self.ensure_output_dir()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(POLL_INTERVAL_MS, self.poll_events)
+        self.root.after(PRELOAD_DELAY_MS, lambda: self.executor.submit(self.preload_modules))
 
     def create_widgets(self):
         style = ttk.Style()
@@ -150,6 +371,31 @@ class OntologyApp:
         )
         self.generate_cpp_btn.pack(side=tk.LEFT, padx=10)
 
+        all_frame = ttk.LabelFrame(main_frame, text="6. Генерирование на всех языках", padding=10)
+        all_frame.pack(fill=tk.X, pady=5)
+
+        self.generate_all_btn = ttk.Button(
+            all_frame,
+            text="Генерировать всё",
+            command=self.generate_all,
+            state=tk.DISABLED
+        )
+        self.generate_all_btn.pack(side=tk.LEFT)
+
+        self.browse_btn = ttk.Button(
+            all_frame,
+            text="Обзор классов...",
+            command=self.open_browser,
+            state=tk.DISABLED
+        )
+        self.browse_btn.pack(side=tk.LEFT, padx=10)
+
+        ttk.Label(
+            all_frame,
+            text="Python, Java и C++ параллельно из одного разбора OWL",
+            anchor=tk.W
+        ).pack(side=tk.LEFT, padx=10)
+
 
         naming_frame = ttk.LabelFrame(main_frame, text="Выходные данные", padding=10)
         naming_frame.pack(fill=tk.X, pady=5)
@@ -174,6 +420,28 @@ class OntologyApp:
             anchor=tk.W
         ).pack(fill=tk.X)
 
+        ttk.Label(
+            status_frame,
+            textvariable=self.preview,
+            anchor=tk.W
+        ).pack(fill=tk.X, pady=(5, 0))
+
+        progress_frame = ttk.Frame(status_frame)
+        progress_frame.pack(fill=tk.X, pady=(5, 0))
+
+        self.progress_bar = ttk.Progressbar(progress_frame, mode="determinate")
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        ttk.Label(progress_frame, textvariable=self.job_status).pack(side=tk.LEFT, padx=10)
+
+        self.cancel_btn = ttk.Button(
+            progress_frame,
+            text="Отменить",
+            command=self.cancel_jobs,
+            state=tk.DISABLED
+        )
+        self.cancel_btn.pack(side=tk.LEFT)
+
     def ensure_output_dir(self):
         output_dir = Path(self.base_output_dir.get())
         if not output_dir.exists():
@@ -197,6 +465,7 @@ class OntologyApp:
             self.owl_file.set("")
             self.update_buttons()
             self.set_status(f"Выбрано: {Path(filename).name}")
+            self.request_preview(filename)
 
     def select_previous_owl_file(self):
         filename = filedialog.askopenfilename(
@@ -218,6 +487,7 @@ class OntologyApp:
             self.owl_file.set(filename)
             self.update_buttons()
             self.set_status(f"Выбранный OWL-файл: {Path(filename).name}")
+            self.request_preview(filename)
 
     def update_buttons(self):
         self.convert_btn.config(
@@ -232,39 +502,193 @@ class OntologyApp:
         self.generate_cpp_btn.config(
             state=tk.NORMAL if self.owl_file.get() else tk.DISABLED
         )
+        self.generate_all_btn.config(
+            state=tk.NORMAL if self.owl_file.get() else tk.DISABLED
+        )
+        self.browse_btn.config(
+            state=tk.NORMAL if self.owl_file.get() else tk.DISABLED
+        )
 
     def set_status(self, message: str):
         self.status.set(message)
-        self.root.update()
+
+    def request_preview(self, filename: str):
+        self.preview.set(f"Анализ {Path(filename).name}...")
+        self.preview_executor.submit(self._run_preview, filename)
+
+    def _run_preview(self, filename: str):
+        from ontology_preview import preview_file
+
+        try:
+            result = preview_file(filename)
+        except Exception as e:
+            result = e
+        self.events.put(("preview", None, (filename, result)))
+
+    def show_preview(self, filename: str, result: Any):
+        # A newer selection may have replaced the file while it was being scanned
+        if filename not in (self.source_file.get(), self.owl_file.get()):
+            return
+        if isinstance(result, Exception):
+            self.preview.set(f"Предпросмотр недоступен: {result}")
+            return
+
+        parts = [
+            f"Классов: {result.classes}",
+            f"объектных свойств: {result.object_properties}",
+            f"свойств данных: {result.datatype_properties}",
+            f"глубина иерархии: {result.depth}"
+        ]
+        if result.individuals:
+            parts.append(f"индивидов: {result.individuals}")
+        if result.version:
+            parts.append(f"версия: {result.version}")
+
+        estimated = result.estimated_generate_seconds
+        estimate = f"генерация ~{estimated:.1f} с на язык"
+        if result.estimated_convert_seconds is not None:
+            estimated += result.estimated_convert_seconds
+            estimate = f"конвертация ~{result.estimated_convert_seconds:.1f} с, {estimate}"
+        text = f"{', '.join(parts)}. Оценка: {estimate}"
+        if estimated > SLOW_PREVIEW_SECONDS:
+            text += " (большой файл, обработка займёт заметное время)"
+        self.preview.set(text)
+
+    def preload_modules(self):
+        # Runs on the worker ahead of any job, while the window is already interactive
+        for module in PRELOAD_MODULES:
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                self.logger.warning(f"Preloading {module} failed: {str(e)}")
+
+    def submit_job(self, title: str, task: Callable[[Callable[[str, int, int], None]], Any],
+                   on_success: Callable[[Any], None], on_error: Callable[[Exception], None]):
+        job = ConversionJob(title, task, on_success, on_error)
+        self.jobs.append(job)
+        self.executor.submit(self._run_job, job)
+        self.update_job_controls()
+        if len(self.jobs) > 1:
+            self.set_status(f"{title}: в очереди")
+
+    def _run_job(self, job: ConversionJob):
+        # Worker thread: report back only through the event queue
+        from ontology_core import ConversionCancelled
+
+        if job.cancel_event.is_set():
+            self.events.put(("cancelled", job, None))
+            return
+        self.events.put(("started", job, None))
+
+        def progress(stage: str, done: int, total: int):
+            if job.cancel_event.is_set():
+                raise ConversionCancelled(job.title)
+            self.events.put(("progress", job, (stage, done, total)))
+
+        try:
+            result = job.task(progress)
+        except ConversionCancelled:
+            self.events.put(("cancelled", job, None))
+        except Exception as e:
+            self.events.put(("failed", job, e))
+        else:
+            self.events.put(("done", job, result))
+
+    def poll_events(self):
+        latest_progress = None
+        try:
+            while True:
+                kind, job, payload = self.events.get_nowait()
+                if kind == "progress":
+                    # Only the most recent progress of a tick is worth drawing
+                    latest_progress = (job, payload)
+                else:
+                    self.handle_event(kind, job, payload)
+        except queue.Empty:
+            pass
+        if latest_progress and latest_progress[0] in self.jobs:
+            self.show_progress(latest_progress[0], *latest_progress[1])
+        self.root.after(POLL_INTERVAL_MS, self.poll_events)
+
+    def handle_event(self, kind: str, job: Optional[ConversionJob], payload: Any):
+        if kind == "preview":
+            self.show_preview(*payload)
+            return
+        if kind == "started":
+            self.progress_bar.config(value=0, maximum=1)
+            self.set_status(f"{job.title}...")
+            return
+
+        if job in self.jobs:
+            self.jobs.remove(job)
+        self.update_job_controls()
+        if kind == "done":
+            self.progress_bar.config(value=1, maximum=1)
+            job.on_success(payload)
+        elif kind == "failed":
+            job.on_error(payload)
+        elif kind == "cancelled":
+            self.set_status(f"{job.title}: отменено")
+        if not self.jobs:
+            self.progress_bar.config(value=0)
+
+    def show_progress(self, job: ConversionJob, stage: str, done: int, total: int):
+        target, _, stage = stage.rpartition(":")
+        label = STAGE_LABELS.get(stage, stage)
+        if target:
+            label = f"{TARGET_LABELS.get(target, target)}, {label.lower()}"
+        if total:
+            self.progress_bar.config(value=done, maximum=total)
+            self.set_status(f"{job.title}: {label} ({done}/{total})")
+        else:
+            self.set_status(f"{job.title}: {label}")
+
+    def update_job_controls(self):
+        self.cancel_btn.config(state=tk.NORMAL if self.jobs else tk.DISABLED)
+        self.job_status.set(f"Задач: {len(self.jobs)}" if self.jobs else "")
+
+    def cancel_jobs(self):
+        for job in self.jobs:
+            job.cancel_event.set()
+        self.set_status("Отмена...")
+
+    def on_close(self):
+        self.cancel_jobs()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.preview_executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
     def convert_to_owl(self):
         input_file = self.source_file.get()
         version = self.version.get()
 
+        import semver
+
         try:
             semver.VersionInfo.parse(version)
-            self.set_status("Конвертирование в OWL...")
-            output_file = Path(input_file).with_suffix(".owl")
+        except ValueError as e:
+            messagebox.showerror(
+                "Ошибка версии",
+                f"Неправильный формат версии: {str(e)}\nИспользовать правильные версии (например, 1.0.0)",
+                parent=self.root
+            )
+            self.set_status("Ошибка версии")
+            return
 
-            converter = OntologyConverter()
-            converter.convert(input_file, str(output_file), version)
+        output_file = Path(input_file).with_suffix(".owl")
 
+        def on_success(_):
             self.owl_file.set(str(output_file))
             self.update_buttons()
             self.set_status(f"Конвертирован в OWL (v{version})")
+            self.request_preview(str(output_file))
             messagebox.showinfo(
                 "Успех",
                 f"Успешно конвертировано в:\n{output_file}\nВерсия: {version}",
                 parent=self.root
             )
-        except ValueError as e:
-            messagebox.showerror(
-                "Ошибка версии",
-                f"Неправильный формат версии: {str(e)}\nИспользовать правильные версии (например, 1.0.0)",
-                parent=self.root
-            )
-            self.set_status("Ошибка версии")
-        except Exception as e:
+
+        def on_error(e: Exception):
             messagebox.showerror(
                 "Ошибка конвертации",
                 str(e),
@@ -272,107 +696,197 @@ class OntologyApp:
             )
             self.set_status("Не удалось выполнить преобразование")
 
-    def generate_python(self):
-        owl_file = self.owl_file.get()
+        self.submit_job(
+            "Конвертирование в OWL",
+            lambda progress: self.convert_task(input_file, str(output_file), version, progress),
+            on_success,
+            on_error
+        )
+
+    def convert_task(self, input_file: str, output_file: str, version: str,
+                     progress: Callable[[str, int, int], None]):
+        from converter import OntologyConverter
+
+        OntologyConverter().convert(input_file, output_file, version, progress=progress)
+
+    def load_ontologies(self, owl_file: str,
+                        previous_owl: Optional[str]) -> Tuple["LoadedOntology", Optional["LoadedOntology"]]:
+        from ontology_cache import load_ontology
+
+        # Parsed graphs are memoized per file and mtime, so repeated clicks skip the parse
+        ontology = load_ontology(owl_file)
+        previous = load_ontology(previous_owl) if previous_owl and Path(previous_owl).exists() else None
+        return ontology, previous
+
+    def target_options(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "python": dict(hydra_mode=self.hydra_mode.get()),
+            "java": dict(package_name=self.java_package.get())
+        }
+
+    def generation_task(self, target: str, options: Dict[str, Any], subtrees: Optional[List[str]] = None,
+                        owl_file: Optional[str] = None) -> Callable[[Callable[[str, int, int], None]], str]:
+        owl_file = owl_file or self.owl_file.get()
         previous_owl = self.previous_owl_file.get() if self.previous_owl_file.get() else None
         base_output_dir = self.base_output_dir.get()
-        hydra_mode = self.hydra_mode.get()
         folder_prefix = self.folder_prefix.get()
 
-        try:
-            self.ensure_output_dir()
-            self.set_status("Генерация кода на Python...")
-
-            output_dir = generate_python_classes(
-                owl_file=owl_file,
-                base_output_dir=base_output_dir,
-                hydra_mode=hydra_mode,
-                version=None,
-                previous_version=previous_owl,
-                folder_prefix=folder_prefix
+        def task(progress):
+            from ontology_targets import generate_target
+
+            progress("parse", 0, 0)
+            ontology, previous = self.load_ontologies(owl_file, previous_owl)
+            return generate_target(
+                target, ontology, base_output_dir, previous,
+                migration_rules=ontology.migration_rules(previous) if previous else None,
+                folder_prefix=folder_prefix,
+                options=options,
+                progress=progress,
+                subtrees=subtrees
             )
 
-            self.set_status(f"Python код сгенерирован в: {output_dir}")
-            messagebox.showinfo(
-                "Успех",
-                f"Python код успешно сгенерирован в:\n{output_dir}",
-                parent=self.root
-            )
-        except Exception as e:
-            messagebox.showerror(
-                "Ошибка генерации кода",
-                str(e),
-                parent=self.root
-            )
-            self.set_status("Python генерация не удалась")
+        return task
+
+    def generate_python(self):
+        self.ensure_output_dir()
+        self.submit_job(
+            "Генерация кода на Python",
+            self.generation_task("python", dict(hydra_mode=self.hydra_mode.get())),
+            lambda output_dir: self.generation_succeeded("Python", output_dir),
+            lambda e: self.generation_failed("Python", e)
+        )
 
     def generate_java(self):
-        owl_file = self.owl_file.get()
+        self.ensure_output_dir()
+        self.submit_job(
+            "Генерация кода на Java",
+            self.generation_task("java", dict(package_name=self.java_package.get())),
+            lambda output_dir: self.generation_succeeded("Java", output_dir),
+            lambda e: self.generation_failed("Java", e)
+        )
+
+    def generate_cpp(self):
+        self.ensure_output_dir()
+        self.submit_job(
+            "Генерация кода на C++",
+            self.generation_task("cpp", {}),
+            lambda output_dir: self.generation_succeeded("C++", output_dir),
+            lambda e: self.generation_failed("C++", e)
+        )
+
+    def generate_all(self, subtrees: Optional[List[str]] = None, owl_file: Optional[str] = None):
+        owl_file = owl_file or self.owl_file.get()
         previous_owl = self.previous_owl_file.get() if self.previous_owl_file.get() else None
         base_output_dir = self.base_output_dir.get()
         folder_prefix = self.folder_prefix.get()
-        java_package = self.java_package.get()
-        hydra_mode = self.hydra_mode.get()
-
-        try:
-            self.ensure_output_dir()
-            self.set_status("Генерация кода на Java...")
-
-            output_dir = generate_java_classes(
-                owl_file=owl_file,
-                base_output_dir=base_output_dir,
-                package_name=java_package,
-                version=None,
-                previous_version=previous_owl,
-                folder_prefix=folder_prefix
+        options = self.target_options()
+
+        def task(progress):
+            from ontology_targets import generate_targets
+
+            started = time.perf_counter()
+            progress("parse", 0, 0)
+            ontology, previous = self.load_ontologies(owl_file, previous_owl)
+            load_seconds = time.perf_counter() - started
+            results = generate_targets(
+                ontology, base_output_dir,
+                previous=previous,
+                folder_prefix=folder_prefix,
+                options=options,
+                progress=progress,
+                subtrees=subtrees
             )
+            return load_seconds, results
 
-            self.set_status(f"Java код сгенерирован в: {output_dir}")
-            messagebox.showinfo(
-                "Успех",
-                f"Java код успешно сгенерирован в:\n{output_dir}",
-                parent=self.root
-            )
-        except Exception as e:
-            messagebox.showerror(
-                "Ошибка генерации кода",
-                str(e),
-                parent=self.root
-            )
-            self.set_status("Java генерация не удалась")
+        self.ensure_output_dir()
+        self.submit_job(
+            "Генерация поддеревьев на всех языках" if subtrees else "Генерация на всех языках",
+            task,
+            self.generate_all_finished,
+            lambda e: self.generation_failed("Общая", e)
+        )
 
+    def generate_subtrees(self, owl_file: str, subtrees: List[str], target: Optional[str]):
+        """Generate only the chosen classes, their subclasses and dependencies; target None means all"""
+        if target is None:
+            self.generate_all(subtrees, owl_file)
+            return
 
-    def generate_cpp(self):
+        label = TARGET_LABELS[target]
+        self.ensure_output_dir()
+        self.submit_job(
+            f"Генерация поддеревьев на {label}",
+            self.generation_task(target, self.target_options().get(target, {}), subtrees, owl_file),
+            lambda output_dir: self.generation_succeeded(label, output_dir),
+            lambda e: self.generation_failed(label, e)
+        )
+
+    def open_browser(self):
         owl_file = self.owl_file.get()
-        previous_owl = self.previous_owl_file.get() if self.previous_owl_file.get() else None
-        base_output_dir = self.base_output_dir.get()
-        folder_prefix = self.folder_prefix.get()
+        if self.browser is not None and self.browser.owl_file == owl_file and self.browser.window.winfo_exists():
+            self.browser.window.lift()
+            return
+
+        def task(progress):
+            from ontology_browser import OntologyBrowserModel
+
+            progress("parse", 0, 0)
+            ontology, _ = self.load_ontologies(owl_file, None)
+            return OntologyBrowserModel(ontology.graph, progress)
+
+        def on_error(e: Exception):
+            messagebox.showerror("Ошибка обзора", str(e), parent=self.root)
+            self.set_status("Не удалось открыть обзор классов")
+
+        self.submit_job(
+            "Загрузка обзора классов",
+            task,
+            lambda model: self.show_browser(model, owl_file),
+            on_error
+        )
 
-        try:
-            self.ensure_output_dir()
-            self.set_status("Генерация кода на C++...")
-
-            output_dir = generate_cpp_from_owl(
-                owl_file=owl_file,
-                base_output_dir=base_output_dir,
-                version=None,
-                previous_version=previous_owl,
-                folder_prefix=folder_prefix
-            )
+    def show_browser(self, model: "OntologyBrowserModel", owl_file: str):
+        if self.browser is not None and self.browser.window.winfo_exists():
+            self.browser.window.destroy()
+        self.browser = OntologyBrowser(self, model, owl_file)
+        self.set_status(f"Обзор классов: {len(model)} классов")
+
+    def generate_all_finished(self, outcome: Tuple[float, Dict[str, "TargetResult"]]):
+        load_seconds, results = outcome
+        lines = [f"Загрузка OWL: {load_seconds:.2f} с"]
+        for target, result in results.items():
+            label = TARGET_LABELS.get(target, target)
+            if result.ok:
+                lines.append(f"{label}: {result.seconds:.2f} с → {result.output_dir}")
+            else:
+                lines.append(f"{label}: ошибка через {result.seconds:.2f} с: {result.error}")
+
+        summary = ", ".join(
+            f"{TARGET_LABELS.get(target, target)} {result.seconds:.2f} с" if result.ok
+            else f"{TARGET_LABELS.get(target, target)} ошибка"
+            for target, result in results.items()
+        )
+        self.set_status(f"Сгенерировано: {summary}")
+        if all(result.ok for result in results.values()):
+            messagebox.showinfo("Успех", "\n".join(lines), parent=self.root)
+        else:
+            messagebox.showerror("Ошибка генерации кода", "\n".join(lines), parent=self.root)
+
+    def generation_succeeded(self, language: str, output_dir: str):
+        self.set_status(f"{language} код сгенерирован в: {output_dir}")
+        messagebox.showinfo(
+            "Успех",
+            f"{language} код успешно сгенерирован в:\n{output_dir}",
+            parent=self.root
+        )
 
-            self.set_status(f"C++ код сгенерирован в: {output_dir}")
-            messagebox.showinfo(
-                "Успех",
-                f"C++ код успешно сгенерирован в:\n{output_dir}",
-                parent=self.root
-            )
-        except Exception as e:
-            messagebox.showerror(
-                "Ошибка генерации кода",
-                str(e),
-                parent=self.root
-            )
-            self.set_status("C++ генерация не удалась")
+    def generation_failed(self, language: str, e: Exception):
+        messagebox.showerror(
+            "Ошибка генерации кода",
+            str(e),
+            parent=self.root
+        )
+        self.set_status(f"{language} генерация не удалась")
 
 if __name__ == "__main__":
     root = tk.Tk()
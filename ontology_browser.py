@@ -0,0 +1,68 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+import re
+from rdflib import Graph
+from ontology_core import ClassHierarchy, OntologyGraphIndex, ProgressCallback
+
+# Word starts inside CamelCase and snake_case names, so "stud" also finds "GraduateStudent"
+WORD_START = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=_)(?=[A-Za-z0-9])")
+
+
+class PrefixIndex:
+    """Sorted (key, name) pairs; a prefix lookup is one bisection plus a slice"""
+
+    def __init__(self, names: Iterable[str]):
+        entries: List[Tuple[str, str]] = []
+        for name in names:
+            starts = [0] + [match.start() for match in WORD_START.finditer(name)]
+            entries.extend((name[start:].lower(), name) for start in starts)
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.names = [name for _, name in entries]
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Names having a word starting with prefix; whole-name matches come first"""
+        prefix = prefix.lower()
+        found: Dict[str, bool] = {}
+        position = bisect_left(self.keys, prefix)
+        while position < len(self.keys) and self.keys[position].startswith(prefix):
+            name = self.names[position]
+            found[name] = found.get(name, False) or name.lower().startswith(prefix)
+            position += 1
+        names = sorted(found, key=lambda name: (not found[name], name.lower()))
+        return names[:limit] if limit is not None else names
+
+
+class OntologyBrowserModel:
+    """Read-only view of a parsed ontology for the class browser; children and properties are served on demand"""
+
+    def __init__(self, graph: Graph, progress: Optional[ProgressCallback] = None):
+        from owl_to_python import OwlToPythonConverter
+
+        if progress is not None:
+            progress("extract", 0, 0)
+        converter = OwlToPythonConverter()
+        index = OntologyGraphIndex(graph)
+        converter._build_class_hierarchy(index)
+        self.hierarchy = ClassHierarchy(converter._extract_classes(index), converter._extract_properties(index))
+        self.names = PrefixIndex(self.hierarchy.index)
+
+    def __len__(self) -> int:
+        return len(self.hierarchy.classes)
+
+    def roots(self) -> List[str]:
+        return self.hierarchy.roots()
+
+    def children(self, name: str) -> List[str]:
+        return self.hierarchy.children[name]
+
+    def comment(self, name: str) -> Optional[str]:
+        return self.hierarchy.classes[self.hierarchy.index[name]]["comment"]
+
+    def properties(self, name: str, inherited: bool = True) -> List[Dict]:
+        if inherited:
+            return self.hierarchy.all_properties[name]
+        return self.hierarchy.own_properties[name]
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        return self.names.search(prefix, limit)
@@ -0,0 +1,163 @@
+from rdflib import Graph
+from pathlib import Path
+import hashlib
+import logging
+import os
+import pickle
+from typing import Any, Dict, List, Optional, Tuple, Union
+from ontology_core import OntologyDiff, OntologyVersionManager
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = 1
+
+# One entry per file: a newer version of the file replaces the one parsed before
+_loaded: Dict[Path, "LoadedOntology"] = {}
+
+
+class LoadedOntology:
+    """A parsed ontology with its version and memoized migration diffs"""
+
+    def __init__(self, path: Path, graph: Graph, key: str, source: str,
+                 cache_dir: Optional[Path] = None):
+        self.path = path
+        self.graph = graph
+        self.key = key
+        self.source = source
+        self.cache_dir = cache_dir
+        self.version = OntologyVersionManager.load_version(graph)
+        self._migration_rules: Dict[str, Dict[str, Any]] = {}
+        self._diffs: Dict[str, Dict[str, Any]] = {}
+
+    def migration_rules(self, previous: "LoadedOntology") -> Dict[str, Any]:
+        rules = self._migration_rules.get(previous.key)
+        if rules is None:
+            cache_file = self._cache_file(f"diff-{previous.key}-{self.key}")
+            rules = _read_cache(cache_file)
+            if rules is None:
+                rules = OntologyVersionManager.generate_migration_rules(previous.graph, self.graph)
+                _write_cache(cache_file, rules)
+            self._migration_rules[previous.key] = rules
+        return rules
+
+    def diff(self, previous: "LoadedOntology") -> Dict[str, Any]:
+        diff = self._diffs.get(previous.key)
+        if diff is None:
+            cache_file = self._cache_file(f"compare-{previous.key}-{self.key}")
+            diff = _read_cache(cache_file)
+            if diff is None:
+                diff = OntologyDiff.compare(previous.graph, self.graph)
+                _write_cache(cache_file, diff)
+            self._diffs[previous.key] = diff
+        return diff
+
+    def _cache_file(self, name: str) -> Optional[Path]:
+        return self.cache_dir / f"{name}.pickle" if self.cache_dir else None
+
+
+def load_ontology(owl_file: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None) -> LoadedOntology:
+    """Parse an OWL file once per process, reusing an on-disk triple cache when available"""
+    path = Path(owl_file).resolve()
+    if not path.exists():
+        raise FileNotFoundError(f"OWL file not found: {path}")
+
+    key = _file_key(path)
+    loaded = _loaded.get(path)
+    if loaded is not None and loaded.key == key:
+        return loaded
+
+    cache_dir = Path(cache_dir).resolve() if cache_dir else None
+    cache_file = cache_dir / f"graph-{key}.pickle" if cache_dir else None
+    cached = _read_cache(cache_file)
+    if cached is not None:
+        graph = _graph_from_cache(cached)
+        source = "disk"
+    else:
+        graph = Graph()
+        graph.parse(path)
+        _write_cache(cache_file, _graph_to_cache(graph))
+        source = "parsed"
+
+    loaded = LoadedOntology(path, graph, key, source, cache_dir)
+    _loaded[path] = loaded
+    return loaded
+
+
+def remember_ontology(owl_file: Union[str, Path], graph: Graph, source: str = "memory") -> LoadedOntology:
+    """Memoize a graph that was just written to owl_file, so the next load_ontology skips the parse"""
+    path = Path(owl_file).resolve()
+    loaded = LoadedOntology(path, graph, _file_key(path), source)
+    _loaded[path] = loaded
+    return loaded
+
+
+def forget_ontology(owl_file: Union[str, Path]):
+    """Drop the memoized version of a file; long-running callers use this when it changes"""
+    _loaded.pop(Path(owl_file).resolve(), None)
+
+
+def clear_memory_cache():
+    _loaded.clear()
+
+
+def write_graph_cache(ontology: LoadedOntology, cache_dir: Union[str, Path]) -> Path:
+    """Store the triples of a loaded ontology so other processes can rebuild it without parsing"""
+    cache_file = Path(cache_dir).resolve() / f"graph-{ontology.key}.pickle"
+    if not cache_file.exists():
+        _write_cache(cache_file, _graph_to_cache(ontology.graph))
+    return cache_file
+
+
+def load_cached_ontology(owl_file: Union[str, Path], key: str, cache_file: Union[str, Path]) -> LoadedOntology:
+    """Rebuild the version of owl_file stored by write_graph_cache, e.g. in a worker process"""
+    path = Path(owl_file).resolve()
+    loaded = _loaded.get(path)
+    if loaded is not None and loaded.key == key:
+        return loaded
+
+    cached = _read_cache(Path(cache_file))
+    if cached is None:
+        raise FileNotFoundError(f"Graph cache not found: {cache_file}")
+    loaded = LoadedOntology(path, _graph_from_cache(cached), key, "disk")
+    _loaded[path] = loaded
+    return loaded
+
+
+def _file_key(path: Path) -> str:
+    stat = path.stat()
+    return hashlib.sha1(f"{CACHE_FORMAT}:{path}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+
+
+def _graph_to_cache(graph: Graph) -> Tuple[List, List]:
+    return list(graph.namespaces()), list(graph)
+
+
+def _graph_from_cache(cached: Tuple[List, List]) -> Graph:
+    namespaces, triples = cached
+    graph = Graph()
+    for prefix, uri in namespaces:
+        graph.bind(prefix, uri, override=True)
+    graph.addN((s, p, o, graph) for s, p, o in triples)
+    return graph
+
+
+def _read_cache(cache_file: Optional[Path]) -> Any:
+    if cache_file is None or not cache_file.exists():
+        return None
+    try:
+        with open(cache_file, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache {cache_file}: {str(e)}")
+        return None
+
+
+def _write_cache(cache_file: Optional[Path], value: Any):
+    if cache_file is None:
+        return
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    # Concurrent sweep jobs may race on the same entry; replace is atomic
+    os.replace(tmp_file, cache_file)
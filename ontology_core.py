@@ -0,0 +1,473 @@
+from rdflib import Graph, RDF, RDFS, OWL, XSD, URIRef, Literal
+from collections import deque
+from copy import deepcopy
+from difflib import Differ
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# progress(stage, done, total); a callback may raise ConversionCancelled to stop the run
+ProgressCallback = Callable[[str, int, int], None]
+
+
+class ConversionCancelled(Exception):
+    pass
+
+
+class OntologyDiff:
+    @staticmethod
+    def compare(old_g: Graph, new_g: Graph) -> Dict[str, Any]:
+        diff = {
+            'added_classes': set(),
+            'removed_classes': set(),
+            'changed_classes': {},
+            'added_properties': set(),
+            'removed_properties': set(),
+            'changed_properties': {},
+            'renamed': {}
+        }
+
+        old_classes = {str(c) for c in old_g.subjects(RDF.type, OWL.Class)}
+        new_classes = {str(c) for c in new_g.subjects(RDF.type, OWL.Class)}
+
+        old_props = {str(p) for t in (OWL.ObjectProperty, OWL.DatatypeProperty) for p in old_g.subjects(RDF.type, t)}
+        new_props = {str(p) for t in (OWL.ObjectProperty, OWL.DatatypeProperty) for p in new_g.subjects(RDF.type, t)}
+
+        diff['added_classes'] = new_classes - old_classes
+        diff['removed_classes'] = old_classes - new_classes
+        diff['added_properties'] = new_props - old_props
+        diff['removed_properties'] = old_props - new_props
+
+        diff['renamed'] = OntologyDiff._detect_renames(old_g, new_g, old_classes & new_classes)
+
+        for cls in old_classes & new_classes:
+            class_changes = OntologyDiff._compare_class(old_g, new_g, URIRef(cls))
+            if class_changes:
+                diff['changed_classes'][cls] = class_changes
+
+        for prop in old_props & new_props:
+            prop_changes = OntologyDiff._compare_property(old_g, new_g, URIRef(prop))
+            if prop_changes:
+                diff['changed_properties'][prop] = prop_changes
+
+        return diff
+
+    @staticmethod
+    def _detect_renames(old_g: Graph, new_g: Graph, common_classes: Set[str]) -> Dict[str, str]:
+        renames = {}
+        d = Differ()
+
+        for cls in common_classes:
+            old_label = str(old_g.value(URIRef(cls), RDFS.label) or "")
+            new_label = str(new_g.value(URIRef(cls), RDFS.label) or "")
+
+            if old_label and new_label and old_label != new_label:
+                similarity = sum(1 for s in d.compare(old_label, new_label) if s.startswith(' ')) / max(len(old_label),
+                                                                                                        len(new_label))
+                if similarity > 0.5:
+                    renames[cls] = new_label
+
+        return renames
+
+    @staticmethod
+    def _compare_class(old_g: Graph, new_g: Graph, class_uri: URIRef) -> Dict[str, Any]:
+        changes = {}
+
+        old_parents = {str(p) for p in old_g.objects(class_uri, RDFS.subClassOf) if isinstance(p, URIRef)}
+        new_parents = {str(p) for p in new_g.objects(class_uri, RDFS.subClassOf) if isinstance(p, URIRef)}
+
+        if old_parents != new_parents:
+            changes['parents'] = {
+                'added': list(new_parents - old_parents),
+                'removed': list(old_parents - new_parents)
+            }
+
+        return changes
+
+    @staticmethod
+    def _compare_property(old_g: Graph, new_g: Graph, prop_uri: URIRef) -> Dict[str, Any]:
+        changes = {}
+
+        old_domain = str(old_g.value(prop_uri, RDFS.domain)) if old_g.value(prop_uri, RDFS.domain) else None
+        new_domain = str(new_g.value(prop_uri, RDFS.domain)) if new_g.value(prop_uri, RDFS.domain) else None
+
+        if old_domain != new_domain:
+            changes['domain'] = {'old': old_domain, 'new': new_domain}
+
+        old_range = str(old_g.value(prop_uri, RDFS.range)) if old_g.value(prop_uri, RDFS.range) else None
+        new_range = str(new_g.value(prop_uri, RDFS.range)) if new_g.value(prop_uri, RDFS.range) else None
+
+        if old_range != new_range:
+            changes['range'] = {'old': old_range, 'new': new_range}
+
+        old_type = 'ObjectProperty' if (prop_uri, RDF.type, OWL.ObjectProperty) in old_g else 'DatatypeProperty'
+        new_type = 'ObjectProperty' if (prop_uri, RDF.type, OWL.ObjectProperty) in new_g else 'DatatypeProperty'
+
+        if old_type != new_type:
+            changes['type'] = {'old': old_type, 'new': new_type}
+
+        return changes
+
+
+class OntologyVersionManager:
+    @staticmethod
+    def load_version(g: Graph) -> str:
+        version = g.value(URIRef("http://example.org/ontology#Ontology"), OWL.versionInfo)
+        return str(version) if version else "1.0.0"
+
+    @staticmethod
+    def generate_migration_rules(old_g: Graph, new_g: Graph) -> Dict[str, Any]:
+        diff = OntologyDiff.compare(old_g, new_g)
+        rules = {
+            'field_renames': {},
+            'type_changes': {},
+            'default_values': {},
+            'removed_fields': {},
+            'added_fields': {},
+            'class_changes': {}
+        }
+
+        for prop_uri, changes in diff['changed_properties'].items():
+            prop_name = prop_uri.split('#')[-1]
+
+            if 'range' in changes:
+                rules['type_changes'][prop_name] = {
+                    'old': OntologyVersionManager._uri_to_type(changes['range']['old']),
+                    'new': OntologyVersionManager._uri_to_type(changes['range']['new'])
+                }
+
+            if 'domain' in changes:
+                rules['domain_changes'] = rules.get('domain_changes', {})
+                rules['domain_changes'][prop_name] = {
+                    'old': changes['domain']['old'].split('#')[-1],
+                    'new': changes['domain']['new'].split('#')[-1]
+                }
+
+        for prop_uri in diff['added_properties']:
+            prop_name = prop_uri.split('#')[-1]
+            range_uri = str(new_g.value(URIRef(prop_uri), RDFS.range)) if new_g.value(URIRef(prop_uri),
+                                                                                      RDFS.range) else None
+            rules['added_fields'][prop_name] = {
+                'type': OntologyVersionManager._uri_to_type(range_uri),
+                'default': OntologyVersionManager._get_default_value(range_uri)
+            }
+
+        for prop_uri in diff['removed_properties']:
+            prop_name = prop_uri.split('#')[-1]
+            rules['removed_fields'][prop_name] = True
+
+        for cls_uri, changes in diff['changed_classes'].items():
+            cls_name = cls_uri.split('#')[-1]
+            rules['class_changes'][cls_name] = changes
+
+        for old_uri, new_name in diff['renamed'].items():
+            old_name = old_uri.split('#')[-1]
+            rules['field_renames'][old_name] = new_name
+
+        return rules
+
+    @staticmethod
+    def apply_migration(rules: Dict[str, Any], data: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Migrate {entity: {field: value}} data the way the generated OntologyAdapter.migrate does"""
+        migrated = deepcopy(data)
+
+        for old_field, new_field in rules.get('field_renames', {}).items():
+            for entity_data in migrated.values():
+                if old_field in entity_data:
+                    entity_data[new_field] = entity_data.pop(old_field)
+
+        for entity_data in migrated.values():
+            for new_field, field_info in rules.get('added_fields', {}).items():
+                entity_data.setdefault(new_field, field_info['default'])
+
+        conversions = {('int', 'float'): float, ('str', 'int'): int, ('float', 'int'): int}
+        for field, type_change in rules.get('type_changes', {}).items():
+            convert = conversions.get((type_change['old'], type_change['new']))
+            for entity_data in migrated.values():
+                if field in entity_data and convert is not None:
+                    try:
+                        entity_data[field] = convert(entity_data[field])
+                    except (ValueError, TypeError):
+                        entity_data[field] = rules.get('added_fields', {}).get(field, {}).get('default')
+
+        return migrated
+
+    @staticmethod
+    def _uri_to_type(uri: str) -> str:
+        if not uri:
+            return 'Any'
+        if uri.startswith(str(XSD)):
+            if 'string' in uri: return 'str'
+            if 'integer' in uri: return 'int'
+            if 'float' in uri: return 'float'
+            if 'boolean' in uri: return 'bool'
+            if 'date' in uri: return 'date'
+        return 'Any'
+
+    @staticmethod
+    def _get_default_value(uri: str) -> Any:
+        if not uri:
+            return None
+        if uri.startswith(str(XSD)):
+            if 'string' in uri: return ""
+            if 'integer' in uri: return 0
+            if 'float' in uri: return 0.0
+            if 'boolean' in uri: return False
+        return None
+
+
+class OntologyIndividuals:
+    @staticmethod
+    def iter_individuals(g: Graph, class_names: Set[str]) -> Iterator[Tuple[str, str, Dict[str, List[Any]]]]:
+        """Yield (name, class, assertions) for every owl:NamedIndividual of a known class"""
+        for individual in g.subjects(RDF.type, OWL.NamedIndividual, unique=True):
+            class_name = OntologyIndividuals._class_of(g, individual, class_names)
+            if class_name is None:
+                continue
+            values: Dict[str, List[Any]] = {}
+            for predicate, obj in g.predicate_objects(individual):
+                if predicate == RDF.type:
+                    continue
+                values.setdefault(OntologyIndividuals._local_name(predicate), []).append(
+                    obj.toPython() if isinstance(obj, Literal) else OntologyIndividuals._local_name(obj)
+                )
+            yield OntologyIndividuals._local_name(individual), class_name, values
+
+    @staticmethod
+    def classify(g: Graph, class_names: Set[str]) -> Dict[str, str]:
+        classes = {}
+        for individual in g.subjects(RDF.type, OWL.NamedIndividual, unique=True):
+            class_name = OntologyIndividuals._class_of(g, individual, class_names)
+            if class_name is not None:
+                classes[OntologyIndividuals._local_name(individual)] = class_name
+        return classes
+
+    @staticmethod
+    def has_individuals(g: Graph) -> bool:
+        return (None, RDF.type, OWL.NamedIndividual) in g
+
+    @staticmethod
+    def _class_of(g: Graph, individual, class_names: Set[str]) -> Optional[str]:
+        for type_uri in g.objects(individual, RDF.type):
+            name = OntologyIndividuals._local_name(type_uri)
+            if name in class_names:
+                return name
+        return None
+
+    @staticmethod
+    def _local_name(uri) -> str:
+        uri = str(uri)
+        return uri.split('#')[-1] if '#' in uri else uri.split('/')[-1]
+
+
+class OntologyGraphIndex:
+    """Class and property facts of a graph, gathered with one scan per predicate"""
+
+    def __init__(self, g: Graph):
+        self.classes: List[URIRef] = []
+        self.object_properties: List[URIRef] = []
+        self.datatype_properties: List[URIRef] = []
+        kinds = {
+            OWL.Class: self.classes,
+            OWL.ObjectProperty: self.object_properties,
+            OWL.DatatypeProperty: self.datatype_properties
+        }
+        for subject, _, kind in g.triples((None, RDF.type, None)):
+            subjects = kinds.get(kind)
+            if subjects is not None:
+                subjects.append(subject)
+
+        self.domains = self._first_values(g, RDFS.domain)
+        self.ranges = self._first_values(g, RDFS.range)
+        self.comments = self._first_values(g, RDFS.comment)
+
+        self.parents: Dict[URIRef, List[URIRef]] = {}
+        for sub_class, _, super_class in g.triples((None, RDFS.subClassOf, None)):
+            if isinstance(super_class, URIRef):
+                self.parents.setdefault(sub_class, []).append(super_class)
+
+        limits = self._first_values(g, OWL.maxCardinality)
+        self.max_cardinality: Dict[URIRef, int] = {}
+        for restriction, _, prop in g.triples((None, OWL.onProperty, None)):
+            if restriction in limits:
+                self.max_cardinality.setdefault(prop, int(limits[restriction]))
+
+    @staticmethod
+    def _first_values(g: Graph, predicate: URIRef) -> Dict[Any, Any]:
+        values = {}
+        for subject, _, value in g.triples((None, predicate, None)):
+            values.setdefault(subject, value)
+        return values
+
+
+class ClassHierarchy:
+    """Topological class order, ancestor closure and flattened property sets, built once per ontology"""
+
+    def __init__(self, classes: List[Dict], properties: List[Dict]):
+        self.own_properties: Dict[str, List[Dict]] = {cls["name"]: [] for cls in classes}
+        for prop in properties:
+            if prop["domain"] in self.own_properties:
+                self.own_properties[prop["domain"]].append(prop)
+
+        self.classes = self._topological_order(classes)
+        self.index = {cls["name"]: position for position, cls in enumerate(self.classes)}
+
+        # Parents always precede their subclasses, so one forward pass closes the relation.
+        # Properties come in single-inheritance order: the first parent's full list, fields only the
+        # other parents bring, then the class's own; a redeclared field keeps its inherited position
+        self._ancestors: List[int] = []
+        self.all_properties: Dict[str, List[Dict]] = {}
+        self.children: Dict[str, List[str]] = {cls["name"]: [] for cls in self.classes}
+        for cls in self.classes:
+            bits = 0
+            properties: Dict[str, Dict] = {}
+            for parent in self.parents(cls["name"]):
+                self.children[parent].append(cls["name"])
+                position = self.index[parent]
+                bits |= (1 << position) | self._ancestors[position]
+                for prop in self.all_properties[parent]:
+                    properties.setdefault(prop["name"], prop)
+            self._ancestors.append(bits)
+            for prop in self.own_properties[cls["name"]]:
+                properties[prop["name"]] = prop
+            self.all_properties[cls["name"]] = list(properties.values())
+
+    def parents(self, name: str) -> List[str]:
+        cls = self.classes[self.index[name]]
+        return [parent for parent in cls["parent_classes"] if parent in self.index and parent != name]
+
+    def ancestors(self, name: str) -> List[str]:
+        bits = self._ancestors[self.index[name]]
+        return [cls["name"] for position, cls in enumerate(self.classes) if bits >> position & 1]
+
+    def is_subclass(self, name: str, ancestor: str) -> bool:
+        if name == ancestor:
+            return True
+        return bool(self._ancestors[self.index[name]] >> self.index[ancestor] & 1)
+
+    def roots(self) -> List[str]:
+        return [cls["name"] for cls in self.classes if not self.parents(cls["name"])]
+
+    def descendants(self, name: str) -> List[str]:
+        found = []
+        seen = {name}
+        pending = deque(self.children[name])
+        while pending:
+            child = pending.popleft()
+            if child not in seen:
+                seen.add(child)
+                found.append(child)
+                pending.extend(self.children[child])
+        return found
+
+    def subset(self, roots: Iterable[str]) -> "ClassHierarchy":
+        """Subtrees under roots, closed over superclasses and object property ranges so nothing dangles"""
+        roots = list(roots)
+        unknown = [name for name in roots if name not in self.index]
+        if unknown:
+            raise ValueError(f"Unknown classes: {', '.join(unknown)}")
+
+        selected = set()
+        for name in roots:
+            selected.add(name)
+            selected.update(self.descendants(name))
+        pending = list(selected)
+        while pending:
+            name = pending.pop()
+            dependencies = self.parents(name) + [
+                prop["range"] for prop in self.own_properties[name] if prop["type"] == "ObjectProperty"
+            ]
+            for dependency in dependencies:
+                if dependency in self.index and dependency not in selected:
+                    selected.add(dependency)
+                    pending.append(dependency)
+
+        classes = [cls for cls in self.classes if cls["name"] in selected]
+        properties = [prop for cls in classes for prop in self.own_properties[cls["name"]]]
+        return ClassHierarchy(classes, properties)
+
+    def _topological_order(self, classes: List[Dict]) -> List[Dict]:
+        known = {cls["name"] for cls in classes}
+        parents = {
+            cls["name"]: [p for p in cls["parent_classes"] if p in known and p != cls["name"]] for cls in classes
+        }
+        component = self._cycle_components(parents)
+
+        # Only edges inside a cycle are dropped; subclasses of a cyclic class keep their parents.
+        # The hierarchy works on copies so the caller's class records stay untouched
+        by_name = {}
+        for cls in classes:
+            name = cls["name"]
+            cut = {p for p in parents[name] if name in component and component.get(p) == component[name]}
+            if cut:
+                logger.warning(f"Cyclic subclass relation ignored: {name} -> {', '.join(sorted(cut))}")
+            by_name[name] = dict(cls, parent_classes=[
+                p for p in cls["parent_classes"] if p != name and p not in cut
+            ])
+
+        pending = {name: 0 for name in by_name}
+        children: Dict[str, List[str]] = {name: [] for name in by_name}
+        for name, cls in by_name.items():
+            for parent in cls["parent_classes"]:
+                if parent in by_name:
+                    pending[name] += 1
+                    children[parent].append(name)
+
+        ready = deque(name for name in by_name if pending[name] == 0)
+        ordered = []
+        while ready:
+            name = ready.popleft()
+            ordered.append(by_name[name])
+            for child in children[name]:
+                pending[child] -= 1
+                if pending[child] == 0:
+                    ready.append(child)
+        return ordered
+
+    @staticmethod
+    def _cycle_components(parents: Dict[str, List[str]]) -> Dict[str, int]:
+        """Strongly connected components of the subclass graph (Tarjan), only those with several classes"""
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack = set()
+        component: Dict[str, int] = {}
+        components = 0
+
+        for root in parents:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(parents[root]))]
+            while work:
+                name, edges = work[-1]
+                parent = next(edges, None)
+                if parent is not None:
+                    if parent not in index:
+                        index[parent] = low[parent] = len(index)
+                        stack.append(parent)
+                        on_stack.add(parent)
+                        work.append((parent, iter(parents[parent])))
+                    elif parent in on_stack:
+                        low[name] = min(low[name], index[parent])
+                    continue
+
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[name])
+                if low[name] == index[name]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        members.append(member)
+                        if member == name:
+                            break
+                    if len(members) > 1:
+                        for member in members:
+                            component[member] = components
+                        components += 1
+        return component
@@ -0,0 +1,268 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+import json
+import time
+import xml.etree.ElementTree as ET
+
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+RDFS_NS = "http://www.w3.org/2000/01/rdf-schema#"
+OWL_NS = "http://www.w3.org/2002/07/owl#"
+
+RDF_ABOUT = f"{{{RDF_NS}}}about"
+RDF_ID = f"{{{RDF_NS}}}ID"
+RDF_NODE_ID = f"{{{RDF_NS}}}nodeID"
+RDF_RESOURCE = f"{{{RDF_NS}}}resource"
+RDF_DESCRIPTION = f"{{{RDF_NS}}}Description"
+RDF_TYPE = f"{{{RDF_NS}}}type"
+RDFS_SUBCLASS_OF = f"{{{RDFS_NS}}}subClassOf"
+OWL_VERSION_INFO = f"{{{OWL_NS}}}versionInfo"
+
+# Rough per-target costs measured on the generators; good enough to flag multi-minute inputs
+PARSE_SECONDS_PER_BYTE = 1.3e-6
+OWL_BYTES_PER_ENTITY = 220
+GENERATE_SECONDS_PER_CLASS = 8e-5
+GENERATE_SECONDS_PER_PROPERTY = 1.5e-4
+CONVERT_SECONDS_PER_CLASS = 6e-4
+CONVERT_SECONDS_PER_PROPERTY = 5.4e-4
+
+
+class OntologyPreview:
+    """Counts gathered by a streaming pre-scan, without building an RDF graph"""
+
+    def __init__(self, path: Path, source_format: str):
+        self.path = path
+        self.format = source_format
+        self.size = path.stat().st_size
+        self.classes = 0
+        self.object_properties = 0
+        self.datatype_properties = 0
+        self.individuals = 0
+        self.depth = 0
+        self.version: Optional[str] = None
+        self.scan_seconds = 0.0
+
+    @property
+    def properties(self) -> int:
+        return self.object_properties + self.datatype_properties
+
+    @property
+    def estimated_convert_seconds(self) -> Optional[float]:
+        """Source to OWL conversion; None when the file already is OWL"""
+        if self.format == "owl":
+            return None
+        return self.classes * CONVERT_SECONDS_PER_CLASS + self.properties * CONVERT_SECONDS_PER_PROPERTY
+
+    @property
+    def estimated_generate_seconds(self) -> float:
+        """Parsing the OWL plus one code generation target"""
+        owl_size = self.size if self.format == "owl" else (self.classes + self.properties) * OWL_BYTES_PER_ENTITY
+        return (owl_size * PARSE_SECONDS_PER_BYTE
+                + self.classes * GENERATE_SECONDS_PER_CLASS
+                + self.properties * GENERATE_SECONDS_PER_PROPERTY)
+
+    def as_dict(self) -> Dict:
+        return {
+            "path": str(self.path),
+            "format": self.format,
+            "size": self.size,
+            "classes": self.classes,
+            "object_properties": self.object_properties,
+            "datatype_properties": self.datatype_properties,
+            "individuals": self.individuals,
+            "depth": self.depth,
+            "version": self.version,
+            "scan_seconds": self.scan_seconds,
+            "estimated_convert_seconds": self.estimated_convert_seconds,
+            "estimated_generate_seconds": self.estimated_generate_seconds
+        }
+
+
+def preview_file(path: Union[str, Path]) -> OntologyPreview:
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {path}")
+
+    started = time.perf_counter()
+    suffix = path.suffix.lower()
+    if suffix in (".owl", ".rdf"):
+        preview = _scan_rdf_xml(path)
+    elif suffix == ".xml":
+        preview = _scan_source_xml(path)
+    elif suffix in (".yaml", ".yml", ".json"):
+        preview = _scan_source_dict(path)
+    else:
+        raise ValueError(f"Unsupported format: {path.suffix}")
+    preview.scan_seconds = time.perf_counter() - started
+    return preview
+
+
+def _scan_rdf_xml(path: Path) -> OntologyPreview:
+    preview = OntologyPreview(path, "owl")
+    kinds: Dict[str, Set[str]] = {
+        f"{OWL_NS}Class": set(),
+        f"{OWL_NS}ObjectProperty": set(),
+        f"{OWL_NS}DatatypeProperty": set(),
+        f"{OWL_NS}NamedIndividual": set()
+    }
+    parents: Dict[str, List[str]] = {}
+    subjects: List[Optional[str]] = []
+    level = 0
+    root = None
+
+    try:
+        # RDF/XML alternates node and property elements: odd levels are nodes, even levels properties
+        for event, elem in ET.iterparse(str(path), events=("start", "end")):
+            if event == "start":
+                level += 1
+                if root is None:
+                    root = elem
+                elif level % 2 == 0:
+                    subject = elem.get(RDF_ABOUT) or elem.get(RDF_ID) or elem.get(RDF_NODE_ID)
+                    subjects.append(subject)
+                    if subject and elem.tag != RDF_DESCRIPTION:
+                        _add_kind(kinds, subject, elem.tag[1:].replace("}", ""))
+                else:
+                    subject = subjects[-1] if subjects else None
+                    resource = elem.get(RDF_RESOURCE)
+                    if subject and resource:
+                        if elem.tag == RDF_TYPE:
+                            _add_kind(kinds, subject, resource)
+                        elif elem.tag == RDFS_SUBCLASS_OF:
+                            parents.setdefault(subject, []).append(resource)
+                continue
+
+            if level % 2 == 0:
+                subjects.pop()
+                if level == 2:
+                    # Drop finished top-level nodes so memory stays flat on large files
+                    root.clear()
+            elif elem.tag == OWL_VERSION_INFO and preview.version is None and elem.text:
+                preview.version = elem.text.strip()
+            level -= 1
+    except ET.ParseError as e:
+        raise ValueError(f"XML parsing error: {str(e)}")
+
+    classes = kinds[f"{OWL_NS}Class"]
+    preview.classes = len(classes)
+    preview.object_properties = len(kinds[f"{OWL_NS}ObjectProperty"])
+    preview.datatype_properties = len(kinds[f"{OWL_NS}DatatypeProperty"])
+    preview.individuals = len(kinds[f"{OWL_NS}NamedIndividual"])
+    preview.depth = _hierarchy_depth(classes, parents)
+    return preview
+
+
+def _add_kind(kinds: Dict[str, Set[str]], subject: str, kind: str):
+    subjects = kinds.get(kind)
+    if subjects is not None:
+        subjects.add(subject)
+
+
+def _scan_source_xml(path: Path) -> OntologyPreview:
+    preview = OntologyPreview(path, "xml")
+    classes: Set[str] = set()
+    parents: Dict[str, List[str]] = {}
+    # A property declared on several classes becomes one OWL property
+    object_properties: Set[str] = set()
+    datatype_properties: Set[str] = set()
+
+    try:
+        for _, elem in ET.iterparse(str(path), events=("end",)):
+            if elem.tag == "property":
+                if elem.get("type", "object") == "object":
+                    object_properties.add(elem.get("name"))
+                else:
+                    datatype_properties.add(elem.get("name"))
+            elif elem.tag == "class":
+                name = elem.get("name")
+                if name:
+                    classes.add(name)
+                    if elem.get("parent"):
+                        parents[name] = [elem.get("parent")]
+                elem.clear()
+    except ET.ParseError as e:
+        raise ValueError(f"XML parsing error: {str(e)}")
+
+    preview.classes = len(classes)
+    preview.object_properties = len(object_properties)
+    preview.datatype_properties = len(datatype_properties)
+    preview.depth = _hierarchy_depth(classes, parents)
+    return preview
+
+
+def _scan_source_dict(path: Path) -> OntologyPreview:
+    if path.suffix.lower() == ".json":
+        preview = OntologyPreview(path, "json")
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"JSON parsing error: {str(e)}")
+    else:
+        import yaml
+
+        preview = OntologyPreview(path, "yaml")
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                data = yaml.load(f, Loader=loader)
+            except yaml.YAMLError as e:
+                raise ValueError(f"YAML parsing error: {str(e)}")
+
+    if not isinstance(data, dict):
+        raise ValueError("Expected dictionary at document root")
+
+    classes = data.get("classes", {})
+    parents: Dict[str, List[str]] = {}
+    object_properties: Set[str] = set()
+    datatype_properties: Set[str] = set()
+    for class_name, class_data in classes.items():
+        if not isinstance(class_data, dict):
+            continue
+        if "parent" in class_data:
+            parents[class_name] = [class_data["parent"]]
+        for prop_name, prop_data in class_data.get("properties", {}).items():
+            if isinstance(prop_data, dict) and prop_data.get("type", "object") != "object":
+                datatype_properties.add(prop_name)
+            else:
+                object_properties.add(prop_name)
+
+    preview.classes = len(classes)
+    preview.object_properties = len(object_properties)
+    preview.datatype_properties = len(datatype_properties)
+    preview.depth = _hierarchy_depth(set(classes), parents)
+    return preview
+
+
+def _hierarchy_depth(classes: Set[str], parents: Dict[str, List[str]]) -> int:
+    """Longest subclass chain among known classes; cycles are cut where they close"""
+    depths: Dict[str, int] = {}
+    for start in classes:
+        if start in depths:
+            continue
+        stack = [start]
+        visiting = {start}
+        while stack:
+            name = stack[-1]
+            pending = [p for p in parents.get(name, []) if p in classes and p not in depths and p not in visiting]
+            if pending:
+                stack.append(pending[0])
+                visiting.add(pending[0])
+                continue
+            stack.pop()
+            visiting.discard(name)
+            depths[name] = max(
+                (depths[p] + 1 for p in parents.get(name, []) if p in depths),
+                default=0
+            )
+    return max(depths.values(), default=0)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Quick streaming preview of an ontology or source file")
+    parser.add_argument("files", nargs="+", help="OWL (RDF/XML), XML, YAML or JSON files")
+    args = parser.parse_args()
+
+    for file in args.files:
+        print(json.dumps(preview_file(file).as_dict(), indent=2))
@@ -0,0 +1,418 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import http.client
+import importlib
+import json
+import logging
+import os
+import signal
+import socket
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 16 * 1024 * 1024
+WARM_MODULES = ("converter", "ontology_cache", "ontology_targets", "owl_to_python", "owl_to_java", "owl_to_cpp")
+# Parameters holding file paths; they are part of the coalescing key together with the file stamps
+FILE_PARAMS = ("source", "owl", "previous")
+PATH_PARAMS = FILE_PARAMS + ("output",)
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+_cache_dir: Optional[str] = None
+# Converters by source file; a repeated convert only re-converts the classes that changed
+_converters: Dict[str, Any] = {}
+
+
+class ServiceError(ValueError):
+    """A rejected request, or an error reported back to the client"""
+
+
+# Worker side: these run inside the pool processes, which keep their parsed ontologies between requests
+
+def _warm_worker(cache_dir: Optional[str]):
+    global _cache_dir
+    _cache_dir = cache_dir
+    for module in WARM_MODULES:
+        importlib.import_module(module)
+
+
+def _require(params: Dict[str, Any], name: str) -> Any:
+    if not params.get(name):
+        raise ServiceError(f"Missing parameter: {name}")
+    return params[name]
+
+
+def _load(path: str):
+    from ontology_cache import load_ontology
+
+    return load_ontology(path, _cache_dir)
+
+
+def _convert_output(params: Dict[str, Any]) -> str:
+    return params.get("output") or str(Path(_require(params, "source")).with_suffix(".owl"))
+
+
+def _convert(params: Dict[str, Any]) -> Dict[str, Any]:
+    from converter import OntologyConverter
+
+    source = _require(params, "source")
+    owl_file = _convert_output(params)
+    converter = _converters.setdefault(source, OntologyConverter())
+    changes = converter.update(source, owl_file, params.get("version") or "1.0.0")
+    return {"owl": owl_file, "classes": changes}
+
+
+def _generate(params: Dict[str, Any]) -> Dict[str, Any]:
+    from ontology_targets import TARGETS, generate_targets, ontology_summary
+
+    ontology = _load(_require(params, "owl"))
+    previous = _load(params["previous"]) if params.get("previous") else None
+    results = generate_targets(
+        ontology, params.get("output") or "generated", params.get("targets") or TARGETS,
+        previous=previous,
+        version=params.get("version"),
+        folder_prefix=params.get("prefix"),
+        options=params.get("options"),
+        # Requests already run in parallel across the service's own worker processes
+        max_workers=1,
+        subtrees=params.get("subtrees")
+    )
+    return {
+        "ok": all(result.ok for result in results.values()),
+        "ontology": ontology_summary(ontology),
+        "targets": {target: result.as_dict() for target, result in results.items()}
+    }
+
+
+def _diff(params: Dict[str, Any]) -> Dict[str, Any]:
+    ontology = _load(_require(params, "owl"))
+    previous = _load(_require(params, "previous"))
+    return {"from_version": previous.version, "to_version": ontology.version, "diff": ontology.diff(previous)}
+
+
+def _migrate(params: Dict[str, Any]) -> Dict[str, Any]:
+    from ontology_core import OntologyVersionManager
+
+    ontology = _load(_require(params, "owl"))
+    previous = _load(_require(params, "previous"))
+    rules = ontology.migration_rules(previous)
+    result = {"from_version": previous.version, "to_version": ontology.version, "rules": rules}
+    if params.get("data") is not None:
+        result["data"] = OntologyVersionManager.apply_migration(rules, params["data"])
+    return result
+
+
+ENDPOINTS = {
+    "convert": _convert,
+    "generate": _generate,
+    "diff": _diff,
+    "migrate": _migrate
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def _run(endpoint: str, params: Dict[str, Any]) -> str:
+    # Encoded in the worker, so coalesced requests share one string and nothing large is pickled back
+    return json.dumps(ENDPOINTS[endpoint](params), default=_json_default)
+
+
+# Server side
+
+class OntologyService:
+    """HTTP front end over a pool of warm worker processes; identical in-flight requests share one job"""
+
+    def __init__(self, workers: Optional[int] = None, cache_dir: Optional[str] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_dir = str(Path(cache_dir).resolve()) if cache_dir else None
+        self.pool = self._create_pool()
+        self.in_flight: Dict[str, "asyncio.Future[str]"] = {}
+        self.output_locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {"requests": 0, "coalesced": 0, "failed": 0}
+        self.started = time.time()
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker, initargs=(self.cache_dir,))
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "cache_dir": self.cache_dir,
+            "in_flight": len(self.in_flight),
+            "uptime": time.time() - self.started,
+            **self.stats
+        }
+
+    async def call(self, endpoint: str, params: Dict[str, Any]) -> str:
+        key = _request_key(endpoint, params)
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            future = asyncio.ensure_future(self._execute(endpoint, params))
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        # A client that disconnects must not cancel the job others may be waiting on
+        return await asyncio.shield(future)
+
+    async def _execute(self, endpoint: str, params: Dict[str, Any]) -> str:
+        loop = asyncio.get_running_loop()
+        if endpoint != "convert":
+            return await loop.run_in_executor(self.pool, _run, endpoint, params)
+        # Each worker keeps its own converter per source, so two of them could write the same OWL file at once
+        lock = self.output_locks.setdefault(os.path.abspath(_convert_output(params)), asyncio.Lock())
+        async with lock:
+            return await loop.run_in_executor(self.pool, _run, endpoint, params)
+
+    async def respond(self, reader: asyncio.StreamReader) -> Tuple[int, str]:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            return 400, _error("Malformed request line")
+        method, target, _ = request_line
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY_BYTES:
+            return 413, _error(f"Request body over {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+
+        endpoint = target.split("?", 1)[0].strip("/")
+        if endpoint == "health":
+            return 200, json.dumps(self.health())
+        if endpoint not in ENDPOINTS:
+            return 404, _error(f"Unknown endpoint: {endpoint}")
+        if method != "POST":
+            return 405, _error(f"{endpoint} expects POST")
+
+        try:
+            params = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            return 400, _error(f"Invalid JSON: {str(e)}")
+        if not isinstance(params, dict):
+            return 400, _error("Expected a JSON object")
+
+        self.stats["requests"] += 1
+        try:
+            return 200, await self.call(endpoint, params)
+        except BrokenProcessPool:
+            self.stats["failed"] += 1
+            logger.error("Worker pool broke, starting a new one")
+            self.pool = self._create_pool()
+            return 500, _error("Worker process died")
+        except FileNotFoundError as e:
+            self.stats["failed"] += 1
+            return 404, _error(str(e))
+        except ValueError as e:
+            self.stats["failed"] += 1
+            return 400, _error(str(e))
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"{endpoint} failed: {str(e)}")
+            return 500, _error(str(e))
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            status, body = await self.respond(reader)
+        except (asyncio.IncompleteReadError, ValueError) as e:
+            status, body = 400, _error(str(e))
+        payload = body.encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + payload
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+def _request_key(endpoint: str, params: Dict[str, Any]) -> str:
+    stamps = {}
+    for name in FILE_PARAMS:
+        if isinstance(params.get(name), str):
+            try:
+                stat = os.stat(params[name])
+                stamps[name] = [stat.st_mtime_ns, stat.st_size]
+            except OSError:
+                stamps[name] = None
+    return json.dumps([endpoint, params, stamps], sort_keys=True, default=str)
+
+
+def _error(message: str) -> str:
+    return json.dumps({"error": message})
+
+
+async def serve(service: OntologyService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                socket_path: Optional[str] = None):
+    if socket_path:
+        if os.path.exists(socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(socket_path)
+            except OSError:
+                # Left behind by a service that did not shut down cleanly
+                os.unlink(socket_path)
+            else:
+                raise ServiceError(f"A service is already listening on {socket_path}")
+            finally:
+                probe.close()
+        server = await asyncio.start_unix_server(service.handle, path=socket_path)
+        address = socket_path
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+        address = f"{host}:{port}"
+
+    try:
+        # Stop like on Ctrl+C, so the worker pool is shut down instead of being orphaned
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass
+
+    logger.info(f"Ontology service on {address} with {service.workers} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+# Client side
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class OntologyServiceClient:
+    """Blocking client for build scripts; address is "host:port" or the path of a Unix socket"""
+
+    def __init__(self, address: str = f"{DEFAULT_HOST}:{DEFAULT_PORT}", timeout: Optional[float] = None):
+        self.address = address
+        self.timeout = timeout
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if os.sep in self.address or self.address.endswith(".sock"):
+            return _UnixHTTPConnection(self.address, self.timeout)
+        host, _, port = self.address.rpartition(":")
+        return http.client.HTTPConnection(host or DEFAULT_HOST, int(port), timeout=self.timeout)
+
+    def request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        params = dict(params or {})
+        # The service may run in another directory; send it absolute paths
+        for name in PATH_PARAMS:
+            if isinstance(params.get(name), str):
+                params[name] = os.path.abspath(params[name])
+
+        connection = self._connection()
+        try:
+            if endpoint == "health":
+                connection.request("GET", "/health")
+            else:
+                connection.request("POST", f"/{endpoint}", body=json.dumps(params),
+                                   headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            result = json.loads(response.read() or b"{}")
+        finally:
+            connection.close()
+
+        if response.status != 200:
+            raise ServiceError(f"{endpoint} failed ({response.status}): {result.get('error')}")
+        return result
+
+    def health(self) -> Dict[str, Any]:
+        return self.request("health")
+
+    def convert(self, source: str, output: Optional[str] = None, version: Optional[str] = None) -> Dict[str, Any]:
+        return self.request("convert", {"source": source, "output": output, "version": version})
+
+    def generate(self, owl: str, output: str = "generated", targets: Optional[List[str]] = None,
+                 previous: Optional[str] = None, version: Optional[str] = None, prefix: Optional[str] = None,
+                 options: Optional[Dict[str, Dict[str, Any]]] = None,
+                 subtrees: Optional[List[str]] = None) -> Dict[str, Any]:
+        return self.request("generate", {
+            "owl": owl, "output": output, "targets": targets, "previous": previous,
+            "version": version, "prefix": prefix, "options": options, "subtrees": subtrees
+        })
+
+    def diff(self, owl: str, previous: str) -> Dict[str, Any]:
+        return self.request("diff", {"owl": owl, "previous": previous})
+
+    def migrate(self, owl: str, previous: str, data: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        return self.request("migrate", {"owl": owl, "previous": previous, "data": data})
+
+
+def main():
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Local ontology conversion and generation service")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the service")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST)
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--socket", help="Listen on a Unix socket instead of TCP")
+    serve_parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    serve_parser.add_argument("--cache-dir", default=".ontology_cache",
+                              help="Parse and diff cache shared by the workers")
+
+    call_parser = commands.add_parser("call", help="Send one request and print the JSON response")
+    call_parser.add_argument("endpoint", choices=sorted(ENDPOINTS) + ["health"])
+    call_parser.add_argument("params", nargs="?", default="{}", help="Request parameters as a JSON object")
+    call_parser.add_argument("--address", default=f"{DEFAULT_HOST}:{DEFAULT_PORT}",
+                             help="host:port or Unix socket path of the service")
+    args = parser.parse_args()
+
+    if args.command == "call":
+        try:
+            result = OntologyServiceClient(args.address).request(args.endpoint, json.loads(args.params))
+        except (ServiceError, OSError) as e:
+            print(f"Error: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(result, indent=2))
+        return
+
+    service = OntologyService(args.workers, args.cache_dir)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.socket))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,360 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import logging
+import time
+from ontology_cache import LoadedOntology
+from ontology_core import ConversionCancelled, OntologyGraphIndex, ProgressCallback
+
+logger = logging.getLogger(__name__)
+
+TARGETS = ("python", "java", "cpp")
+PROGRESS_POLL_SECONDS = 0.05
+
+# Set in worker processes by _init_worker
+_progress_queue = None
+_cancel_event = None
+
+
+class TargetResult:
+    """Outcome of one emitter run: output directory or error, and wall time"""
+
+    def __init__(self, target: str, seconds: float, output_dir: Optional[str] = None,
+                 error: Optional[Exception] = None):
+        self.target = target
+        self.seconds = seconds
+        self.output_dir = output_dir
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "output": self.output_dir,
+            "seconds": self.seconds,
+            "error": str(self.error) if self.error else None
+        }
+
+
+def generate_target(target: str, ontology: LoadedOntology, base_output_dir: Union[str, Path],
+                    previous: Optional[LoadedOntology] = None, migration_rules: Optional[Dict] = None,
+                    version: Optional[str] = None, folder_prefix: Optional[str] = None,
+                    options: Optional[Dict[str, Any]] = None, progress: Optional[ProgressCallback] = None,
+                    subtrees: Optional[List[str]] = None) -> str:
+    """Run one emitter on an already loaded ontology; options are the target-specific keyword arguments
+
+    subtrees limits generation to those classes, their subclasses and the classes they depend on.
+    """
+    common = dict(
+        owl_file=str(ontology.path),
+        base_output_dir=str(base_output_dir),
+        version=version,
+        previous_version=str(previous.path) if previous else None,
+        folder_prefix=folder_prefix,
+        graph=ontology.graph,
+        previous_graph=previous.graph if previous else None,
+        migration_rules=migration_rules,
+        progress=progress,
+        subtrees=subtrees
+    )
+    options = options or {}
+
+    # Emitter modules are imported on first use so a single-target run loads only its own
+    if target == "python":
+        from owl_to_python import generate_python_classes
+        return generate_python_classes(**options, **common)
+    if target == "java":
+        from owl_to_java import generate_java_classes
+        return generate_java_classes(**options, **common)
+    if target == "cpp":
+        from owl_to_cpp import generate_cpp_from_owl
+        return generate_cpp_from_owl(**options, **common)
+    raise ValueError(f"Unsupported target: {target}")
+
+
+def generate_targets(ontology: LoadedOntology, base_output_dir: Union[str, Path],
+                     targets: Iterable[str] = TARGETS, previous: Optional[LoadedOntology] = None,
+                     version: Optional[str] = None, folder_prefix: Optional[str] = None,
+                     options: Optional[Dict[str, Dict[str, Any]]] = None,
+                     progress: Optional[ProgressCallback] = None,
+                     max_workers: Optional[int] = None,
+                     subtrees: Optional[List[str]] = None) -> Dict[str, TargetResult]:
+    """Run several emitters in parallel processes over one parsed graph and one migration diff
+
+    Workers rebuild the graph from its triple cache instead of parsing the OWL file. Progress
+    stages are reported as "<target>:<stage>". A failing target does not stop the others; its
+    error is returned in the result. Cancellation stops all of them.
+    """
+    targets = list(targets)
+    options = options or {}
+    migration_rules = ontology.migration_rules(previous) if previous else None
+    workers = min(max_workers or len(targets), len(targets))
+
+    if workers <= 1:
+        results = {}
+        for target in targets:
+            target_progress = None
+            if progress is not None:
+                def target_progress(stage: str, done: int, total: int, target=target):
+                    progress(f"{target}:{stage}", done, total)
+            results[target] = _run_target(
+                target, ontology, base_output_dir, previous, migration_rules,
+                version, folder_prefix, options.get(target), target_progress, subtrees
+            )
+    else:
+        results = _run_in_processes(
+            targets, workers, ontology, base_output_dir, previous, migration_rules,
+            version, folder_prefix, options, progress, subtrees
+        )
+
+    for result in results.values():
+        if result.ok:
+            logger.info(f"{result.target} generated in {result.seconds:.2f}s -> {result.output_dir}")
+        else:
+            logger.error(f"{result.target} failed after {result.seconds:.2f}s: {result.error}")
+    return results
+
+
+def _run_target(target: str, ontology: LoadedOntology, base_output_dir: Union[str, Path],
+                previous: Optional[LoadedOntology], migration_rules: Optional[Dict], version: Optional[str],
+                folder_prefix: Optional[str], options: Optional[Dict[str, Any]],
+                progress: Optional[ProgressCallback], subtrees: Optional[List[str]]) -> TargetResult:
+    started = time.perf_counter()
+    try:
+        output_dir = generate_target(
+            target, ontology, base_output_dir, previous, migration_rules,
+            version, folder_prefix, options, progress, subtrees
+        )
+    except ConversionCancelled:
+        raise
+    except Exception as e:
+        return TargetResult(target, time.perf_counter() - started, error=e)
+    return TargetResult(target, time.perf_counter() - started, output_dir=output_dir)
+
+
+def _run_in_processes(targets: List[str], workers: int, ontology: LoadedOntology,
+                      base_output_dir: Union[str, Path], previous: Optional[LoadedOntology],
+                      migration_rules: Optional[Dict], version: Optional[str], folder_prefix: Optional[str],
+                      options: Dict[str, Dict[str, Any]], progress: Optional[ProgressCallback],
+                      subtrees: Optional[List[str]]) -> Dict[str, TargetResult]:
+    import multiprocessing
+    import queue
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor, wait
+    from ontology_cache import write_graph_cache
+
+    context = multiprocessing.get_context()
+    progress_queue = context.Queue()
+    cancel_event = context.Event()
+
+    def drain():
+        while True:
+            try:
+                stage, done, total = progress_queue.get_nowait()
+            except queue.Empty:
+                return
+            if progress is not None and not cancel_event.is_set():
+                try:
+                    progress(stage, done, total)
+                except ConversionCancelled:
+                    cancel_event.set()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="ontology-targets-") as temp_dir:
+        def shared(loaded: Optional[LoadedOntology]) -> Optional[Tuple[str, str, str]]:
+            if loaded is None:
+                return None
+            cache_file = write_graph_cache(loaded, loaded.cache_dir or temp_dir)
+            return str(loaded.path), loaded.key, str(cache_file)
+
+        shared_ontology, shared_previous = shared(ontology), shared(previous)
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(progress_queue, cancel_event)) as pool:
+            futures = {
+                pool.submit(
+                    _run_in_worker, target, shared_ontology, shared_previous, str(base_output_dir),
+                    migration_rules, version, folder_prefix, options.get(target), progress is not None, subtrees
+                ): target
+                for target in targets
+            }
+            pending = set(futures)
+            while pending:
+                _, pending = wait(pending, timeout=PROGRESS_POLL_SECONDS)
+                drain()
+            drain()
+
+            for future, target in futures.items():
+                try:
+                    results[target] = future.result()
+                except ConversionCancelled:
+                    cancel_event.set()
+                except Exception as e:
+                    results[target] = TargetResult(target, 0.0, error=e)
+
+    if cancel_event.is_set():
+        raise ConversionCancelled(", ".join(targets))
+    return {target: results[target] for target in targets}
+
+
+def _init_worker(progress_queue, cancel_event):
+    global _progress_queue, _cancel_event
+    _progress_queue = progress_queue
+    _cancel_event = cancel_event
+
+
+def _run_in_worker(target: str, shared_ontology: Tuple[str, str, str],
+                   shared_previous: Optional[Tuple[str, str, str]], base_output_dir: str,
+                   migration_rules: Optional[Dict], version: Optional[str], folder_prefix: Optional[str],
+                   options: Optional[Dict[str, Any]], report: bool,
+                   subtrees: Optional[List[str]]) -> TargetResult:
+    from ontology_cache import load_cached_ontology
+
+    def target_progress(stage: str, done: int, total: int):
+        if _cancel_event.is_set():
+            raise ConversionCancelled(target)
+        if report:
+            _progress_queue.put((f"{target}:{stage}", done, total))
+
+    ontology = load_cached_ontology(*shared_ontology)
+    previous = load_cached_ontology(*shared_previous) if shared_previous else None
+    return _run_target(
+        target, ontology, base_output_dir, previous, migration_rules,
+        version, folder_prefix, options, target_progress, subtrees
+    )
+
+
+def ontology_summary(ontology: LoadedOntology) -> Dict[str, Any]:
+    index = OntologyGraphIndex(ontology.graph)
+    return {
+        "path": str(ontology.path),
+        "version": ontology.version,
+        "source": ontology.source,
+        "triples": len(ontology.graph),
+        "classes": len(index.classes),
+        "object_properties": len(index.object_properties),
+        "datatype_properties": len(index.datatype_properties)
+    }
+
+
+def add_target_arguments(parser):
+    """Target selection and emitter flags shared by the command line tools"""
+    parser.add_argument("--targets", default=",".join(TARGETS), help="Comma-separated targets (default: all)")
+    parser.add_argument("--jobs", type=int, help="Processes emitting targets in parallel (default: one per target)")
+    parser.add_argument("--output", default="generated", help="Output directory")
+    parser.add_argument("--previous", help="Path to previous version OWL file for migration")
+    parser.add_argument("--prefix", help="Custom folder name prefix")
+    parser.add_argument("--subtree", action="append", help="Only generate this class and its subclasses (repeatable)")
+    python_group = parser.add_argument_group("python")
+    python_group.add_argument("--hydra", action="store_true", help="Enable Hydra support")
+    python_group.add_argument("--identity-map", action="store_true", help="Generate an identity-mapped object registry")
+    python_group.add_argument("--columnar", action="store_true", help="Generate NumPy-backed columnar table classes")
+    python_group.add_argument("--loaders", action="store_true", help="Generate streaming CSV/JSONL loaders")
+    python_group.add_argument("--validators", action="store_true", help="Generate precompiled runtime validators")
+    python_group.add_argument("--sharded", action="store_true", help="Write one lazily imported module per class")
+    python_group.add_argument("--schema-yaml", action="store_true", help="Also write the Hydra class schema to hydra_config/ontology.yaml")
+    java_group = parser.add_argument_group("java")
+    java_group.add_argument("--package", default="generated", help="Java package name")
+    java_group.add_argument("--equals-hash", action="store_true", help="Generate equals/hashCode")
+    java_group.add_argument("--immutable", action="store_true", help="Generate immutable classes with builders")
+
+
+def parse_targets(parser, args) -> List[str]:
+    targets = [target.strip() for target in args.targets.split(",") if target.strip()]
+    unknown = [target for target in targets if target not in TARGETS]
+    if unknown or not targets:
+        parser.error(f"Unsupported targets: {', '.join(unknown) or '(none)'}; choose from {', '.join(TARGETS)}")
+    return targets
+
+
+def target_options(args) -> Dict[str, Dict[str, Any]]:
+    return {
+        "python": dict(
+            hydra_mode=args.hydra,
+            identity_map=args.identity_map,
+            columnar=args.columnar,
+            loaders=args.loaders,
+            validators=args.validators,
+            sharded=args.sharded,
+            schema_yaml=args.schema_yaml
+        ),
+        "java": dict(
+            package_name=args.package,
+            equals_hash=args.equals_hash,
+            immutable=args.immutable
+        )
+    }
+
+
+def main():
+    """Parse once, emit every requested target in parallel and report the run as text or JSON"""
+    import argparse
+    import json
+    import sys
+    from ontology_cache import load_ontology
+
+    parser = argparse.ArgumentParser(description="Generate Python, Java and C++ code from one OWL parse")
+    parser.add_argument("owl_file", help="Path to input OWL file")
+    parser.add_argument("--version", help="Override ontology version")
+    parser.add_argument("--cache-dir", help="Directory for the parsed graph and migration diff cache")
+    parser.add_argument("--json", action="store_true", help="Print paths, counts and timings as JSON")
+    add_target_arguments(parser)
+    args = parser.parse_args()
+    targets = parse_targets(parser, args)
+    options = target_options(args)
+
+    timings = {}
+    started = time.perf_counter()
+    try:
+        ontology = load_ontology(args.owl_file, args.cache_dir)
+        previous = load_ontology(args.previous, args.cache_dir) if args.previous else None
+        timings["load"] = time.perf_counter() - started
+
+        step = time.perf_counter()
+        if previous:
+            # Memoized on the ontology, so generate_targets reuses it
+            ontology.migration_rules(previous)
+        timings["diff"] = time.perf_counter() - step
+
+        step = time.perf_counter()
+        results = generate_targets(
+            ontology, args.output, targets,
+            previous=previous,
+            version=args.version,
+            folder_prefix=args.prefix,
+            options=options,
+            max_workers=args.jobs,
+            subtrees=args.subtree
+        )
+        timings["generate"] = time.perf_counter() - step
+    except Exception as e:
+        if args.json:
+            print(json.dumps({"ok": False, "error": str(e)}, indent=2))
+        else:
+            print(f"Error: {str(e)}")
+        sys.exit(1)
+    timings["total"] = time.perf_counter() - started
+
+    ok = all(result.ok for result in results.values())
+    if args.json:
+        print(json.dumps({
+            "ok": ok,
+            "ontology": ontology_summary(ontology),
+            "previous": ontology_summary(previous) if previous else None,
+            "targets": {target: result.as_dict() for target, result in results.items()},
+            "seconds": timings
+        }, indent=2))
+    else:
+        for target, result in results.items():
+            if result.ok:
+                print(f"{target}: {result.output_dir} ({result.seconds:.2f}s)")
+            else:
+                print(f"{target}: failed: {result.error}")
+        print(f"Total: {timings['total']:.2f}s (load {timings['load']:.2f}s, generate {timings['generate']:.2f}s)")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
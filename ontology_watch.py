@@ -0,0 +1,283 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+import compileall
+import logging
+import os
+import shutil
+import threading
+import time
+from ontology_cache import forget_ontology, load_ontology, remember_ontology
+from ontology_targets import TARGETS, TargetResult, generate_targets
+
+if TYPE_CHECKING:
+    from converter import OntologyConverter
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 0.25
+DEBOUNCE_SECONDS = 0.3
+SOURCE_SUFFIXES = (".xml", ".yaml", ".yml", ".json")
+STAGING_DIR = ".staging"
+
+Stamp = Optional[Tuple[int, int]]
+
+
+class WatchUpdate:
+    """One regeneration of an OWL file and the changes that triggered it"""
+
+    def __init__(self, owl_file: Path, changed: List[Path], seconds: float,
+                 results: Optional[Dict[str, TargetResult]] = None, written: int = 0,
+                 unchanged: int = 0, removed: int = 0, error: Optional[Exception] = None):
+        self.owl_file = owl_file
+        self.changed = changed
+        self.seconds = seconds
+        self.results = results or {}
+        self.written = written
+        self.unchanged = unchanged
+        self.removed = removed
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and all(result.ok for result in self.results.values())
+
+
+class OntologyWatcher:
+    """Polls source and OWL files and regenerates the ontologies a change affects
+
+    A changed source is converted incrementally and its graph is kept in memory for generation,
+    so the OWL it writes is not parsed back. Every selected target is regenerated for the affected
+    ontology, but files are written only when their content differs, which keeps downstream
+    builds incremental.
+    """
+
+    def __init__(self, files: Iterable[Union[str, Path]], base_output_dir: Union[str, Path],
+                 targets: Iterable[str] = TARGETS, previous: Optional[Union[str, Path]] = None,
+                 version: str = "1.0.0", folder_prefix: Optional[str] = None,
+                 options: Optional[Dict] = None, subtrees: Optional[List[str]] = None,
+                 max_workers: Optional[int] = None, debounce: float = DEBOUNCE_SECONDS):
+        self.sources: Dict[Path, Path] = {}
+        self.owl_files: List[Path] = []
+        for file in files:
+            path = Path(file).resolve()
+            owl_file = path
+            if path.suffix.lower() in SOURCE_SUFFIXES:
+                owl_file = path.with_suffix(".owl")
+                self.sources[path] = owl_file
+            if owl_file not in self.owl_files:
+                self.owl_files.append(owl_file)
+
+        self.base_output_dir = Path(base_output_dir).resolve()
+        self.targets = list(targets)
+        self.previous = Path(previous).resolve() if previous else None
+        self.version = version
+        self.folder_prefix = folder_prefix
+        self.options = options or {}
+        self.subtrees = subtrees
+        self.max_workers = max_workers
+        self.debounce = debounce
+        self.stamps: Dict[Path, Stamp] = {}
+        self.pending: Dict[Path, float] = {}
+        # One converter per source keeps its graph, so an edit only re-converts the classes it touched
+        self.converters: Dict[Path, "OntologyConverter"] = {}
+        # Files written per OWL file, so outputs that are no longer generated can be removed
+        self.outputs: Dict[Path, Set[Path]] = {}
+
+    def watched(self) -> List[Path]:
+        derived = set(self.sources.values())
+        paths = list(self.sources) + [path for path in self.owl_files if path not in derived]
+        if self.previous:
+            paths.append(self.previous)
+        return paths
+
+    def poll(self, now: Optional[float] = None) -> List[WatchUpdate]:
+        """Record changes and rebuild files that have been quiet for the debounce period"""
+        now = time.monotonic() if now is None else now
+        for path in self.watched():
+            stamp = _stamp(path)
+            if path not in self.stamps or stamp != self.stamps[path]:
+                self.stamps[path] = stamp
+                self.pending[path] = now
+
+        ready = [path for path, changed in self.pending.items() if now - changed >= self.debounce]
+        for path in ready:
+            del self.pending[path]
+        return self.rebuild(ready) if ready else []
+
+    def rebuild(self, changed: List[Path]) -> List[WatchUpdate]:
+        updates = []
+        affected: Dict[Path, List[Path]] = {}
+        for path in changed:
+            if self.stamps.get(path) is None:
+                # Editors often replace files on save; the next stamp brings it back
+                logger.warning(f"{path} is missing, skipped")
+                continue
+
+            if path in self.sources:
+                owl_file = self.sources[path]
+                started = time.perf_counter()
+                try:
+                    changed_classes = self.convert(path, owl_file)
+                except Exception as e:
+                    logger.error(f"Converting {path.name} failed: {str(e)}")
+                    updates.append(WatchUpdate(owl_file, [path], time.perf_counter() - started, error=e))
+                    continue
+                if not changed_classes and owl_file in self.outputs:
+                    # A save without edits, or one that only touched formatting
+                    logger.info(f"{path.name}: no class changed, outputs are up to date")
+                    continue
+                affected.setdefault(owl_file, []).append(path)
+            elif path == self.previous:
+                forget_ontology(path)
+                for owl_file in self.owl_files:
+                    affected.setdefault(owl_file, []).append(path)
+            else:
+                forget_ontology(path)
+                affected.setdefault(path, []).append(path)
+
+        for owl_file, paths in affected.items():
+            updates.append(self.regenerate(owl_file, paths))
+        return updates
+
+    def convert(self, source: Path, owl_file: Path) -> bool:
+        """Apply a source change to its OWL file; False when no class was added, changed or removed"""
+        from converter import OntologyConverter
+
+        converter = self.converters.setdefault(source, OntologyConverter())
+        changes = converter.update(str(source), str(owl_file), self.version)
+        logger.info(f"{source.name}: {len(changes['added'])} classes added, {len(changes['changed'])} changed, "
+                    f"{len(changes['removed'])} removed")
+        remember_ontology(owl_file, converter.graph, "converted")
+        return any(changes.values())
+
+    def regenerate(self, owl_file: Path, changed: List[Path]) -> WatchUpdate:
+        started = time.perf_counter()
+        staging = self.base_output_dir / STAGING_DIR
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            ontology = load_ontology(owl_file)
+            previous = load_ontology(self.previous) if self.previous else None
+            results = generate_targets(
+                ontology, staging, self.targets,
+                previous=previous,
+                folder_prefix=self.folder_prefix,
+                options=self.options,
+                max_workers=self.max_workers,
+                subtrees=self.subtrees
+            )
+            written, unchanged, produced = _sync_tree(staging, self.base_output_dir)
+        except Exception as e:
+            logger.error(f"Regenerating {owl_file.name} failed: {str(e)}")
+            return WatchUpdate(owl_file, changed, time.perf_counter() - started, error=e)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        for result in results.values():
+            if result.output_dir:
+                result.output_dir = str(self.base_output_dir / Path(result.output_dir).relative_to(staging))
+        python = results.get("python")
+        if python is not None and python.ok and self.options.get("python", {}).get("sharded"):
+            # Staged bytecode records the staging paths, so compile in place; unchanged modules are skipped
+            compileall.compile_dir(python.output_dir, quiet=1)
+
+        removed = 0
+        # A failed target produced nothing this time; its previous files stay until it succeeds
+        if all(result.ok for result in results.values()):
+            for stale in self.outputs.get(owl_file, set()) - produced:
+                if stale.exists():
+                    stale.unlink()
+                    removed += 1
+            self.outputs[owl_file] = produced
+        else:
+            self.outputs[owl_file] = self.outputs.get(owl_file, set()) | produced
+
+        update = WatchUpdate(owl_file, changed, time.perf_counter() - started, results, written, unchanged, removed)
+        failed = [target for target, result in results.items() if not result.ok]
+        logger.info(
+            f"{owl_file.name} regenerated in {update.seconds:.2f}s: {written} written, {unchanged} unchanged, "
+            f"{removed} removed" + (f"; failed: {', '.join(failed)}" if failed else "")
+        )
+        return update
+
+    def run(self, interval: float = POLL_INTERVAL_SECONDS, stop: Optional[threading.Event] = None,
+            on_update: Optional[Callable[[WatchUpdate], None]] = None):
+        stop = stop or threading.Event()
+        logger.info(f"Watching {', '.join(path.name for path in self.watched())}")
+        while not stop.is_set():
+            for update in self.poll():
+                if on_update is not None:
+                    on_update(update)
+            stop.wait(interval)
+
+
+def _stamp(path: Path) -> Stamp:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _sync_tree(staging: Path, output_dir: Path) -> Tuple[int, int, Set[Path]]:
+    """Move staged files into output_dir, leaving files with identical content untouched"""
+    written = 0
+    unchanged = 0
+    produced = set()
+    if not staging.exists():
+        return written, unchanged, produced
+
+    for source in staging.rglob("*"):
+        relative = source.relative_to(staging)
+        # Bytecode compiled in staging records the staging path; regenerate() compiles in place
+        if source.is_dir() or "__pycache__" in relative.parts:
+            continue
+        target = output_dir / relative
+        produced.add(target)
+        if (target.is_file() and target.stat().st_size == source.stat().st_size
+                and target.read_bytes() == source.read_bytes()):
+            unchanged += 1
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, target)
+        written += 1
+    return written, unchanged, produced
+
+
+def main():
+    import argparse
+    import sys
+    from ontology_targets import add_target_arguments, parse_targets, target_options
+
+    parser = argparse.ArgumentParser(description="Watch source and OWL files and regenerate code when they change")
+    parser.add_argument("files", nargs="+", help="Source (XML/YAML/JSON) or OWL files to watch")
+    parser.add_argument("--version", default="1.0.0", help="Version written into OWL files converted from sources")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL_SECONDS, help="Polling interval in seconds")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS,
+                        help="Seconds a file must stay unchanged before it is rebuilt")
+    parser.add_argument("--once", action="store_true", help="Build everything once and exit")
+    add_target_arguments(parser)
+    args = parser.parse_args()
+
+    watcher = OntologyWatcher(
+        args.files, args.output, parse_targets(parser, args),
+        previous=args.previous,
+        version=args.version,
+        folder_prefix=args.prefix,
+        options=target_options(args),
+        subtrees=args.subtree,
+        max_workers=args.jobs,
+        debounce=0 if args.once else args.debounce
+    )
+    if args.once:
+        updates = watcher.poll()
+        sys.exit(0 if all(update.ok for update in updates) else 1)
+
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
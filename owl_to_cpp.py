@@ -1,12 +1,12 @@
-from rdflib import Graph, RDF, RDFS, OWL, XSD, URIRef
+from rdflib import Graph, XSD, URIRef
 from jinja2 import Template
 from pathlib import Path
 import logging
-from typing import Dict, List, Optional, Union
-from owl_to_python import OntologyVersionManager
+from typing import Any, Dict, List, Optional, Union
+import json
+from ontology_core import ClassHierarchy, OntologyGraphIndex, OntologyIndividuals, OntologyVersionManager, ProgressCallback
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 
 class OwlToCppConverter:
@@ -19,33 +19,56 @@ class OwlToCppConverter:
         self.previous_version = None
         self.migration_rules = {}
         self.output_dir: Optional[Path] = None
+        self.hierarchy: Optional[ClassHierarchy] = None
+        self.progress: Optional[ProgressCallback] = None
 
     def convert(self, owl_file: str, base_output_dir: str = "generated",
                 version: Optional[str] = None, previous_version: Optional[str] = None,
-                folder_prefix: Optional[str] = None) -> str:
+                folder_prefix: Optional[str] = None, graph: Optional[Graph] = None,
+                previous_graph: Optional[Graph] = None, migration_rules: Optional[Dict] = None,
+                progress: Optional[ProgressCallback] = None, subtrees: Optional[List[str]] = None) -> str:
         owl_path = Path(owl_file)
         self._validate_input(owl_path)
+        self.progress = progress
 
-        g = Graph()
-        g.parse(owl_path)
+        if graph is None:
+            self._report("parse")
+            graph = Graph()
+            graph.parse(owl_path)
+        g = graph
 
         self.current_version = version or OntologyVersionManager.load_version(g)
 
-        if previous_version:
-            self._load_previous_version(previous_version, g)
+        if previous_version or previous_graph is not None:
+            self._load_previous_version(previous_version, g, previous_graph, migration_rules)
 
         self.output_dir = self._create_output_dir(owl_path.stem, base_output_dir, folder_prefix)
 
+        self._report("extract")
         self._extract_namespaces(g)
-        self._build_class_hierarchy(g)
-        self.classes_info = self._extract_classes(g)
-        self.properties_info = self._extract_properties(g)
+        index = OntologyGraphIndex(g)
+        self._build_class_hierarchy(index)
+        self.classes_info = self._extract_classes(index)
+        self.properties_info = self._extract_properties(index)
+        self.hierarchy = ClassHierarchy(self.classes_info, self.properties_info)
+        if subtrees:
+            self.hierarchy = self.hierarchy.subset(subtrees)
+            self.properties_info = [prop for prop in self.properties_info if prop["domain"] in self.hierarchy.index]
+        self.classes_info = self.hierarchy.classes
 
         self._generate_cpp_classes(self.output_dir)
+        self._generate_changelog(self.output_dir.parent)
+        self._generate_migration_adapter(self.output_dir)
+        self._report("individuals")
+        self._generate_individuals(self.output_dir, g)
 
         logger.info(f"C++ code generated in: {self.output_dir}")
         return str(self.output_dir.parent)
 
+    def _report(self, stage: str, done: int = 0, total: int = 0):
+        if self.progress is not None:
+            self.progress(stage, done, total)
+
     def _validate_input(self, owl_path: Path):
         if not owl_path.exists():
             raise FileNotFoundError(f"OWL file not found: {owl_path}")
@@ -59,64 +82,61 @@ class OwlToCppConverter:
         output_dir.mkdir(parents=True, exist_ok=True)
         return output_dir
 
-    def _load_previous_version(self, previous_version: str, current_g: Graph):
-        prev_path = Path(previous_version)
-        if not prev_path.exists():
-            logger.warning(f"Previous version not found: {previous_version}")
-            return
-        prev_g = Graph()
-        prev_g.parse(prev_path)
+    def _load_previous_version(self, previous_version: Optional[str], current_g: Graph,
+                               prev_g: Optional[Graph] = None, migration_rules: Optional[Dict] = None):
+        if prev_g is None:
+            prev_path = Path(previous_version)
+            if not prev_path.exists():
+                logger.warning(f"Previous version not found: {previous_version}")
+                return
+            prev_g = Graph()
+            prev_g.parse(prev_path)
         self.previous_version = OntologyVersionManager.load_version(prev_g)
-        self.migration_rules = OntologyVersionManager.generate_migration_rules(prev_g, current_g)
+        self.migration_rules = migration_rules if migration_rules is not None else \
+            OntologyVersionManager.generate_migration_rules(prev_g, current_g)
 
     def _extract_namespaces(self, g: Graph):
         self.ns = {prefix: uri for prefix, uri in g.namespaces()}
 
-    def _build_class_hierarchy(self, g: Graph):
-        for cls in g.subjects(RDF.type, OWL.Class):
-            self.class_hierarchy[str(cls)] = []
-
-        for subclass, _, superclass in g.triples((None, RDFS.subClassOf, None)):
-            if str(subclass) in self.class_hierarchy:
-                self.class_hierarchy[str(subclass)].append(str(superclass))
+    def _build_class_hierarchy(self, index: OntologyGraphIndex):
+        for cls in index.classes:
+            self.class_hierarchy[str(cls)] = [str(parent) for parent in index.parents.get(cls, [])]
 
-    def _extract_classes(self, g: Graph) -> List[Dict]:
+    def _extract_classes(self, index: OntologyGraphIndex) -> List[Dict]:
         classes = []
-        for class_uri in g.subjects(RDF.type, OWL.Class):
+        for class_uri in index.classes:
             classes.append({
                 "name": self._uri_to_name(class_uri),
                 "uri": str(class_uri),
                 "parent_classes": [self._uri_to_name(uri) for uri in self.class_hierarchy.get(str(class_uri), [])],
-                "comment": self._get_comment(g, class_uri)
+                "comment": self._get_comment(index, class_uri)
             })
         return classes
 
-    def _extract_properties(self, g: Graph) -> List[Dict]:
+    def _extract_properties(self, index: OntologyGraphIndex) -> List[Dict]:
         props = []
-        for prop in g.subjects(RDF.type, OWL.ObjectProperty):
-            props.append(self._process_property(g, prop, "ObjectProperty"))
-        for prop in g.subjects(RDF.type, OWL.DatatypeProperty):
-            props.append(self._process_property(g, prop, "DatatypeProperty"))
+        for prop in index.object_properties:
+            props.append(self._process_property(index, prop, "ObjectProperty"))
+        for prop in index.datatype_properties:
+            props.append(self._process_property(index, prop, "DatatypeProperty"))
         return props
 
-    def _process_property(self, g: Graph, prop: URIRef, prop_type: str) -> Dict:
-        name = self._uri_to_name(prop)
-        domain = self._get_domain(g, prop)
-        range_ = self._get_range(g, prop, prop_type)
+    def _process_property(self, index: OntologyGraphIndex, prop: URIRef, prop_type: str) -> Dict:
+        domain = index.domains.get(prop)
+        range_ = self._get_range(index.ranges.get(prop), prop_type)
         return {
-            "name": name,
+            "name": self._uri_to_name(prop),
             "type": prop_type,
-            "domain": domain,
+            "domain": self._uri_to_name(domain) if domain else None,
             "range": range_,
-            "comment": self._get_comment(g, prop)
+            # Related objects are held by pointer: classes may refer to each other, and a
+            # linked object must stay the one the caller or OntologyData owns
+            "member_type": f"{range_}*" if prop_type == "ObjectProperty" and range_ != "void*" else range_,
+            "comment": self._get_comment(index, prop),
+            "max_cardinality": index.max_cardinality.get(prop)
         }
 
-    def _get_domain(self, g: Graph, prop: URIRef) -> Optional[str]:
-        domain = g.value(prop, RDFS.domain)
-        return self._uri_to_name(domain) if domain else None
-
-    def _get_range(self, g: Graph, prop: URIRef, prop_type: str) -> str:
-        range_ = g.value(prop, RDFS.range)
+    def _get_range(self, range_: Optional[URIRef], prop_type: str) -> str:
         if prop_type == "DatatypeProperty":
             if str(range_) == str(XSD.string):
                 return "std::string"
@@ -134,35 +154,106 @@ class OwlToCppConverter:
         uri = str(uri)
         return uri.split("#")[-1] if "#" in uri else uri.split("/")[-1]
 
-    def _get_comment(self, g: Graph, uri: URIRef) -> Optional[str]:
-        comment = g.value(uri, RDFS.comment)
+    def _get_comment(self, index: OntologyGraphIndex, uri: URIRef) -> Optional[str]:
+        comment = index.comments.get(uri)
         return str(comment) if comment else None
 
-    from jinja2 import Template
-
     def _generate_cpp_classes(self, output_dir: Path):
         template = Template('''#include <string>
     #include <iostream>
+    #include <cstddef>
+    {% if class_properties|selectattr('max_cardinality')|list %}
+    #include <array>
+    #include <stdexcept>
+
+    #ifndef ONTOLOGY_FIELD_SPAN
+    #define ONTOLOGY_FIELD_SPAN
+    // The filled part of a bounded field, as passed to for_each_field visitors
+    template <typename T>
+    struct FieldSpan {
+        T* data;
+        std::size_t size;
+        T* begin() const { return data; }
+        T* end() const { return data + size; }
+    };
+    #endif
+    {% endif %}
+
+    {% for name in referenced %}
+    class {{ name }};
+    {% endfor %}
 
     {% if cls.comment %}// {{ cls.comment }}{% endif %}
-    class {{ cls.name }}{% if cls.parent_classes %} : public {{ cls.parent_classes[0] }}{% endif %} {
+    class {{ cls.name }}{% if base %} : public {{ base }}{% endif %} {
     public:
         {{ cls.name }}() {
-            {% for prop in class_properties %}
+            {% for prop in class_properties if not (prop.max_cardinality and prop.max_cardinality > 1) %}
             this->{{ prop.name }} = {% if prop.range == 'std::string' %}""{% elif prop.range in ['int', 'float'] %}0{% elif prop.range == 'bool' %}false{% else %}nullptr{% endif %};
             {% endfor %}
         }
 
         {% for prop in class_properties %}
         {% if prop.comment %}// {{ prop.comment }}{% endif %}
-        {{ prop.range }} get{{ prop.name|capitalize }}() const { return {{ prop.name }}; }
-        void set{{ prop.name|capitalize }}({{ prop.range }} value) { {{ prop.name }} = value; }
+        {% if prop.max_cardinality and prop.max_cardinality > 1 %}
+        static constexpr std::size_t {{ prop.name }}Capacity = {{ prop.max_cardinality }};
+        std::size_t get{{ prop.name|capitalize }}Count() const { return {{ prop.name }}Count; }
+        {{ prop.member_type }} const& get{{ prop.name|capitalize }}(std::size_t index) const {
+            if (index >= {{ prop.name }}Count) throw std::out_of_range("{{ prop.name }}");
+            return {{ prop.name }}[index];
+        }
+        void add{{ prop.name|capitalize }}({{ prop.member_type }} const& value) {
+            if ({{ prop.name }}Count == {{ prop.name }}Capacity) throw std::length_error("{{ prop.name }} accepts at most {{ prop.max_cardinality }} values");
+            {{ prop.name }}[{{ prop.name }}Count++] = value;
+        }
+        void clear{{ prop.name|capitalize }}() { {{ prop.name }}Count = 0; }
+        {% else %}
+        {{ prop.member_type }} get{{ prop.name|capitalize }}() const { return {{ prop.name }}; }
+        void set{{ prop.name|capitalize }}({{ prop.member_type }} value) { {{ prop.name }} = value; }
+        {% endif %}
         {% endfor %}
 
+        static constexpr std::size_t field_count = {{ class_properties|length }}{% if base %} + {{ base }}::field_count{% endif %};
+
+        template <typename Visitor>
+        void for_each_field(Visitor&& visitor) {
+            {% if base %}
+            {{ base }}::for_each_field(visitor);
+            {% endif %}
+            {% for prop in class_properties %}
+            {% if prop.max_cardinality and prop.max_cardinality > 1 %}
+            visitor("{{ prop.name }}", FieldSpan<{{ prop.member_type }}>{ {{ prop.name }}.data(), {{ prop.name }}Count });
+            {% else %}
+            visitor("{{ prop.name }}", {{ prop.name }});
+            {% endif %}
+            {% endfor %}
+        }
+
+        template <typename Visitor>
+        void for_each_field(Visitor&& visitor) const {
+            {% if base %}
+            {{ base }}::for_each_field(visitor);
+            {% endif %}
+            {% for prop in class_properties %}
+            {% if prop.max_cardinality and prop.max_cardinality > 1 %}
+            visitor("{{ prop.name }}", FieldSpan<{{ prop.member_type }} const>{ {{ prop.name }}.data(), {{ prop.name }}Count });
+            {% else %}
+            visitor("{{ prop.name }}", {{ prop.name }});
+            {% endif %}
+            {% endfor %}
+        }
+
         friend std::ostream& operator<<(std::ostream& os, const {{ cls.name }}& obj) {
             os << "{{ cls.name }} { ";
             {% for prop in class_properties %}
+            {% if prop.max_cardinality and prop.max_cardinality > 1 %}
+            os << "{{ prop.name }}: [";
+            for (std::size_t i = 0; i < obj.{{ prop.name }}Count; ++i) {
+                os << (i ? ", " : "") << obj.{{ prop.name }}[i];
+            }
+            os << "]"{% if not loop.last %} << ", "{% endif %};
+            {% else %}
             os << "{{ prop.name }}: " << obj.{{ prop.name }}{% if not loop.last %} << ", "{% endif %};
+            {% endif %}
             {% endfor %}
             os << " }";
             return os;
@@ -170,24 +261,35 @@ class OwlToCppConverter:
 
     private:
         {% for prop in class_properties %}
-        {{ prop.range }} {{ prop.name }};
+        {% if prop.max_cardinality and prop.max_cardinality > 1 %}
+        std::array<{{ prop.member_type }}, {{ prop.max_cardinality }}> {{ prop.name }}{};
+        std::size_t {{ prop.name }}Count = 0;
+        {% else %}
+        {{ prop.member_type }} {{ prop.name }};
+        {% endif %}
         {% endfor %}
     };
     ''')
 
-        for cls in self.classes_info:
-            class_props = [p for p in self.properties_info if p.get("domain") == cls["name"]]
+        for done, cls in enumerate(self.classes_info):
+            self._report("classes", done, len(self.classes_info))
+            parents = self.hierarchy.parents(cls["name"])
+            class_properties = self._class_properties(cls["name"])
             class_path = output_dir / f"{cls['name']}.cpp"
             class_path.write_text(
                 template.render(
                     cls=cls,
-                    class_properties=class_props
+                    base=parents[0] if parents else None,
+                    class_properties=class_properties,
+                    referenced=sorted({
+                        prop["range"] for prop in class_properties
+                        if prop["member_type"] == f"{prop['range']}*" and prop["range"] != cls["name"]
+                    })
                 ),
                 encoding='utf-8'
             )
 
-
-def _generate_changelog(self, output_dir: Path):
+    def _generate_changelog(self, output_dir: Path):
         if not self.migration_rules:
             return
 
@@ -214,11 +316,308 @@ def _generate_changelog(self, output_dir: Path):
 
         (output_dir / "CHANGES.md").write_text("\n".join(changelog), encoding="utf-8")
 
+    def _generate_migration_adapter(self, output_dir: Path):
+        if not self.migration_rules:
+            return
+
+        template = Template('''#pragma once
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <variant>
+#include <vector>
+
+// Migrates stored payloads from ontology version {{ previous_version }} to {{ version }}
+class OntologyAdapter {
+public:
+    using Value = std::variant<std::monostate, bool, long long, double, std::string>;
+    using Entity = std::unordered_map<std::string, Value>;
+    using Payload = std::unordered_map<std::string, Entity>;
+
+    static constexpr const char* CURRENT_VERSION = "{{ version }}";
+    static constexpr const char* PREVIOUS_VERSION = "{{ previous_version }}";
+
+    static Payload& migrate(Payload& data, const std::string& old_version) {
+        if (old_version == CURRENT_VERSION) {
+            return data;
+        }
+        for (auto& entry : data) {
+            migrate_entity(entry.second);
+        }
+        return data;
+    }
+
+    static std::vector<Payload>& migrate_batch(std::vector<Payload>& payloads, const std::string& old_version) {
+        for (auto& data : payloads) {
+            migrate(data, old_version);
+        }
+        return payloads;
+    }
+
+    static void migrate_entity(Entity& entity) {
+        {% for old, new in renames.items() %}
+        if (auto it = entity.find("{{ old }}"); it != entity.end()) {
+            Value value = std::move(it->second);
+            entity.erase(it);
+            entity["{{ new }}"] = std::move(value);
+        }
+        {% endfor %}
+        {% for name, value in defaults.items() %}
+        entity.try_emplace("{{ name }}", {{ value }});
+        {% endfor %}
+        {% for name, conversion in conversions.items() %}
+        if (auto it = entity.find("{{ name }}"); it != entity.end()) {
+            it->second = {{ conversion.function }}(it->second, {{ conversion.fallback }});
+        }
+        {% endfor %}
+    }
+
+private:
+    static Value to_double(const Value& value, Value fallback) {
+        if (auto v = std::get_if<long long>(&value)) return static_cast<double>(*v);
+        if (auto v = std::get_if<double>(&value)) return *v;
+        if (auto v = std::get_if<std::string>(&value)) {
+            try { return std::stod(*v); } catch (...) { return fallback; }
+        }
+        return fallback;
+    }
+
+    static Value to_int(const Value& value, Value fallback) {
+        if (auto v = std::get_if<long long>(&value)) return *v;
+        if (auto v = std::get_if<double>(&value)) return static_cast<long long>(*v);
+        if (auto v = std::get_if<std::string>(&value)) {
+            try { return std::stoll(*v); } catch (...) { return fallback; }
+        }
+        return fallback;
+    }
+};
+''')
+        (output_dir / "OntologyAdapter.hpp").write_text(template.render(
+            version=self.current_version,
+            previous_version=self.previous_version,
+            renames=self.migration_rules.get("field_renames", {}),
+            defaults={
+                name: self._cpp_literal(info["default"])
+                for name, info in self.migration_rules.get("added_fields", {}).items()
+            },
+            conversions=self._type_conversions()
+        ), encoding="utf-8")
+
+    def _generate_individuals(self, output_dir: Path, g: Graph, chunk_size: int = 1000):
+        if not OntologyIndividuals.has_individuals(g):
+            return
+
+        chunk_template = Template('''#include "OntologyData.hpp"
+
+void ontology_data_create_{{ index }}(OntologyData& data) {
+    {% for individual in individuals %}
+    {
+        auto& obj = data.{{ individual.field }}Instances.emplace_back();
+        {% for statement in individual.statements %}
+        obj.{{ statement }};
+        {% endfor %}
+        data.{{ individual.field }}Index.emplace({{ individual.id }}, &obj);
+    }
+    {% endfor %}
+}
+
+void ontology_data_link_{{ index }}(OntologyData& data) {
+    {% for individual in individuals if individual.links %}
+    {
+        auto* obj = data.{{ individual.field }}Index.at({{ individual.id }});
+        {% for link in individual.links %}
+        obj->{{ link.method }}(data.{{ link.field }}Index.at({{ link.target }}));
+        {% endfor %}
+    }
+    {% endfor %}
+}
+''', trim_blocks=True, lstrip_blocks=True)
+
+        classes = {cls["name"]: cls for cls in self.classes_info}
+        kinds = OntologyIndividuals.classify(g, set(classes))
+        chunk = []
+        chunks = 0
+
+        def flush():
+            (output_dir / f"OntologyDataChunk{chunks}.cpp").write_text(
+                chunk_template.render(index=chunks, individuals=chunk),
+                encoding='utf-8'
+            )
+
+        for name, class_name, values in OntologyIndividuals.iter_individuals(g, set(classes)):
+            chunk.append(self._cpp_individual(name, class_name, values, kinds))
+            if len(chunk) == chunk_size:
+                flush()
+                chunks += 1
+                chunk = []
+        if chunk:
+            flush()
+            chunks += 1
+
+        header = Template('''#pragma once
+#include <cstddef>
+#include <deque>
+#include <string>
+#include <unordered_map>
+
+{% for cls in classes %}
+#include "{{ cls.name }}.cpp"
+{% endfor %}
+
+// Named individuals of the ontology; deques keep element addresses stable for the indexes
+struct OntologyData {
+    static constexpr std::size_t individual_count = {{ count }};
+
+    {% for cls in classes %}
+    std::deque<{{ cls.name }}> {{ fields[cls.name] }}Instances;
+    std::unordered_map<std::string, {{ cls.name }}*> {{ fields[cls.name] }}Index;
+    {% endfor %}
+};
+
+OntologyData load_ontology_data();
+''', trim_blocks=True, lstrip_blocks=True)
+
+        loader = Template('''#include "OntologyData.hpp"
+
+{% for index in range(chunks) %}
+void ontology_data_create_{{ index }}(OntologyData& data);
+void ontology_data_link_{{ index }}(OntologyData& data);
+{% endfor %}
+
+OntologyData load_ontology_data() {
+    OntologyData data;
+    {% for cls in classes %}
+    data.{{ fields[cls.name] }}Index.reserve({{ counts.get(cls.name, 0) }});
+    {% endfor %}
+    {% for index in range(chunks) %}
+    ontology_data_create_{{ index }}(data);
+    {% endfor %}
+    {% for index in range(chunks) %}
+    ontology_data_link_{{ index }}(data);
+    {% endfor %}
+    return data;
+}
+''', trim_blocks=True, lstrip_blocks=True)
+
+        ordered = self._dependency_order(classes)
+        fields = {name: self._cpp_field_name(name) for name in classes}
+        counts = {}
+        for class_name in kinds.values():
+            counts[class_name] = counts.get(class_name, 0) + 1
+        (output_dir / "OntologyData.hpp").write_text(
+            header.render(classes=ordered, fields=fields, count=len(kinds)),
+            encoding='utf-8'
+        )
+        (output_dir / "OntologyData.cpp").write_text(
+            loader.render(classes=ordered, fields=fields, counts=counts, chunks=chunks),
+            encoding='utf-8'
+        )
+
+    def _cpp_individual(self, name: str, class_name: str, values: Dict[str, List[Any]],
+                        kinds: Dict[str, str]) -> Dict:
+        fields = {p["name"]: p for p in self._all_properties(class_name)}
+        statements = []
+        links = []
+        for prop_name, items in values.items():
+            prop = fields.get(prop_name)
+            if prop is None:
+                continue
+            bounded = prop.get("max_cardinality") and prop["max_cardinality"] > 1
+            method = f"{'add' if bounded else 'set'}{prop_name.capitalize()}"
+            if not bounded:
+                items = items[:1]
+            for item in items:
+                if prop["type"] == "ObjectProperty":
+                    if item in kinds:
+                        links.append({
+                            "method": method,
+                            "field": self._cpp_field_name(kinds[item]),
+                            "target": json.dumps(item)
+                        })
+                else:
+                    statements.append(f"{method}({self._cpp_value(prop['range'], item)})")
+        return {
+            "id": json.dumps(name),
+            "field": self._cpp_field_name(class_name),
+            "statements": statements,
+            "links": links
+        }
+
+    def _class_properties(self, class_name: str) -> List[Dict]:
+        # Only the first parent becomes a base class; fields of the others are declared here
+        parents = self.hierarchy.parents(class_name)
+        inherited = {p["name"] for p in self.hierarchy.all_properties[parents[0]]} if parents else set()
+        return [p for p in self.hierarchy.all_properties[class_name] if p["name"] not in inherited]
+
+    def _all_properties(self, class_name: str) -> List[Dict]:
+        return self.hierarchy.all_properties.get(class_name, [])
+
+    def _dependency_order(self, classes: Dict[str, Dict]) -> List[Dict]:
+        # Bases must be defined before the classes deriving from them; related classes are
+        # forward-declared, since objects are held by pointer
+        ordered = []
+        visited = set()
+
+        def visit(name: str):
+            if name in visited or name not in classes:
+                return
+            visited.add(name)
+            for parent in self.hierarchy.parents(name):
+                visit(parent)
+            ordered.append(classes[name])
+
+        for name in classes:
+            visit(name)
+        return ordered
+
+    def _cpp_field_name(self, class_name: str) -> str:
+        return class_name[:1].lower() + class_name[1:]
+
+    def _cpp_value(self, cpp_type: str, value: Any) -> str:
+        if cpp_type == "int":
+            return str(int(value))
+        if cpp_type == "float":
+            return f"{float(value)!r}f"
+        if cpp_type == "bool":
+            return "true" if value else "false"
+        return f"std::string({json.dumps(str(value))})"
+
+    def _type_conversions(self) -> Dict[str, Dict[str, str]]:
+        functions = {
+            ("int", "float"): "to_double",
+            ("str", "int"): "to_int",
+            ("float", "int"): "to_int"
+        }
+        conversions = {}
+        for field, change in self.migration_rules.get("type_changes", {}).items():
+            function = functions.get((change["old"], change["new"]))
+            if function:
+                fallback = self.migration_rules.get("added_fields", {}).get(field, {}).get("default")
+                conversions[field] = {"function": function, "fallback": self._cpp_literal(fallback)}
+        return conversions
+
+    def _cpp_literal(self, value: Any) -> str:
+        if value is None:
+            return "Value{}"
+        if isinstance(value, bool):
+            return "Value{true}" if value else "Value{false}"
+        if isinstance(value, int):
+            return f"Value{{{value}LL}}"
+        if isinstance(value, float):
+            return f"Value{{{value!r}}}"
+        return f"Value{{std::string({json.dumps(str(value))})}}"
+
 
 def generate_cpp_from_owl(owl_file: str,
                           base_output_dir: str = "generated",
                           version: Optional[str] = None,
                           previous_version: Optional[str] = None,
-                          folder_prefix: Optional[str] = None) -> str:
+                          folder_prefix: Optional[str] = None,
+                          graph: Optional[Graph] = None,
+                          previous_graph: Optional[Graph] = None,
+                          migration_rules: Optional[Dict] = None,
+                          progress: Optional[ProgressCallback] = None,
+                          subtrees: Optional[List[str]] = None) -> str:
     converter = OwlToCppConverter()
-    return converter.convert(owl_file, base_output_dir, version, previous_version, folder_prefix)
+    return converter.convert(owl_file, base_output_dir, version, previous_version, folder_prefix,
+                             graph, previous_graph, migration_rules, progress, subtrees)
@@ -1,16 +1,14 @@
-from rdflib import Graph, RDF, RDFS, OWL, XSD, URIRef, Literal
+from rdflib import Graph, XSD, URIRef
 from jinja2 import Template
 from pathlib import Path
 import logging
-import yaml
-from typing import Dict, List, Optional, Union, Any, Set
-import semver
+from typing import Dict, List, Optional, Union, Any
 import sys
 import json
-from owl_to_python import OntologyDiff, OntologyVersionManager
+from ontology_core import (ClassHierarchy, ConversionCancelled, OntologyGraphIndex, OntologyIndividuals,
+                           OntologyVersionManager, ProgressCallback)
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 
 class OwlToJavaConverter:
@@ -23,6 +21,10 @@ class OwlToJavaConverter:
         self.previous_version = None
         self.migration_rules = {}
         self.package_name = "generated"
+        self.equals_hash = False
+        self.immutable = False
+        self.hierarchy: Optional[ClassHierarchy] = None
+        self.progress: Optional[ProgressCallback] = None
 
     def _create_output_dir(self, ontology_name: str, base_dir: str, folder_prefix: Optional[str] = None) -> Path:
         version_suffix = f"v{self.current_version.replace('.', '_')}"
@@ -33,18 +35,29 @@ class OwlToJavaConverter:
 
     def convert(self, owl_file: str, base_output_dir: str = "generated",
                 package_name: str = "generated", version: str = None,
-                previous_version: str = None, folder_prefix: str = None) -> str:
+                previous_version: str = None, folder_prefix: str = None,
+                equals_hash: bool = False, immutable: bool = False,
+                subtrees: Optional[List[str]] = None,
+                graph: Optional[Graph] = None, previous_graph: Optional[Graph] = None,
+                migration_rules: Optional[Dict] = None,
+                progress: Optional[ProgressCallback] = None) -> str:
         try:
             owl_path = Path(owl_file)
             self._validate_input(owl_path)
+            self.progress = progress
             self.package_name = package_name
-
-            g = Graph()
-            self._parse_owl(g, owl_path)
+            self.equals_hash = equals_hash
+            self.immutable = immutable
+
+            if graph is None:
+                self._report("parse")
+                graph = Graph()
+                self._parse_owl(graph, owl_path)
+            g = graph
             self.current_version = version or OntologyVersionManager.load_version(g)
 
-            if previous_version:
-                self._load_previous_version(previous_version, g)
+            if previous_version or previous_graph is not None:
+                self._load_previous_version(previous_version, g, previous_graph, migration_rules)
 
             output_dir = self._create_output_dir(
                 ontology_name=owl_path.stem,
@@ -52,31 +65,52 @@ class OwlToJavaConverter:
                 folder_prefix=folder_prefix
             )
 
+            self._report("extract")
             self._extract_namespaces(g)
-            self._build_class_hierarchy(g)
-            self.classes_info = self._extract_classes(g)
-            self.properties_info = self._extract_properties(g)
+            index = OntologyGraphIndex(g)
+            self._build_class_hierarchy(index)
+            self.classes_info = self._extract_classes(index)
+            self.properties_info = self._extract_properties(index)
+            self.hierarchy = ClassHierarchy(self.classes_info, self.properties_info)
+            if subtrees:
+                self.hierarchy = self.hierarchy.subset(subtrees)
+                self.properties_info = [prop for prop in self.properties_info if prop["domain"] in self.hierarchy.index]
+            self.classes_info = self.hierarchy.classes
 
             self._generate_java_classes(output_dir)
+            self._generate_field_descriptor(output_dir)
             self._generate_pom_file(output_dir.parent.parent.parent)
             self._generate_changelog(output_dir.parent.parent.parent)
+            self._generate_migration_adapter(output_dir)
+            self._report("individuals")
+            self._generate_individuals(output_dir, g)
 
             logger.info(f"Successfully generated Java code in: {output_dir}")
             return str(output_dir.parent.parent.parent)
+        except ConversionCancelled:
+            logger.info("Conversion cancelled")
+            raise
         except Exception as e:
             logger.error(f"Conversion failed: {str(e)}")
             raise
 
-    def _load_previous_version(self, previous_version: str, current_g: Graph):
-        prev_owl = Path(previous_version)
-        if not prev_owl.exists():
-            logger.warning(f"Previous version not found: {previous_version}")
-            return
+    def _report(self, stage: str, done: int = 0, total: int = 0):
+        if self.progress is not None:
+            self.progress(stage, done, total)
 
-        prev_g = Graph()
-        prev_g.parse(prev_owl)
+    def _load_previous_version(self, previous_version: Optional[str], current_g: Graph,
+                               prev_g: Optional[Graph] = None, migration_rules: Optional[Dict] = None):
+        if prev_g is None:
+            prev_owl = Path(previous_version)
+            if not prev_owl.exists():
+                logger.warning(f"Previous version not found: {previous_version}")
+                return
+
+            prev_g = Graph()
+            prev_g.parse(prev_owl)
         self.previous_version = OntologyVersionManager.load_version(prev_g)
-        self.migration_rules = OntologyVersionManager.generate_migration_rules(prev_g, current_g)
+        self.migration_rules = migration_rules if migration_rules is not None else \
+            OntologyVersionManager.generate_migration_rules(prev_g, current_g)
 
     def _generate_changelog(self, output_dir: Path):
         if not self.migration_rules:
@@ -109,6 +143,240 @@ class OwlToJavaConverter:
 
         (output_dir / "CHANGES.md").write_text("\n".join(changelog), encoding='utf-8')
 
+    def _generate_migration_adapter(self, output_dir: Path):
+        if not self.migration_rules:
+            return
+
+        template = Template('''package {{ package_name }};
+
+import java.util.List;
+import java.util.Map;
+
+/** Migrates stored payloads from ontology version {{ previous_version }} to {{ version }}. */
+public final class OntologyAdapter {
+    public static final String CURRENT_VERSION = "{{ version }}";
+    public static final String PREVIOUS_VERSION = "{{ previous_version }}";
+
+    private OntologyAdapter() {
+    }
+
+    public static Map<String, Map<String, Object>> migrate(Map<String, Map<String, Object>> data, String oldVersion) {
+        if (CURRENT_VERSION.equals(oldVersion)) {
+            return data;
+        }
+        for (Map<String, Object> entity : data.values()) {
+            migrateEntity(entity);
+        }
+        return data;
+    }
+
+    public static List<Map<String, Map<String, Object>>> migrateBatch(List<Map<String, Map<String, Object>>> payloads, String oldVersion) {
+        for (Map<String, Map<String, Object>> data : payloads) {
+            migrate(data, oldVersion);
+        }
+        return payloads;
+    }
+
+    public static void migrateEntity(Map<String, Object> entity) {
+        {% for old, new in renames.items() %}
+        if (entity.containsKey("{{ old }}")) {
+            entity.put("{{ new }}", entity.remove("{{ old }}"));
+        }
+        {% endfor %}
+        {% for name, value in defaults.items() %}
+        if (!entity.containsKey("{{ name }}")) {
+            entity.put("{{ name }}", {{ value }});
+        }
+        {% endfor %}
+        {% for name, conversion in conversions.items() %}
+        if (entity.containsKey("{{ name }}")) {
+            try {
+                entity.put("{{ name }}", {{ conversion.function }}(entity.get("{{ name }}")));
+            } catch (RuntimeException e) {
+                entity.put("{{ name }}", {{ conversion.fallback }});
+            }
+        }
+        {% endfor %}
+    }
+
+    private static Object toDouble(Object value) {
+        if (value instanceof Number) {
+            return ((Number) value).doubleValue();
+        }
+        return Double.parseDouble(String.valueOf(value).trim());
+    }
+
+    private static Object toInt(Object value) {
+        if (value instanceof Number) {
+            return ((Number) value).intValue();
+        }
+        return Integer.parseInt(String.valueOf(value).trim());
+    }
+}
+''')
+        (output_dir / "OntologyAdapter.java").write_text(template.render(
+            package_name=self.package_name,
+            version=self.current_version,
+            previous_version=self.previous_version,
+            renames=self.migration_rules.get('field_renames', {}),
+            defaults={
+                name: self._java_literal(info['default'])
+                for name, info in self.migration_rules.get('added_fields', {}).items()
+            },
+            conversions=self._type_conversions()
+        ), encoding='utf-8')
+
+    def _type_conversions(self) -> Dict[str, Dict[str, str]]:
+        functions = {
+            ('int', 'float'): 'toDouble',
+            ('str', 'int'): 'toInt',
+            ('float', 'int'): 'toInt'
+        }
+        conversions = {}
+        for field, change in self.migration_rules.get('type_changes', {}).items():
+            function = functions.get((change['old'], change['new']))
+            if function:
+                fallback = self.migration_rules.get('added_fields', {}).get(field, {}).get('default')
+                conversions[field] = {"function": function, "fallback": self._java_literal(fallback)}
+        return conversions
+
+    def _java_literal(self, value: Any) -> str:
+        if value is None:
+            return "null"
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (int, float)):
+            return repr(value)
+        return json.dumps(str(value))
+
+    def _generate_individuals(self, output_dir: Path, g: Graph, chunk_size: int = 250):
+        if not OntologyIndividuals.has_individuals(g):
+            return
+        if self.immutable:
+            logger.warning("Skipping individuals: immutable classes cannot be linked after construction")
+            return
+
+        chunk_template = Template('''package {{ package_name }};
+
+import java.util.Map;
+
+final class OntologyDataChunk{{ index }} {
+    private OntologyDataChunk{{ index }}() {
+    }
+
+    static void create(Map<String, Object> objects) {
+        {% for individual in individuals %}
+        {
+            {{ individual.type }} obj = new {{ individual.type }}();
+            {% for statement in individual.statements %}
+            obj.{{ statement }};
+            {% endfor %}
+            objects.put({{ individual.id }}, obj);
+        }
+        {% endfor %}
+    }
+
+    static void link(Map<String, Object> objects) {
+        {% for individual in individuals if individual.links %}
+        {
+            {{ individual.type }} obj = ({{ individual.type }}) objects.get({{ individual.id }});
+            {% for link in individual.links %}
+            obj.{{ link.method }}(({{ link.range }}) objects.get({{ link.target }}));
+            {% endfor %}
+        }
+        {% endfor %}
+    }
+}
+''', trim_blocks=True, lstrip_blocks=True)
+
+        class_names = {cls["name"] for cls in self.classes_info}
+        fields = {
+            cls["name"]: {p["name"]: p for p in self._inherited_properties(cls) + self._class_properties(cls["name"])}
+            for cls in self.classes_info
+        }
+        chunk = []
+        chunks = 0
+        count = 0
+
+        def flush():
+            (output_dir / f"OntologyDataChunk{chunks}.java").write_text(chunk_template.render(
+                package_name=self.package_name,
+                index=chunks,
+                individuals=chunk
+            ), encoding='utf-8')
+
+        for name, class_name, values in OntologyIndividuals.iter_individuals(g, class_names):
+            chunk.append(self._java_individual(name, class_name, values, fields[class_name]))
+            count += 1
+            if len(chunk) == chunk_size:
+                flush()
+                chunks += 1
+                chunk = []
+        if chunk:
+            flush()
+            chunks += 1
+
+        template = Template('''package {{ package_name }};
+
+import java.util.HashMap;
+import java.util.Map;
+
+// Named individuals of the ontology, split into chunks to stay under the JVM method size limit
+public final class OntologyData {
+    public static final int INDIVIDUAL_COUNT = {{ count }};
+
+    private OntologyData() {
+    }
+
+    public static Map<String, Object> load() {
+        Map<String, Object> objects = new HashMap<>({{ (count * 4 // 3) + 1 }});
+        {% for index in range(chunks) %}
+        OntologyDataChunk{{ index }}.create(objects);
+        {% endfor %}
+        {% for index in range(chunks) %}
+        OntologyDataChunk{{ index }}.link(objects);
+        {% endfor %}
+        return objects;
+    }
+}
+''', trim_blocks=True, lstrip_blocks=True)
+        (output_dir / "OntologyData.java").write_text(template.render(
+            package_name=self.package_name,
+            count=count,
+            chunks=chunks
+        ), encoding='utf-8')
+
+    def _java_individual(self, name: str, class_name: str, values: Dict[str, List[Any]],
+                         fields: Dict[str, Dict]) -> Dict:
+        statements = []
+        links = []
+        for prop_name, items in values.items():
+            prop = fields.get(prop_name)
+            if prop is None:
+                continue
+            method = f"{'add' if prop['capacity'] else 'set'}{prop_name.capitalize()}"
+            if not prop["capacity"]:
+                items = items[:1]
+            for item in items:
+                if prop["type"] == "ObjectProperty":
+                    links.append({"method": method, "range": prop["range"], "target": json.dumps(item)})
+                else:
+                    statements.append(f"{method}({self._java_value(prop['range'], item)})")
+        return {"id": json.dumps(name), "type": class_name, "statements": statements, "links": links}
+
+    def _java_value(self, java_type: str, value: Any) -> str:
+        if java_type == "long":
+            return f"{int(value)}L"
+        if java_type == "int":
+            return str(int(value))
+        if java_type == "double":
+            return repr(float(value))
+        if java_type == "boolean":
+            return "true" if value else "false"
+        if java_type in ("java.time.LocalDate", "java.time.LocalDateTime"):
+            return f"{java_type}.parse({json.dumps(str(value))})"
+        return json.dumps(str(value))
+
     def _validate_input(self, owl_path: Path):
         if not owl_path.exists():
             raise FileNotFoundError(f"OWL file not found: {owl_path}")
@@ -125,17 +393,13 @@ class OwlToJavaConverter:
         for prefix, uri in g.namespaces():
             self.ns[prefix] = uri
 
-    def _build_class_hierarchy(self, g: Graph):
-        for cls in g.subjects(RDF.type, OWL.Class):
-            self.class_hierarchy[str(cls)] = []
-
-        for sub_class, _, super_class in g.triples((None, RDFS.subClassOf, None)):
-            if str(sub_class) in self.class_hierarchy:
-                self.class_hierarchy[str(sub_class)].append(str(super_class))
+    def _build_class_hierarchy(self, index: OntologyGraphIndex):
+        for cls in index.classes:
+            self.class_hierarchy[str(cls)] = [str(parent) for parent in index.parents.get(cls, [])]
 
-    def _extract_classes(self, g: Graph) -> List[Dict]:
+    def _extract_classes(self, index: OntologyGraphIndex) -> List[Dict]:
         classes = []
-        for class_uri in g.subjects(RDF.type, OWL.Class):
+        for class_uri in index.classes:
             class_name = self._uri_to_name(class_uri)
             classes.append({
                 "name": class_name,
@@ -144,74 +408,321 @@ class OwlToJavaConverter:
                     self._uri_to_name(uri)
                     for uri in self.class_hierarchy.get(str(class_uri), [])
                 ],
-                "comment": self._get_class_comment(g, class_uri)
+                "comment": self._get_comment(index, class_uri)
             })
         return classes
 
-    def _extract_properties(self, g: Graph) -> List[Dict]:
+    def _extract_properties(self, index: OntologyGraphIndex) -> List[Dict]:
         properties = []
-        for prop in g.subjects(RDF.type, OWL.ObjectProperty):
-            properties.append(self._process_property(g, prop, "ObjectProperty"))
-        for prop in g.subjects(RDF.type, OWL.DatatypeProperty):
-            properties.append(self._process_property(g, prop, "DatatypeProperty"))
+        for prop in index.object_properties:
+            properties.append(self._process_property(index, prop, "ObjectProperty"))
+        for prop in index.datatype_properties:
+            properties.append(self._process_property(index, prop, "DatatypeProperty"))
         return properties
 
-    def _process_property(self, g: Graph, prop: URIRef, prop_type: str) -> Dict:
+    def _process_property(self, index: OntologyGraphIndex, prop: URIRef, prop_type: str) -> Dict:
         prop_name = self._uri_to_name(prop)
-        domain = self._get_property_domain(g, prop)
-        range_ = self._get_property_range(g, prop, prop_type)
+        domain = index.domains.get(prop)
+        range_ = self._get_property_range(index.ranges.get(prop), prop_type)
 
         return {
             "name": prop_name,
             "type": prop_type,
-            "domain": domain,
+            "domain": self._uri_to_name(domain) if domain else None,
             "range": range_,
-            "comment": self._get_property_comment(g, prop)
+            "comment": self._get_comment(index, prop),
+            "max_cardinality": index.max_cardinality.get(prop)
         }
 
     def _generate_java_classes(self, output_dir: Path):
-        for cls in self.classes_info:
-            template = Template('''package {{ package_name }};
+        template = Template('''package {{ package_name }};
+{% macro default(p) %}{% if p.capacity %}new {{ p.range }}[0]{% elif p.range == 'String' %}""{% elif p.range == 'int' %}0{% elif p.range == 'long' %}0L{% elif p.range == 'double' %}0.0{% elif p.range == 'boolean' %}false{% else %}null{% endif %}{% endmacro %}
+{% macro equals(p) %}{% if p.capacity and immutable %}java.util.Arrays.equals(this.{{ p.name }}, other.{{ p.name }}){% elif p.capacity %}java.util.Arrays.equals(this.{{ p.name }}, 0, this.{{ p.name }}Count, other.{{ p.name }}, 0, other.{{ p.name }}Count){% elif p.range in ('int', 'long', 'boolean') %}this.{{ p.name }} == other.{{ p.name }}{% elif p.range == 'double' %}Double.compare(this.{{ p.name }}, other.{{ p.name }}) == 0{% else %}java.util.Objects.equals(this.{{ p.name }}, other.{{ p.name }}){% endif %}{% endmacro %}
+{% macro hash(p) %}{% if p.capacity and immutable %}java.util.Arrays.hashCode({{ p.name }}){% elif p.capacity %}java.util.Arrays.hashCode(java.util.Arrays.copyOf({{ p.name }}, {{ p.name }}Count)){% elif p.range in boxed %}{{ boxed[p.range] }}.hashCode({{ p.name }}){% else %}java.util.Objects.hashCode({{ p.name }}){% endif %}{% endmacro %}
+{% macro value(p) %}{% if p.capacity %}java.util.Arrays.toString(get{{ p.name|capitalize }}()){% else %}{{ p.name }}{% endif %}{% endmacro %}
 
 {% if cls.comment %}/** {{ cls.comment }} */{% endif %}
-public class {{ cls.name }}{% if cls.parent_classes %} extends {{ cls.parent_classes[0] }}{% endif %} {
-    {% for prop in properties if prop.domain == cls.name %}
+public class {{ cls.name }}{% if parents %} extends {{ parents[0] }}{% endif %} {
+    {% for prop in own_properties %}
     {% if prop.comment %}/** {{ prop.comment }} */{% endif %}
-    private {{ prop.range }} {{ prop.name }};
+    {% if prop.capacity and not immutable %}
+    private final {{ prop.java_type }} {{ prop.name }} = new {{ prop.range }}[{{ prop.capacity }}];
+    private int {{ prop.name }}Count;
+    {% else %}
+    private {% if immutable %}final {% endif %}{{ prop.java_type }} {{ prop.name }};
+    {% endif %}
     {% endfor %}
+    {% if immutable and equals_hash %}
+    private transient int cachedHash;
+    {% endif %}
+
+    {% if immutable %}
+    {% if all_properties %}
+    public {{ cls.name }}() {
+        this({% for prop in all_properties %}{{ default(prop) }}{% if not loop.last %}, {% endif %}{% endfor %});
+    }
 
+    {% endif %}
+    public {{ cls.name }}({% for prop in all_properties %}{{ prop.java_type }} {{ prop.name }}{% if not loop.last %}, {% endif %}{% endfor %}) {
+        {% if inherited_properties %}
+        super({% for prop in inherited_properties %}{{ prop.name }}{% if not loop.last %}, {% endif %}{% endfor %});
+        {% endif %}
+        {% for prop in own_properties %}
+        {% if prop.capacity %}
+        if ({{ prop.name }}.length > {{ prop.capacity }}) {
+            throw new IllegalArgumentException("{{ prop.name }} accepts at most {{ prop.capacity }} values");
+        }
+        this.{{ prop.name }} = {{ prop.name }}.clone();
+        {% else %}
+        this.{{ prop.name }} = {{ prop.name }};
+        {% endif %}
+        {% endfor %}
+    }
+    {% else %}
     public {{ cls.name }}() {
-        {% for prop in properties if prop.domain == cls.name %}
-        this.{{ prop.name }} = {% if prop.range == 'String' %}""{% elif prop.range == 'int' %}0{% elif prop.range == 'double' %}0.0{% elif prop.range == 'boolean' %}false{% else %}null{% endif %};
+        {% for prop in own_properties if not prop.capacity %}
+        this.{{ prop.name }} = {{ default(prop) }};
         {% endfor %}
     }
+    {% endif %}
+
+    {% for prop in own_properties %}
+    {% if prop.capacity %}
+    public {{ prop.java_type }} get{{ prop.name|capitalize }}() {
+        return {% if immutable %}this.{{ prop.name }}.clone(){% else %}java.util.Arrays.copyOf(this.{{ prop.name }}, this.{{ prop.name }}Count){% endif %};
+    }
+
+    public {{ prop.range }} get{{ prop.name|capitalize }}(int index) {
+        {% if not immutable %}
+        java.util.Objects.checkIndex(index, this.{{ prop.name }}Count);
+        {% endif %}
+        return this.{{ prop.name }}[index];
+    }
+
+    public int get{{ prop.name|capitalize }}Count() {
+        return {% if immutable %}this.{{ prop.name }}.length{% else %}this.{{ prop.name }}Count{% endif %};
+    }
+    {% if not immutable %}
+
+    public void add{{ prop.name|capitalize }}({{ prop.range }} value) {
+        if (this.{{ prop.name }}Count == this.{{ prop.name }}.length) {
+            throw new IllegalStateException("{{ prop.name }} accepts at most {{ prop.capacity }} values");
+        }
+        this.{{ prop.name }}[this.{{ prop.name }}Count++] = value;
+    }
 
-    {% for prop in properties if prop.domain == cls.name %}
-    public {{ prop.range }} get{{ prop.name|capitalize }}() {
+    public void set{{ prop.name|capitalize }}({{ prop.java_type }} values) {
+        if (values.length > this.{{ prop.name }}.length) {
+            throw new IllegalArgumentException("{{ prop.name }} accepts at most {{ prop.capacity }} values");
+        }
+        System.arraycopy(values, 0, this.{{ prop.name }}, 0, values.length);
+        {% if prop.range not in boxed %}
+        java.util.Arrays.fill(this.{{ prop.name }}, values.length, this.{{ prop.name }}.length, null);
+        {% endif %}
+        this.{{ prop.name }}Count = values.length;
+    }
+    {% endif %}
+    {% else %}
+    public {{ prop.java_type }} get{{ prop.name|capitalize }}() {
         return this.{{ prop.name }};
     }
+    {% if not immutable %}
 
-    public void set{{ prop.name|capitalize }}({{ prop.range }} {{ prop.name }}) {
+    public void set{{ prop.name|capitalize }}({{ prop.java_type }} {{ prop.name }}) {
         this.{{ prop.name }} = {{ prop.name }};
     }
+    {% endif %}
+    {% endif %}
     {% endfor %}
 
+    public static final java.util.List<FieldDescriptor<{{ cls.name }}>> FIELDS = java.util.List.of(
+        {% for prop in own_properties %}
+        new FieldDescriptor<{{ cls.name }}>("{{ prop.name }}", {{ prop.java_type }}.class,
+            obj -> obj.get{{ prop.name|capitalize }}(),
+            {% if immutable %}null{% else %}(obj, value) -> obj.set{{ prop.name|capitalize }}(({{ boxed.get(prop.java_type, prop.java_type) }}) value){% endif %}){% if not loop.last %},{% endif %}
+        {% endfor %}
+    );
+
+    public void forEachField(java.util.function.BiConsumer<String, Object> visitor) {
+        {% if parents %}
+        super.forEachField(visitor);
+        {% endif %}
+        for (FieldDescriptor<{{ cls.name }}> field : FIELDS) {
+            visitor.accept(field.getName(), field.get(this));
+        }
+    }
+    {% if immutable %}
+
+    public static class Builder {
+        {% for prop in all_properties %}
+        private {{ prop.java_type }} {{ prop.name }} = {{ default(prop) }};
+        {% endfor %}
+
+        {% for prop in all_properties %}
+        public Builder {{ prop.name }}({{ prop.java_type }} {{ prop.name }}) {
+            this.{{ prop.name }} = {{ prop.name }};
+            return this;
+        }
+
+        {% endfor %}
+        public {{ cls.name }} build() {
+            return new {{ cls.name }}({% for prop in all_properties %}{{ prop.name }}{% if not loop.last %}, {% endif %}{% endfor %});
+        }
+    }
+    {% endif %}
+    {% if equals_hash %}
+
+    @Override
+    public boolean equals(Object o) {
+        if (this == o) {
+            return true;
+        }
+        if (o == null || getClass() != o.getClass()) {
+            return false;
+        }
+        {% if parents %}
+        if (!super.equals(o)) {
+            return false;
+        }
+        {% endif %}
+        {% if own_properties %}
+        {{ cls.name }} other = ({{ cls.name }}) o;
+        return {% for prop in own_properties %}{{ equals(prop) }}{% if not loop.last %}
+            && {% endif %}{% endfor %};
+        {% else %}
+        return true;
+        {% endif %}
+    }
+
+    @Override
+    public int hashCode() {
+        {% if immutable %}
+        int h = cachedHash;
+        if (h != 0) {
+            return h;
+        }
+        {% else %}
+        int h;
+        {% endif %}
+        h = {% if parents %}super.hashCode(){% else %}1{% endif %};
+        {% for prop in own_properties %}
+        h = 31 * h + {{ hash(prop) }};
+        {% endfor %}
+        {% if immutable %}
+        cachedHash = h;
+        {% endif %}
+        return h;
+    }
+    {% endif %}
+
     @Override
     public String toString() {
-        return "{{ cls.name }}{" +
-            {% for prop in properties if prop.domain == cls.name %}
-            "{{ prop.name }}=" + {{ prop.name }} + {% if not loop.last %}", " + {% else %}""{% endif %}{% endfor %} +
-            '}';
+        StringBuilder sb = new StringBuilder({{ to_string_capacity }});
+        sb.append("{{ cls.name }}{");
+        {% for prop in own_properties %}
+        sb.append("{% if not loop.first %}, {% endif %}{{ prop.name }}=").append({{ value(prop) }});
+        {% endfor %}
+        return sb.append('}').toString();
     }
 }
 ''')
+        for done, cls in enumerate(self.classes_info):
+            self._report("classes", done, len(self.classes_info))
+            own_properties = self._class_properties(cls["name"])
+            inherited_properties = self._inherited_properties(cls)
             class_file = output_dir / f"{cls['name']}.java"
             class_file.write_text(template.render(
                 cls=cls,
-                properties=self.properties_info,
-                package_name=self.package_name
+                parents=self.hierarchy.parents(cls["name"]),
+                own_properties=own_properties,
+                inherited_properties=inherited_properties,
+                all_properties=inherited_properties + own_properties,
+                to_string_capacity=self._to_string_capacity(cls["name"], own_properties),
+                immutable=self.immutable,
+                equals_hash=self.equals_hash,
+                package_name=self.package_name,
+                boxed=self._boxed_types()
             ), encoding='utf-8')
 
+    def _class_properties(self, class_name: str) -> List[Dict]:
+        # Java has single inheritance: fields of secondary parents are declared on the subclass
+        parents = self.hierarchy.parents(class_name)
+        inherited = {prop["name"] for prop in self.hierarchy.all_properties[parents[0]]} if parents else set()
+        return [
+            self._java_field(prop) for prop in self.hierarchy.all_properties[class_name]
+            if prop["name"] not in inherited
+        ]
+
+    def _java_field(self, prop: Dict) -> Dict:
+        capacity = prop.get("max_cardinality")
+        if capacity and capacity > 1:
+            return dict(prop, capacity=capacity, java_type=f"{prop['range']}[]")
+        return dict(prop, capacity=None, java_type=prop["range"])
+
+    def _inherited_properties(self, cls: Dict) -> List[Dict]:
+        parents = self.hierarchy.parents(cls["name"])
+        return [self._java_field(prop) for prop in self.hierarchy.all_properties[parents[0]]] if parents else []
+
+    def _to_string_capacity(self, class_name: str, properties: List[Dict]) -> int:
+        # Class name and braces, then "name=" plus an average value width per field
+        return len(class_name) + 2 + sum(len(prop["name"]) + 3 + 16 for prop in properties)
+
+    def _generate_field_descriptor(self, output_dir: Path):
+        template = Template('''package {{ package_name }};
+
+import java.util.function.BiConsumer;
+import java.util.function.Function;
+
+/** Static description of a generated field with direct accessors, used instead of reflection. */
+public final class FieldDescriptor<T> {
+    private final String name;
+    private final Class<?> type;
+    private final Function<T, Object> getter;
+    private final BiConsumer<T, Object> setter;
+
+    public FieldDescriptor(String name, Class<?> type, Function<T, Object> getter, BiConsumer<T, Object> setter) {
+        this.name = name;
+        this.type = type;
+        this.getter = getter;
+        this.setter = setter;
+    }
+
+    public String getName() {
+        return name;
+    }
+
+    public Class<?> getType() {
+        return type;
+    }
+
+    public Object get(T target) {
+        return getter.apply(target);
+    }
+
+    public boolean isWritable() {
+        return setter != null;
+    }
+
+    public void set(T target, Object value) {
+        if (setter == null) {
+            throw new UnsupportedOperationException("Field " + name + " is read-only");
+        }
+        setter.accept(target, value);
+    }
+}
+''')
+        (output_dir / "FieldDescriptor.java").write_text(template.render(
+            package_name=self.package_name
+        ), encoding='utf-8')
+
+    def _boxed_types(self) -> Dict[str, str]:
+        return {
+            "int": "Integer",
+            "long": "Long",
+            "double": "Double",
+            "boolean": "Boolean"
+        }
+
     def _generate_pom_file(self, output_dir: Path):
         template = Template('''<project xmlns="http://maven.apache.org/POM/4.0.0"
          xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
@@ -240,26 +751,19 @@ public class {{ cls.name }}{% if cls.parent_classes %} extends {{ cls.parent_cla
         uri_str = str(uri)
         return uri_str.split('#')[-1] if '#' in uri_str else uri_str.split('/')[-1]
 
-    def _get_class_comment(self, g: Graph, class_uri: URIRef) -> Optional[str]:
-        comment = g.value(class_uri, RDFS.comment)
-        return str(comment) if comment else None
-
-    def _get_property_comment(self, g: Graph, prop: URIRef) -> Optional[str]:
-        comment = g.value(prop, RDFS.comment)
+    def _get_comment(self, index: OntologyGraphIndex, uri: URIRef) -> Optional[str]:
+        comment = index.comments.get(uri)
         return str(comment) if comment else None
 
-    def _get_property_domain(self, g: Graph, prop: URIRef) -> Optional[str]:
-        domain = g.value(prop, RDFS.domain)
-        return self._uri_to_name(domain) if domain else None
-
-    def _get_property_range(self, g: Graph, prop: URIRef, prop_type: str) -> str:
+    def _get_property_range(self, range_: Optional[URIRef], prop_type: str) -> str:
         if prop_type == "DatatypeProperty":
-            range_ = g.value(prop, RDFS.range)
             if str(range_) == str(XSD.string):
                 return "String"
-            elif str(range_) == str(XSD.integer):
+            elif str(range_) in (str(XSD.integer), str(XSD.int)):
                 return "int"
-            elif str(range_) == str(XSD.float):
+            elif str(range_) == str(XSD.long):
+                return "long"
+            elif str(range_) in (str(XSD.float), str(XSD.double)):
                 return "double"
             elif str(range_) == str(XSD.date):
                 return "java.time.LocalDate"
@@ -269,13 +773,16 @@ public class {{ cls.name }}{% if cls.parent_classes %} extends {{ cls.parent_cla
                 return "boolean"
             return "String"
         else:
-            range_ = g.value(prop, RDFS.range)
             return self._uri_to_name(range_) if range_ else "Object"
 
-
 def generate_java_classes(owl_file: str, base_output_dir: str = "generated",
                           package_name: str = "generated", version: str = None,
-                          previous_version: str = None, folder_prefix: str = None) -> str:
+                          previous_version: str = None, folder_prefix: str = None,
+                          equals_hash: bool = False, immutable: bool = False,
+                          subtrees: Optional[List[str]] = None,
+                          graph: Optional[Graph] = None, previous_graph: Optional[Graph] = None,
+                          migration_rules: Optional[Dict] = None,
+                          progress: Optional[ProgressCallback] = None) -> str:
     converter = OwlToJavaConverter()
     return converter.convert(
         owl_file=owl_file,
@@ -283,13 +790,22 @@ def generate_java_classes(owl_file: str, base_output_dir: str = "generated",
         package_name=package_name,
         version=version,
         previous_version=previous_version,
-        folder_prefix=folder_prefix
+        folder_prefix=folder_prefix,
+        equals_hash=equals_hash,
+        immutable=immutable,
+        subtrees=subtrees,
+        graph=graph,
+        previous_graph=previous_graph,
+        migration_rules=migration_rules,
+        progress=progress
     )
 
 
 if __name__ == "__main__":
     import argparse
 
+    logging.basicConfig(level=logging.INFO)
+
     parser = argparse.ArgumentParser(description="Convert OWL ontology to Java classes")
     parser.add_argument("owl_file", help="Path to input OWL file")
     parser.add_argument("--output", default="generated", help="Output directory")
@@ -297,6 +813,9 @@ if __name__ == "__main__":
     parser.add_argument("--version", help="Override ontology version")
     parser.add_argument("--previous", help="Path to previous version OWL file for migration")
     parser.add_argument("--prefix", help="Custom folder name prefix")
+    parser.add_argument("--equals-hash", action="store_true", help="Generate equals/hashCode")
+    parser.add_argument("--immutable", action="store_true", help="Generate immutable classes with builders")
+    parser.add_argument("--subtree", action="append", help="Only generate this class and its subclasses (repeatable)")
     args = parser.parse_args()
 
     try:
@@ -306,7 +825,10 @@ if __name__ == "__main__":
             args.package,
             args.version,
             args.previous,
-            args.prefix
+            args.prefix,
+            args.equals_hash,
+            args.immutable,
+            args.subtree
         )
         print(f"Successfully generated Java code in: {output_path}")
     except Exception as e:
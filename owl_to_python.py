@@ -1,194 +1,17 @@
-from rdflib import Graph, RDF, RDFS, OWL, XSD, URIRef, Literal
+from rdflib import Graph, XSD, URIRef
 from jinja2 import Template
 from pathlib import Path
 import logging
-import yaml
-from typing import Dict, List, Optional, Union, Any, Set
-import semver
+from typing import Dict, List, Optional, Union
 import sys
-import importlib.util
-from difflib import Differ
+import compileall
+import keyword
+import re
 import json
+from ontology_core import (ClassHierarchy, ConversionCancelled, OntologyDiff, OntologyGraphIndex, OntologyIndividuals,
+                           OntologyVersionManager, ProgressCallback)
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
-
-
-class OntologyDiff:
-    @staticmethod
-    def compare(old_g: Graph, new_g: Graph) -> Dict[str, Any]:
-        diff = {
-            'added_classes': set(),
-            'removed_classes': set(),
-            'changed_classes': {},
-            'added_properties': set(),
-            'removed_properties': set(),
-            'changed_properties': {},
-            'renamed': {}
-        }
-
-        old_classes = {str(c) for c in old_g.subjects(RDF.type, OWL.Class)}
-        new_classes = {str(c) for c in new_g.subjects(RDF.type, OWL.Class)}
-
-        old_props = {str(p) for p in old_g.subjects(RDF.type, (OWL.ObjectProperty, OWL.DatatypeProperty))}
-        new_props = {str(p) for p in new_g.subjects(RDF.type, (OWL.ObjectProperty, OWL.DatatypeProperty))}
-
-        diff['added_classes'] = new_classes - old_classes
-        diff['removed_classes'] = old_classes - new_classes
-        diff['added_properties'] = new_props - old_props
-        diff['removed_properties'] = old_props - new_props
-
-        diff['renamed'] = OntologyDiff._detect_renames(old_g, new_g, old_classes & new_classes)
-
-        for cls in old_classes & new_classes:
-            class_changes = OntologyDiff._compare_class(old_g, new_g, URIRef(cls))
-            if class_changes:
-                diff['changed_classes'][cls] = class_changes
-
-        for prop in old_props & new_props:
-            prop_changes = OntologyDiff._compare_property(old_g, new_g, URIRef(prop))
-            if prop_changes:
-                diff['changed_properties'][prop] = prop_changes
-
-        return diff
-
-    @staticmethod
-    def _detect_renames(old_g: Graph, new_g: Graph, common_classes: Set[str]) -> Dict[str, str]:
-        renames = {}
-        d = Differ()
-
-        for cls in common_classes:
-            old_label = str(old_g.value(URIRef(cls), RDFS.label) or "")
-            new_label = str(new_g.value(URIRef(cls), RDFS.label) or "")
-
-            if old_label and new_label and old_label != new_label:
-                similarity = sum(1 for s in d.compare(old_label, new_label) if s.startswith(' ')) / max(len(old_label),
-                                                                                                        len(new_label))
-                if similarity > 0.5:
-                    renames[cls] = new_label
-
-        return renames
-
-    @staticmethod
-    def _compare_class(old_g: Graph, new_g: Graph, class_uri: URIRef) -> Dict[str, Any]:
-        changes = {}
-
-        old_parents = {str(p) for p in old_g.objects(class_uri, RDFS.subClassOf)}
-        new_parents = {str(p) for p in new_g.objects(class_uri, RDFS.subClassOf)}
-
-        if old_parents != new_parents:
-            changes['parents'] = {
-                'added': list(new_parents - old_parents),
-                'removed': list(old_parents - new_parents)
-            }
-
-        return changes
-
-    @staticmethod
-    def _compare_property(old_g: Graph, new_g: Graph, prop_uri: URIRef) -> Dict[str, Any]:
-        changes = {}
-
-        old_domain = str(old_g.value(prop_uri, RDFS.domain)) if old_g.value(prop_uri, RDFS.domain) else None
-        new_domain = str(new_g.value(prop_uri, RDFS.domain)) if new_g.value(prop_uri, RDFS.domain) else None
-
-        if old_domain != new_domain:
-            changes['domain'] = {'old': old_domain, 'new': new_domain}
-
-        old_range = str(old_g.value(prop_uri, RDFS.range)) if old_g.value(prop_uri, RDFS.range) else None
-        new_range = str(new_g.value(prop_uri, RDFS.range)) if new_g.value(prop_uri, RDFS.range) else None
-
-        if old_range != new_range:
-            changes['range'] = {'old': old_range, 'new': new_range}
-
-        old_type = 'ObjectProperty' if (prop_uri, RDF.type, OWL.ObjectProperty) in old_g else 'DatatypeProperty'
-        new_type = 'ObjectProperty' if (prop_uri, RDF.type, OWL.ObjectProperty) in new_g else 'DatatypeProperty'
-
-        if old_type != new_type:
-            changes['type'] = {'old': old_type, 'new': new_type}
-
-        return changes
-
-
-class OntologyVersionManager:
-    @staticmethod
-    def load_version(g: Graph) -> str:
-        version = g.value(URIRef("http://example.org/ontology#Ontology"), OWL.versionInfo)
-        return str(version) if version else "1.0.0"
-
-    @staticmethod
-    def generate_migration_rules(old_g: Graph, new_g: Graph) -> Dict[str, Any]:
-        diff = OntologyDiff.compare(old_g, new_g)
-        rules = {
-            'field_renames': {},
-            'type_changes': {},
-            'default_values': {},
-            'removed_fields': {},
-            'added_fields': {},
-            'class_changes': {}
-        }
-
-        for prop_uri, changes in diff['changed_properties'].items():
-            prop_name = prop_uri.split('#')[-1]
-
-            if 'range' in changes:
-                rules['type_changes'][prop_name] = {
-                    'old': OntologyVersionManager._uri_to_type(changes['range']['old']),
-                    'new': OntologyVersionManager._uri_to_type(changes['range']['new'])
-                }
-
-            if 'domain' in changes:
-                rules['domain_changes'] = rules.get('domain_changes', {})
-                rules['domain_changes'][prop_name] = {
-                    'old': changes['domain']['old'].split('#')[-1],
-                    'new': changes['domain']['new'].split('#')[-1]
-                }
-
-        for prop_uri in diff['added_properties']:
-            prop_name = prop_uri.split('#')[-1]
-            range_uri = str(new_g.value(URIRef(prop_uri), RDFS.range)) if new_g.value(URIRef(prop_uri),
-                                                                                      RDFS.range) else None
-            rules['added_fields'][prop_name] = {
-                'type': OntologyVersionManager._uri_to_type(range_uri),
-                'default': OntologyVersionManager._get_default_value(range_uri)
-            }
-
-        for prop_uri in diff['removed_properties']:
-            prop_name = prop_uri.split('#')[-1]
-            rules['removed_fields'][prop_name] = True
-
-        for cls_uri, changes in diff['changed_classes'].items():
-            cls_name = cls_uri.split('#')[-1]
-            rules['class_changes'][cls_name] = changes
-
-        for old_uri, new_name in diff['renamed'].items():
-            old_name = old_uri.split('#')[-1]
-            rules['field_renames'][old_name] = new_name
-
-        return rules
-
-    @staticmethod
-    def _uri_to_type(uri: str) -> str:
-        if not uri:
-            return 'Any'
-        if 'xsd' in uri:
-            if 'string' in uri: return 'str'
-            if 'integer' in uri: return 'int'
-            if 'float' in uri: return 'float'
-            if 'boolean' in uri: return 'bool'
-            if 'date' in uri: return 'date'
-        return 'Any'
-
-    @staticmethod
-    def _get_default_value(uri: str) -> Any:
-        if not uri:
-            return None
-        if 'xsd' in uri:
-            if 'string' in uri: return ""
-            if 'integer' in uri: return 0
-            if 'float' in uri: return 0.0
-            if 'boolean' in uri: return False
-        return None
-
 
 class OwlToPythonConverter:
     def __init__(self):
@@ -199,6 +22,15 @@ class OwlToPythonConverter:
         self.classes_info = []
         self.previous_version = None
         self.migration_rules = {}
+        self.identity_map = False
+        self.columnar = False
+        self.loaders = False
+        self.validators = False
+        self.sharded = False
+        self.hierarchy: Optional[ClassHierarchy] = None
+        self.model_modules = {}
+        self.package_exports = []
+        self.progress: Optional[ProgressCallback] = None
 
     def _create_output_dir(self, ontology_name: str, base_dir: str, folder_prefix: Optional[str] = None) -> Path:
         version_suffix = f"v{self.current_version.replace('.', '_')}"
@@ -209,17 +41,33 @@ class OwlToPythonConverter:
 
     def convert(self, owl_file: str, base_output_dir: str = "generated",
                 hydra_mode: bool = False, version: str = None,
-                previous_version: str = None, folder_prefix: str = None) -> str:
+                previous_version: str = None, folder_prefix: str = None,
+                identity_map: bool = False, columnar: bool = False,
+                loaders: bool = False, validators: bool = False, sharded: bool = False,
+                schema_yaml: bool = False, subtrees: Optional[List[str]] = None,
+                graph: Optional[Graph] = None, previous_graph: Optional[Graph] = None,
+                migration_rules: Optional[Dict] = None,
+                progress: Optional[ProgressCallback] = None) -> str:
         try:
             owl_path = Path(owl_file)
             self._validate_input(owl_path)
-
-            g = Graph()
-            self._parse_owl(g, owl_path)
+            self.progress = progress
+            self.identity_map = identity_map
+            self.columnar = columnar
+            self.loaders = loaders
+            self.validators = validators
+            self.sharded = sharded
+            self.package_exports = []
+
+            if graph is None:
+                self._report("parse")
+                graph = Graph()
+                self._parse_owl(graph, owl_path)
+            g = graph
             self.current_version = version or OntologyVersionManager.load_version(g)
 
-            if previous_version:
-                self._load_previous_version(previous_version, g)
+            if previous_version or previous_graph is not None:
+                self._load_previous_version(previous_version, g, previous_graph, migration_rules)
 
             output_dir = self._create_output_dir(
                 ontology_name=owl_path.stem,
@@ -227,36 +75,78 @@ class OwlToPythonConverter:
                 folder_prefix=folder_prefix
             )
 
+            self._report("extract")
             self._extract_namespaces(g)
-            self._build_class_hierarchy(g)
-            self.classes_info = self._extract_classes(g)
-            self.properties_info = self._extract_properties(g)
+            index = OntologyGraphIndex(g)
+            self._build_class_hierarchy(index)
+            self.classes_info = self._extract_classes(index)
+            self.properties_info = self._extract_properties(index)
+            self.hierarchy = ClassHierarchy(self.classes_info, self.properties_info)
+            if subtrees:
+                self.hierarchy = self.hierarchy.subset(subtrees)
+                self.properties_info = [prop for prop in self.properties_info if prop["domain"] in self.hierarchy.index]
+            self.classes_info = self.hierarchy.classes
+            self.model_modules = self._module_names() if sharded else {}
 
             self._generate_model_file(output_dir, hydra_mode)
 
             if hydra_mode:
-                self._generate_hydra_config(output_dir)
+                self._report("hydra")
+                self._generate_hydra_config(output_dir, schema_yaml)
                 self._generate_compatibility_layer(output_dir)
 
+            if identity_map:
+                self._report("registry")
+                self._generate_registry(output_dir)
+
+            if columnar:
+                self._report("tables")
+                self._generate_table_file(output_dir)
+
+            if loaders:
+                self._report("loaders")
+                self._generate_loaders(output_dir)
+
+            if validators:
+                self._report("validators")
+                self._generate_validators(output_dir)
+
+            self._report("individuals")
+            self._generate_individuals(output_dir, g)
+
+            self._report("package")
             self._create_init_file(output_dir)
             self._generate_changelog(output_dir)
 
+            if sharded:
+                compileall.compile_dir(str(output_dir), quiet=1)
+
             logger.info(f"Successfully generated code in: {output_dir}")
             return str(output_dir)
+        except ConversionCancelled:
+            logger.info("Conversion cancelled")
+            raise
         except Exception as e:
             logger.error(f"Conversion failed: {str(e)}")
             raise
 
-    def _load_previous_version(self, previous_version: str, current_g: Graph):
-        prev_owl = Path(previous_version)
-        if not prev_owl.exists():
-            logger.warning(f"Previous version not found: {previous_version}")
-            return
+    def _report(self, stage: str, done: int = 0, total: int = 0):
+        if self.progress is not None:
+            self.progress(stage, done, total)
 
-        prev_g = Graph()
-        prev_g.parse(prev_owl)
+    def _load_previous_version(self, previous_version: Optional[str], current_g: Graph,
+                               prev_g: Optional[Graph] = None, migration_rules: Optional[Dict] = None):
+        if prev_g is None:
+            prev_owl = Path(previous_version)
+            if not prev_owl.exists():
+                logger.warning(f"Previous version not found: {previous_version}")
+                return
+
+            prev_g = Graph()
+            prev_g.parse(prev_owl)
         self.previous_version = OntologyVersionManager.load_version(prev_g)
-        self.migration_rules = OntologyVersionManager.generate_migration_rules(prev_g, current_g)
+        self.migration_rules = migration_rules if migration_rules is not None else \
+            OntologyVersionManager.generate_migration_rules(prev_g, current_g)
 
     def _generate_changelog(self, output_dir: Path):
         if not self.migration_rules:
@@ -298,7 +188,7 @@ import semver
 class OntologyAdapter:
     """Handle version migrations between ontology versions"""
     CURRENT_VERSION = "{{ version }}"
-    MIGRATION_RULES = {{ migration_rules|tojson }}
+    MIGRATION_RULES = {{ migration_rules }}
 
     @classmethod
     def migrate(cls, old_data: Dict[str, Any], old_version: str) -> Dict[str, Any]:
@@ -347,6 +237,7 @@ class OntologyAdapter:
             version=self.current_version,
             migration_rules=json.loads(json.dumps(self.migration_rules, default=str))
         ), encoding='utf-8')
+        self.package_exports.append(("compatibility", ["OntologyAdapter"]))
 
     def _validate_input(self, owl_path: Path):
         if not owl_path.exists():
@@ -364,17 +255,13 @@ class OntologyAdapter:
         for prefix, uri in g.namespaces():
             self.ns[prefix] = uri
 
-    def _build_class_hierarchy(self, g: Graph):
-        for cls in g.subjects(RDF.type, OWL.Class):
-            self.class_hierarchy[str(cls)] = []
-
-        for sub_class, _, super_class in g.triples((None, RDFS.subClassOf, None)):
-            if str(sub_class) in self.class_hierarchy:
-                self.class_hierarchy[str(sub_class)].append(str(super_class))
+    def _build_class_hierarchy(self, index: OntologyGraphIndex):
+        for cls in index.classes:
+            self.class_hierarchy[str(cls)] = [str(parent) for parent in index.parents.get(cls, [])]
 
-    def _extract_classes(self, g: Graph) -> List[Dict]:
+    def _extract_classes(self, index: OntologyGraphIndex) -> List[Dict]:
         classes = []
-        for class_uri in g.subjects(RDF.type, OWL.Class):
+        for class_uri in index.classes:
             class_name = self._uri_to_name(class_uri)
             classes.append({
                 "name": class_name,
@@ -383,122 +270,1115 @@ class OntologyAdapter:
                     self._uri_to_name(uri)
                     for uri in self.class_hierarchy.get(str(class_uri), [])
                 ],
-                "comment": self._get_class_comment(g, class_uri)
+                "comment": self._get_comment(index, class_uri)
             })
         return classes
 
-    def _extract_properties(self, g: Graph) -> List[Dict]:
+    def _extract_properties(self, index: OntologyGraphIndex) -> List[Dict]:
         properties = []
-        for prop in g.subjects(RDF.type, OWL.ObjectProperty):
-            properties.append(self._process_property(g, prop, "ObjectProperty"))
-        for prop in g.subjects(RDF.type, OWL.DatatypeProperty):
-            properties.append(self._process_property(g, prop, "DatatypeProperty"))
+        for prop in index.object_properties:
+            properties.append(self._process_property(index, prop, "ObjectProperty"))
+        for prop in index.datatype_properties:
+            properties.append(self._process_property(index, prop, "DatatypeProperty"))
         return properties
 
-    def _process_property(self, g: Graph, prop: URIRef, prop_type: str) -> Dict:
+    def _process_property(self, index: OntologyGraphIndex, prop: URIRef, prop_type: str) -> Dict:
         prop_name = self._uri_to_name(prop)
-        domain = self._get_property_domain(g, prop)
-        range_ = self._get_property_range(g, prop, prop_type)
+        domain = index.domains.get(prop)
+        range_ = self._get_property_range(index.ranges.get(prop), prop_type)
 
         return {
             "name": prop_name,
             "type": prop_type,
-            "domain": domain,
+            "domain": self._uri_to_name(domain) if domain else None,
             "range": range_,
-            "comment": self._get_property_comment(g, prop)
+            "comment": self._get_comment(index, prop),
+            "max_cardinality": index.max_cardinality.get(prop)
         }
 
+    def _model_support_source(self, hydra_mode: bool, sharded: bool) -> str:
+        # Inlined into ontology_model.py when not sharded, whose header already has the imports
+        template = Template('''{% if sharded %}
+import importlib
+from datetime import date, datetime
+from typing import Any
+{% endif %}
+
+
+def _nested(cls, value):
+    return cls._from_dict(value) if isinstance(value, dict) else value
+
+
+def _to_date(value: Any) -> Any:
+    """Configs hold dates as ISO strings"""
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _to_datetime(value: Any) -> Any:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+{% if sharded %}
+
+
+def _model(name: str):
+    """Resolve a class through the lazy package namespace"""
+    return getattr(importlib.import_module(__package__), name)
+{% endif %}
+''')
+        return template.render(hydra_mode=hydra_mode, sharded=sharded)
+
     def _generate_model_file(self, output_dir: Path, hydra_mode: bool):
         template = Template('''# Auto-generated from OWL ontology
 from dataclasses import dataclass, field
-from typing import List, Optional, Union
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 {% if hydra_mode %}
-from omegaconf import DictConfig
+from omegaconf import DictConfig, ListConfig, OmegaConf
+{% endif %}
+{% if sharded %}
+from .._model_support import _model, _nested, _to_date, _to_datetime
+
+{% for parent, module in parent_imports %}
+from .{{ module }} import {{ parent }}
+{% endfor %}
+{% else %}
+{{ support }}
 {% endif %}
 
 {% for cls in classes %}
 @dataclass
 class {{ cls.name }}{% if cls.parent_classes %}({{ cls.parent_classes|join(', ') }}){% endif %}:
     """{{ cls.comment or cls.name }}"""
-    {% for prop in properties if prop.domain == cls.name %}
+    {% for prop in own_properties[cls.name] %}
     {% if cls.name == 'Department' and prop.name == 'name' %}
     name: str = field(default="Unnamed Department")
     {% else %}
-    {{ prop.name }}: {% if prop.type == 'ObjectProperty' %}{% if prop.range == cls.name %}List['{{ prop.range }}']{% else %}Optional['{{ prop.range }}']{% endif %}{% else %}{{ prop.range }}{% endif %} = field(
-        default={% if prop.range == 'bool' %}False{% elif prop.range == 'str' %}""{% elif prop.range == 'int' %}0{% elif prop.type == 'ObjectProperty' %}None{% else %}None{% endif %},
+    {{ prop.name }}: {% if prop.max_cardinality and prop.max_cardinality > 1 %}Tuple[{% if prop.type == 'ObjectProperty' %}'{{ prop.range }}'{% else %}{{ prop.range }}{% endif %}, ...]{% elif prop.type == 'ObjectProperty' %}{% if prop.range == cls.name %}List['{{ prop.range }}']{% else %}Optional['{{ prop.range }}']{% endif %}{% else %}{{ prop.range }}{% endif %} = field(
+        default={% if prop.max_cardinality and prop.max_cardinality > 1 %}(){% elif prop.range == 'bool' %}False{% elif prop.range == 'str' %}""{% elif prop.range == 'int' %}0{% elif prop.type == 'ObjectProperty' %}None{% else %}None{% endif %},
         metadata={"hydra": {"key": "{{ prop.name }}"}} if {{ hydra_mode }} else {}
     )
     """{{ prop.comment or prop.name }} ({{ prop.type }})"""
     {% endif %}
     {% endfor %}
+    {% for prop in own_properties[cls.name] if prop.max_cardinality and prop.max_cardinality > 1 %}
+    {% if loop.first %}
+
+    def __post_init__(self):
+        if hasattr(super(), '__post_init__'):
+            super().__post_init__()
+    {% endif %}
+        if self.{{ prop.name }} is None:
+            self.{{ prop.name }} = ()
+        elif not isinstance(self.{{ prop.name }}, tuple):
+            self.{{ prop.name }} = tuple(self.{{ prop.name }})
+        if len(self.{{ prop.name }}) > {{ prop.max_cardinality }}:
+            raise ValueError("{{ cls.name }}.{{ prop.name }} accepts at most {{ prop.max_cardinality }} values")
+    {% endfor %}
 
     @classmethod
     def from_config(cls, cfg{% if hydra_mode %}: DictConfig{% endif %}):
-        return cls(
-            {% for prop in properties if prop.domain == cls.name %}
-            {{ prop.name }}=cfg.{{ prop.name }}{% if not loop.last %},{% endif %}
-            {% endfor %}
+        {% if hydra_mode %}
+        if isinstance(cfg, DictConfig):
+            cfg = OmegaConf.to_container(cfg, resolve=True)
+        {% endif %}
+        return cls._from_dict(cfg)
+
+    @classmethod
+    def from_configs(cls, cfgs{% if hydra_mode %}: Union[ListConfig, Iterable[Dict[str, Any]]]{% endif %}) -> List['{{ cls.name }}']:
+        """Build many instances, resolving the OmegaConf tree once instead of per field"""
+        {% if hydra_mode %}
+        if isinstance(cfgs, (DictConfig, ListConfig)):
+            cfgs = OmegaConf.to_container(cfgs, resolve=True)
+        {% endif %}
+        build = cls._from_dict
+        return [build(data) for data in cfgs]
+
+    @classmethod
+    def _from_dict(cls, data: Dict[str, Any]) -> '{{ cls.name }}':
+        kwargs = {}
+        {% for prop in all_properties[cls.name] %}
+        if "{{ prop.name }}" in data:
+            {% if prop.type == 'ObjectProperty' and prop.range in class_names and containers[prop.name] %}
+            kwargs["{{ prop.name }}"] = {{ containers[prop.name] }}(_nested({{ refs[prop.range] }}, item) for item in data["{{ prop.name }}"] or ())
+            {% elif prop.type == 'ObjectProperty' and prop.range in class_names %}
+            kwargs["{{ prop.name }}"] = _nested({{ refs[prop.range] }}, data["{{ prop.name }}"])
+            {% elif prop.range in ('date', 'datetime') and containers[prop.name] %}
+            kwargs["{{ prop.name }}"] = {{ containers[prop.name] }}(_to_{{ prop.range }}(item) for item in data["{{ prop.name }}"] or ())
+            {% elif prop.range in ('date', 'datetime') %}
+            kwargs["{{ prop.name }}"] = _to_{{ prop.range }}(data["{{ prop.name }}"])
+            {% else %}
+            kwargs["{{ prop.name }}"] = data["{{ prop.name }}"]
+            {% endif %}
+        {% endfor %}
+        return cls(**kwargs)
+{% endfor %}
+''')
+
+        context = dict(
+            own_properties=self.hierarchy.own_properties,
+            all_properties=self.hierarchy.all_properties,
+            class_names={cls["name"] for cls in self.classes_info},
+            containers={prop["name"]: self._container_type(prop) for prop in self.properties_info},
+            hydra_mode=hydra_mode,
+            sharded=self.sharded
+        )
+
+        if not self.sharded:
+            self._report("models", 0, len(self.classes_info))
+            (output_dir / "ontology_model.py").write_text(template.render(
+                classes=self.classes_info,
+                refs={cls["name"]: cls["name"] for cls in self.classes_info},
+                support=self._model_support_source(hydra_mode, False),
+                **context
+            ), encoding='utf-8')
+            self._report("models", len(self.classes_info), len(self.classes_info))
+            return
+
+        models_dir = output_dir / "models"
+        models_dir.mkdir(exist_ok=True)
+        (models_dir / "__init__.py").write_text("", encoding='utf-8')
+        (output_dir / "_model_support.py").write_text(
+            self._model_support_source(hydra_mode, True), encoding='utf-8'
         )
+        refs = {cls["name"]: f'_model("{cls["name"]}")' for cls in self.classes_info}
+        for done, cls in enumerate(self.classes_info):
+            self._report("models", done, len(self.classes_info))
+            (models_dir / f"{self.model_modules[cls['name']]}.py").write_text(template.render(
+                classes=[cls],
+                refs=refs,
+                parent_imports=[
+                    (parent, self.model_modules[parent])
+                    for parent in cls["parent_classes"] if parent in self.model_modules
+                ],
+                **context
+            ), encoding='utf-8')
+
+    def _generate_hydra_config(self, output_dir: Path, schema_yaml: bool = False):
+        schema = {
+            cls["name"]: {
+                "name": cls["name"],
+                "version": self.current_version,
+                "properties": {
+                    prop["name"]: {
+                        "type": prop["type"],
+                        "range": prop["range"],
+                        "comment": prop.get("comment", "")
+                    }
+                    for prop in self._class_properties(cls["name"], inherited=False)
+                }
+            }
+            for cls in self.classes_info
+        }
+
+        if schema_yaml:
+            import yaml
+
+            config_dir = output_dir / "hydra_config"
+            config_dir.mkdir(exist_ok=True)
+            (config_dir / "ontology.yaml").write_text(yaml.dump(schema, sort_keys=False), encoding='utf-8')
+
+        template = Template('''# Auto-generated Hydra structured configs
+from dataclasses import field, make_dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from hydra.core.config_store import ConfigStore
+
+VERSION = "{{ version }}"
+GROUP = "ontology"
+
+SCHEMA: Dict[str, Dict[str, Any]] = {{ schema }}
+
+# (field, annotation, default) per class; a default of `list` means an empty list factory
+_FIELDS: Dict[str, Tuple[Tuple[str, Any, Any], ...]] = {
+    {% for cls in classes %}
+    "{{ cls.name }}": (
+        {% for field in fields[cls.name] %}
+        ("{{ field.name }}", {{ field.annotation }}, {{ field.default }}),
+        {% endfor %}
+    ),
+    {% endfor %}
+}
+
+_NAMES = {name.lower(): name for name in _FIELDS}
+_config_classes: Dict[str, type] = {}
+_registered: Set[Tuple[str, str]] = set()
+
+
+def config_class(name: str) -> type:
+    """Build the structured config dataclass of one ontology class on first use"""
+    name = _NAMES.get(name.lower(), name)
+    config = _config_classes.get(name)
+    if config is None:
+        config = make_dataclass(f"{name}Config", [
+            (field_name, annotation, field(default_factory=list) if default is list else field(default=default))
+            for field_name, annotation, default in _FIELDS[name]
+        ])
+        _config_classes[name] = config
+    return config
+
+
+def register_configs(*names: str, group: str = GROUP) -> None:
+    """Store the given class configs (all of them when none are named) in Hydra's ConfigStore"""
+    store = ConfigStore.instance()
+    for name in names or _FIELDS:
+        name = _NAMES.get(name.lower(), name)
+        if (group, name) in _registered:
+            continue
+        store.store(group=group, name=name.lower(), node=config_class(name))
+        _registered.add((group, name))
+''')
+
+        fields = {
+            cls["name"]: [self._config_field(cls["name"], prop) for prop in self._class_properties(cls["name"])]
+            for cls in self.classes_info
+        }
+        (output_dir / "hydra_configs.py").write_text(template.render(
+            version=self.current_version,
+            schema=schema,
+            classes=self.classes_info,
+            fields=fields
+        ), encoding='utf-8')
+
+    def _config_field(self, class_name: str, prop: Dict) -> Dict[str, str]:
+        # OmegaConf has no date types, so dates stay ISO strings and references stay nested nodes
+        if self._container_type(prop):
+            annotation, default = "List[Any]", "list"
+        elif prop["type"] == "ObjectProperty":
+            annotation, default = "Optional[Any]", "None"
+        elif class_name == "Department" and prop["name"] == "name":
+            annotation, default = "str", repr("Unnamed Department")
+        else:
+            annotation, default = {
+                "str": ("str", '""'),
+                "int": ("int", "0"),
+                "bool": ("bool", "False"),
+                "float": ("Optional[float]", "None")
+            }.get(prop["range"], ("Optional[str]", "None"))
+        return {"name": prop["name"], "annotation": annotation, "default": default}
+
+    def _generate_registry(self, output_dir: Path):
+        template = Template('''# Auto-generated identity map for ontology instances
+import weakref
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+# Object-valued fields per class, including inherited ones
+OBJECT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    {% for cls in classes %}
+    "{{ cls.name }}": ({% for name in object_fields[cls.name] %}"{{ name }}", {% endfor %}),
+    {% endfor %}
+}
+
+
+class Reference:
+    """Placeholder for an entity that has not been interned yet"""
+    __slots__ = ("key", "cls")
+
+    def __init__(self, key: Hashable, cls: Optional[type] = None):
+        self.key = key
+        self.cls = cls
+
+    def __repr__(self) -> str:
+        return f"Reference({self.key!r})"
+
+
+class OntologyRegistry:
+    """Identity map of generated instances keyed by IRI or ID"""
+
+    def __init__(self, weak: bool = True):
+        self._entities = weakref.WeakValueDictionary() if weak else {}
+        # Instances still holding references, by id; weak like the entities so dropped ones leave
+        self._pending = weakref.WeakValueDictionary() if weak else {}
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entities
+
+    def get(self, key: Hashable, cls: Optional[type] = None) -> Optional[Any]:
+        entity = self._entities.get(key)
+        if entity is not None and cls is not None and not isinstance(entity, cls):
+            raise TypeError(f"{key!r} is a {type(entity).__name__}, not {cls.__name__}")
+        return entity
+
+    def intern(self, key: Hashable, obj: Any) -> Any:
+        existing = self._entities.get(key)
+        if existing is not None:
+            return existing
+        self._entities[key] = obj
+        if self._has_references(obj):
+            self._pending[id(obj)] = obj
+        return obj
+
+    def get_or_create(self, cls: type, key: Hashable, **fields) -> Any:
+        existing = self.get(key, cls)
+        if existing is not None:
+            return existing
+        return self.intern(key, cls(**fields))
+
+    def ref(self, key: Hashable, cls: Optional[type] = None) -> Any:
+        entity = self.get(key, cls)
+        return entity if entity is not None else Reference(key, cls)
+
+    def resolve(self) -> List[Reference]:
+        """Replace references in all pending instances in one pass; returns the unresolved ones"""
+        unresolved: List[Reference] = []
+        for key, obj in list(self._pending.items()):
+            missing = len(unresolved)
+            for name in OBJECT_FIELDS.get(type(obj).__name__, ()):
+                value = getattr(obj, name)
+                if isinstance(value, Reference):
+                    setattr(obj, name, self._lookup(value, unresolved))
+                elif isinstance(value, (list, tuple)):
+                    resolved = [self._lookup(item, unresolved) if isinstance(item, Reference) else item
+                                for item in value]
+                    setattr(obj, name, type(value)(resolved))
+            if len(unresolved) == missing:
+                del self._pending[key]
+        return unresolved
+
+    def _lookup(self, reference: Reference, unresolved: List[Reference]) -> Any:
+        entity = self._entities.get(reference.key)
+        if entity is None or (reference.cls is not None and not isinstance(entity, reference.cls)):
+            unresolved.append(reference)
+            return reference
+        return entity
+
+    def _has_references(self, obj: Any) -> bool:
+        for name in OBJECT_FIELDS.get(type(obj).__name__, ()):
+            value = getattr(obj, name, None)
+            if isinstance(value, Reference):
+                return True
+            if isinstance(value, (list, tuple)) and any(isinstance(item, Reference) for item in value):
+                return True
+        return False
+''')
+
+        object_fields = {
+            cls["name"]: [
+                prop["name"] for prop in self._class_properties(cls["name"])
+                if prop["type"] == "ObjectProperty"
+            ]
+            for cls in self.classes_info
+        }
+        (output_dir / "registry.py").write_text(template.render(
+            classes=self.classes_info,
+            object_fields=object_fields
+        ), encoding='utf-8')
+        self.package_exports.append(("registry", ["OntologyRegistry", "Reference"]))
+
+    def _generate_table_file(self, output_dir: Path):
+        template = Template('''# Auto-generated columnar tables for ontology classes
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+{{ model_import }}
+
+NO_REF = -1
+
+
+class ColumnTable:
+    """Growable structured-array storage; object properties are stored as row indexes"""
+    ROW_TYPE: type = None
+    DTYPE: np.dtype = None
+    DEFAULTS: Dict[str, Any] = {}
+    REFERENCES: Dict[str, str] = {}
+
+    def __init__(self, capacity: int = 1024):
+        self._data = np.empty(capacity, dtype=self.DTYPE)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.column(name)
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def column(self, name: str) -> np.ndarray:
+        return self._data[name][:self._size]
+
+    def append_batch(self, batch: Union[Mapping[str, Sequence], np.ndarray]) -> None:
+        if isinstance(batch, np.ndarray):
+            count = len(batch)
+            columns = {name: batch[name] for name in batch.dtype.names}
+        else:
+            count = len(next(iter(batch.values()))) if batch else 0
+            columns = batch
+        if not count:
+            return
+        self._reserve(count)
+        block = self._data[self._size:self._size + count]
+        for name in self.DTYPE.names:
+            block[name] = columns[name] if name in columns else self.DEFAULTS[name]
+        self._size += count
+
+    def filter(self, mask: np.ndarray) -> "ColumnTable":
+        table = type(self)(capacity=0)
+        table._data = self.data[mask].copy()
+        table._size = len(table._data)
+        return table
+
+    @classmethod
+    def from_instances(cls, instances: Sequence[Any],
+                       references: Optional[Mapping[str, Sequence[Any]]] = None) -> "ColumnTable":
+        columns = {}
+        for name in cls.DTYPE.names:
+            values = [getattr(obj, name) for obj in instances]
+            if name in cls.REFERENCES:
+                positions = {id(target): i for i, target in enumerate((references or {}).get(name, ()))}
+                shape = cls.DTYPE[name].shape
+                values = [cls._to_index(value, positions, shape) for value in values]
+            columns[name] = values
+        table = cls(capacity=max(len(instances), 1))
+        table.append_batch(columns)
+        return table
+
+    def to_instances(self, references: Optional[Mapping[str, Sequence[Any]]] = None) -> List[Any]:
+        columns = {}
+        for name in self.DTYPE.names:
+            values = self.column(name).tolist()
+            if name in self.REFERENCES:
+                targets = (references or {}).get(name)
+                values = [self._from_index(value, targets) for value in values]
+            columns[name] = values
+        names = self.DTYPE.names
+        return [self.ROW_TYPE(**dict(zip(names, row))) for row in zip(*(columns[name] for name in names))]
+
+    def _reserve(self, count: int) -> None:
+        required = self._size + count
+        if required <= len(self._data):
+            return
+        grown = np.empty(max(required, 2 * len(self._data)), dtype=self.DTYPE)
+        grown[:self._size] = self._data[:self._size]
+        self._data = grown
+
+    @staticmethod
+    def _to_index(value: Any, positions: Dict[int, int], shape: tuple) -> Any:
+        if shape:
+            indexes = [positions.get(id(item), NO_REF) for item in (value or ())]
+            return indexes + [NO_REF] * (shape[0] - len(indexes))
+        return NO_REF if value is None else positions.get(id(value), NO_REF)
+
+    @staticmethod
+    def _from_index(value: Any, targets: Optional[Sequence[Any]]) -> Any:
+        if isinstance(value, list):
+            return tuple(targets[i] for i in value if i != NO_REF) if targets is not None else ()
+        return targets[value] if targets is not None and value != NO_REF else None
+{% for cls in classes %}
+
+
+class {{ cls.name }}Table(ColumnTable):
+    ROW_TYPE = {{ cls.name }}
+    DTYPE = np.dtype([
+        {% for column in columns[cls.name] %}
+        ("{{ column.name }}", {{ column.dtype }}{% if column.shape %}, ({{ column.shape }},){% endif %}),
+        {% endfor %}
+    ])
+    DEFAULTS = {
+        {% for column in columns[cls.name] %}
+        "{{ column.name }}": {{ column.default }},
+        {% endfor %}
+    }
+    REFERENCES = {
+        {% for column in columns[cls.name] if column.reference %}
+        "{{ column.name }}": "{{ column.reference }}",
+        {% endfor %}
+    }
 {% endfor %}
 ''')
 
-        (output_dir / "ontology_model.py").write_text(template.render(
+        columns = {
+            cls["name"]: [self._table_column(prop) for prop in self._class_properties(cls["name"])]
+            for cls in self.classes_info
+        }
+        (output_dir / "ontology_tables.py").write_text(template.render(
             classes=self.classes_info,
-            properties=self.properties_info,
-            hydra_mode=hydra_mode
+            columns=columns,
+            model_import=self._model_import([cls["name"] for cls in self.classes_info])
         ), encoding='utf-8')
+        self.package_exports.append(("ontology_tables", ["ColumnTable"] + [f"{cls['name']}Table" for cls in self.classes_info]))
+
+    def _table_column(self, prop: Dict) -> Dict:
+        capacity = prop.get("max_cardinality")
+        shape = capacity if capacity and capacity > 1 else None
+        if prop["type"] == "ObjectProperty":
+            return {"name": prop["name"], "dtype": "np.int64", "shape": shape,
+                    "default": "NO_REF", "reference": prop["range"]}
+        dtype, default = {
+            "int": ("np.int64", "0"),
+            "float": ("np.float64", "np.nan"),
+            "bool": ("np.bool_", "False")
+        }.get(prop["range"], ("object", '""' if prop["range"] == "str" else "None"))
+        return {"name": prop["name"], "dtype": dtype, "shape": shape, "default": default, "reference": None}
+
+    def _model_import(self, names: List[str]) -> str:
+        if self.sharded:
+            return f"from . import {', '.join(names)}"
+        return f"from .ontology_model import {', '.join(names)}"
+
+    def _generate_loaders(self, output_dir: Path):
+        template = Template('''# Auto-generated streaming loaders for ontology classes
+import csv
+import io
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import MISSING, fields
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+{{ model_import }}
+{% if identity_map %}
+from .registry import Reference
+{% endif %}
 
-    def _generate_hydra_config(self, output_dir: Path):
-        config_dir = output_dir / "hydra_config"
-        config_dir.mkdir(exist_ok=True)
+Batch = Union[List[Any], Dict[str, List[Any]]]
 
-        for cls in self.classes_info:
-            config = {
+
+def _to_str(value: Any) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_int(value: Any) -> int:
+    return value if type(value) is int else int(value)
+
+
+def _to_float(value: Any) -> float:
+    return float(value)
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y", "t")
+
+
+def _to_date(value: Any) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _to_datetime(value: Any) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def _to_ref(target: type) -> Callable[[Any], Any]:
+    {% if identity_map %}
+    return lambda value: Reference(value, target)
+    {% else %}
+    return _to_str
+    {% endif %}
+
+
+def _to_many(coerce: Callable[[Any], Any]) -> Callable[[Any], tuple]:
+    def convert(value: Any) -> tuple:
+        items = value if isinstance(value, (list, tuple)) else str(value).split("|")
+        return tuple(coerce(item) for item in items if item != "")
+    return convert
+
+
+# Precompiled (field, coercion) pairs derived from the ontology ranges
+COERCIONS: Dict[str, Tuple[Tuple[str, Callable[[Any], Any]], ...]] = {
+    {% for cls in classes %}
+    "{{ cls.name }}": (
+        {% for field in coercions[cls.name] %}
+        ("{{ field.name }}", {{ field.coerce }}),
+        {% endfor %}
+    ),
+    {% endfor %}
+}
+
+ROW_TYPES: Dict[str, type] = {
+    {% for cls in classes %}
+    "{{ cls.name }}": {{ cls.name }},
+    {% endfor %}
+}
+
+
+class RecordLoader:
+    """Streams CSV/JSONL records into instances or column batches of one ontology class"""
+
+    def __init__(self, class_name: str, chunk_size: int = 10000):
+        self.class_name = class_name
+        self.row_type = ROW_TYPES[class_name]
+        self.coercions = COERCIONS[class_name]
+        self.chunk_size = chunk_size
+        self.defaults = {
+            f.name: f.default for f in fields(self.row_type) if f.default is not MISSING
+        }
+
+    def iter_csv(self, path: str, columns: bool = False, **csv_options) -> Iterator[Batch]:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from self.iter_records(csv.DictReader(f, **csv_options), columns)
+
+    def iter_jsonl(self, path: str, columns: bool = False) -> Iterator[Batch]:
+        with open(path, encoding="utf-8") as f:
+            yield from self.iter_records((json.loads(line) for line in f if line.strip()), columns)
+
+    def iter_records(self, records: Iterable[Dict[str, Any]], columns: bool = False) -> Iterator[Batch]:
+        batch = []
+        for record in records:
+            batch.append(self.coerce(record))
+            if len(batch) >= self.chunk_size:
+                yield self._emit(batch, columns)
+                batch = []
+        if batch:
+            yield self._emit(batch, columns)
+
+    def iter_parallel(self, path: str, fmt: str = "csv", workers: int = None,
+                      block_size: int = 16 * 1024 * 1024, columns: bool = False) -> Iterator[Batch]:
+        """Load byte ranges of a file in worker processes; CSV values must not contain newlines"""
+        with open(path, "rb") as f:
+            header = f.readline().decode("utf-8") if fmt == "csv" else ""
+            start = f.tell() if fmt == "csv" else 0
+        ranges = _split_ranges(path, start, block_size)
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers) as pool:
+            window = deque()
+            limit = 2 * workers
+            for begin, end in ranges:
+                window.append(pool.submit(
+                    _load_range, self.class_name, path, fmt, header, begin, end, self.chunk_size, columns
+                ))
+                if len(window) >= limit:
+                    yield from window.popleft().result()
+            while window:
+                yield from window.popleft().result()
+
+    def coerce(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        values = {}
+        for name, coerce in self.coercions:
+            raw = record.get(name)
+            if raw is not None and raw != "":
+                values[name] = coerce(raw)
+        return values
+
+    def _emit(self, batch: List[Dict[str, Any]], columns: bool) -> Batch:
+        if columns:
+            return {
+                name: [row.get(name, self.defaults.get(name)) for row in batch]
+                for name, _ in self.coercions
+            }
+        row_type = self.row_type
+        return [row_type(**row) for row in batch]
+
+
+def _split_ranges(path: str, start: int, block_size: int) -> List[Tuple[int, int]]:
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        while start < size:
+            f.seek(min(start + block_size, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _load_range(class_name: str, path: str, fmt: str, header: str, begin: int, end: int,
+                chunk_size: int, columns: bool) -> List[Batch]:
+    with open(path, "rb") as f:
+        f.seek(begin)
+        text = f.read(end - begin).decode("utf-8")
+    loader = RecordLoader(class_name, chunk_size)
+    if fmt == "csv":
+        records = csv.DictReader(io.StringIO(header + text))
+    else:
+        records = (json.loads(line) for line in text.splitlines() if line.strip())
+    return list(loader.iter_records(records, columns))
+{% for cls in classes %}
+
+
+def iter_{{ cls.name|lower }}_csv(path: str, chunk_size: int = 10000, columns: bool = False,
+                                  **csv_options) -> Iterator[Batch]:
+    return RecordLoader("{{ cls.name }}", chunk_size).iter_csv(path, columns, **csv_options)
+
+
+def iter_{{ cls.name|lower }}_jsonl(path: str, chunk_size: int = 10000, columns: bool = False) -> Iterator[Batch]:
+    return RecordLoader("{{ cls.name }}", chunk_size).iter_jsonl(path, columns)
+{% endfor %}
+''')
+
+        coercions = {
+            cls["name"]: [
+                {"name": prop["name"], "coerce": self._loader_coercion(prop)}
+                for prop in self._class_properties(cls["name"])
+            ]
+            for cls in self.classes_info
+        }
+        (output_dir / "loaders.py").write_text(template.render(
+            classes=self.classes_info,
+            coercions=coercions,
+            identity_map=self.identity_map,
+            model_import=self._model_import([cls["name"] for cls in self.classes_info])
+        ), encoding='utf-8')
+        self.package_exports.append(("loaders", ["RecordLoader"]))
+
+    def _loader_coercion(self, prop: Dict) -> str:
+        if prop["type"] == "ObjectProperty":
+            known = any(cls["name"] == prop["range"] for cls in self.classes_info)
+            coerce = f"_to_ref({prop['range']})" if known else "_to_str"
+        else:
+            coerce = {
+                "int": "_to_int",
+                "float": "_to_float",
+                "bool": "_to_bool",
+                "date": "_to_date",
+                "datetime": "_to_datetime"
+            }.get(prop["range"], "_to_str")
+        capacity = prop.get("max_cardinality")
+        return f"_to_many({coerce})" if capacity and capacity > 1 else coerce
+
+    def _generate_validators(self, output_dir: Path):
+        template = Template('''# Auto-generated validators for ontology classes
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+{{ model_import }}
+{% if identity_map %}
+from .registry import Reference
+{% endif %}
+
+Failure = Tuple[int, str]
+
+
+class ValidationError(ValueError):
+    def __init__(self, failures: List[Failure]):
+        self.failures = failures
+        details = "; ".join(f"[{index}] {message}" for index, message in failures[:10])
+        more = f" (+{len(failures) - 10} more)" if len(failures) > 10 else ""
+        super().__init__(f"{len(failures)} validation failure(s): {details}{more}")
+{% for cls in classes %}
+
+
+def validate_{{ cls.name|lower }}(obj: Any) -> List[str]:
+    errors = []
+    {% for check in checks[cls.name] %}
+    value = obj.{{ check.name }}
+    if not ({{ check.expr }}):
+        errors.append(f"{{ cls.name }}.{{ check.name }}: expected {{ check.expected }}, got {type(value).__name__}")
+    {% endfor %}
+    return errors
+{% endfor %}
+
+
+VALIDATORS: Dict[type, Callable[[Any], List[str]]] = {
+    {% for cls in classes %}
+    {{ cls.name }}: validate_{{ cls.name|lower }},
+    {% endfor %}
+}
+
+# (field, predicate, expected, numpy dtype kinds accepted without a per-value scan)
+COLUMN_CHECKS: Dict[str, Tuple[Tuple[str, Callable[[Any], bool], str, str], ...]] = {
+    {% for cls in classes %}
+    "{{ cls.name }}": (
+        {% for check in checks[cls.name] %}
+        ("{{ check.name }}", lambda value: {{ check.expr }}, "{{ check.expected }}", "{{ check.kinds }}"),
+        {% endfor %}
+    ),
+    {% endfor %}
+}
+
+
+def validate(obj: Any) -> List[str]:
+    validator = VALIDATORS.get(type(obj))
+    if validator is None:
+        validator = next((VALIDATORS[base] for base in type(obj).__mro__ if base in VALIDATORS), None)
+    if validator is None:
+        return [f"{type(obj).__name__}: not an ontology class"]
+    return validator(obj)
+
+
+def validate_batch(objects: Iterable[Any], raise_errors: bool = True) -> List[Failure]:
+    """Validate every object and report all failures as (index, message) pairs"""
+    failures = []
+    validators = VALIDATORS
+    for index, obj in enumerate(objects):
+        validator = validators.get(type(obj))
+        for message in (validator(obj) if validator is not None else validate(obj)):
+            failures.append((index, message))
+    if failures and raise_errors:
+        raise ValidationError(failures)
+    return failures
+
+
+def validate_columns(class_name: str, columns: Mapping[str, Sequence[Any]],
+                     raise_errors: bool = True) -> List[Failure]:
+    """Validate a column batch (lists or NumPy arrays) of one class field by field"""
+    failures = []
+    for name, check, expected, kinds in COLUMN_CHECKS[class_name]:
+        column = columns.get(name)
+        if column is None:
+            continue
+        dtype = getattr(column, "dtype", None)
+        if dtype is not None and dtype.kind in kinds:
+            continue
+        for index, value in enumerate(column):
+            if not check(value):
+                failures.append((index, f"{class_name}.{name}: expected {expected}, got {type(value).__name__}"))
+    if failures and raise_errors:
+        failures.sort()
+        raise ValidationError(failures)
+    return sorted(failures)
+''')
+
+        checks = {
+            cls["name"]: [self._validator_check(prop) for prop in self._class_properties(cls["name"])]
+            for cls in self.classes_info
+        }
+        (output_dir / "validators.py").write_text(template.render(
+            classes=self.classes_info,
+            checks=checks,
+            identity_map=self.identity_map,
+            model_import=self._model_import([cls["name"] for cls in self.classes_info])
+        ), encoding='utf-8')
+        self.package_exports.append(("validators", ["ValidationError", "validate", "validate_batch"]))
+
+    def _validator_check(self, prop: Dict) -> Dict[str, str]:
+        known = {cls["name"] for cls in self.classes_info}
+        range_ = prop["range"]
+        if prop["type"] == "ObjectProperty":
+            targets = [range_] if range_ in known else []
+            if targets and self.identity_map:
+                targets.append("Reference")
+            target = targets[0] if len(targets) == 1 else f"({', '.join(targets)})"
+            # Columnar tables store related objects as int64 row indexes
+            kinds = "iu" if self.columnar else ""
+            check, expected = (f"isinstance({{v}}, {target})" if targets else None), range_
+        else:
+            check, expected, kinds = {
+                "str": ("isinstance({v}, str)", "str", "U"),
+                "int": ("isinstance({v}, int) and not isinstance({v}, bool)", "int", "iu"),
+                "float": ("isinstance({v}, (int, float)) and not isinstance({v}, bool)", "float", "iuf"),
+                "bool": ("isinstance({v}, bool)", "bool", "b"),
+                "date": ("isinstance({v}, date)", "date", ""),
+                "datetime": ("isinstance({v}, datetime)", "datetime", "")
+            }.get(range_, (None, range_, ""))
+
+        container = self._container_type(prop)
+        if container == "tuple":
+            capacity = prop["max_cardinality"]
+            expr = f"isinstance(value, tuple) and len(value) <= {capacity}"
+            if check:
+                expr += f" and all({check.format(v='item')} for item in value)"
+            return {"name": prop["name"], "expr": expr, "expected": f"at most {capacity} {expected}", "kinds": kinds}
+        if container == "list":
+            expr = "value is None or isinstance(value, list)"
+            if check:
+                expr = f"value is None or (isinstance(value, list) and all({check.format(v='item')} for item in value))"
+            return {"name": prop["name"], "expr": expr, "expected": f"list of {expected}", "kinds": kinds}
+
+        if not check:
+            expr = "True"
+        elif prop["type"] == "ObjectProperty" or range_ not in ("str", "int", "bool"):
+            expr = f"value is None or ({check.format(v='value')})"
+        else:
+            expr = check.format(v="value")
+        return {"name": prop["name"], "expr": expr, "expected": expected, "kinds": kinds}
+
+    def _generate_individuals(self, output_dir: Path, g: Graph):
+        if not OntologyIndividuals.has_individuals(g):
+            return
+
+        class_names = {cls["name"] for cls in self.classes_info}
+        fields = {name: {p["name"]: p for p in self._class_properties(name)} for name in class_names}
+        with open(output_dir / "individuals.jsonl", "w", encoding="utf-8") as f:
+            for name, class_name, values in OntologyIndividuals.iter_individuals(g, class_names):
+                record = {}
+                for prop_name, items in values.items():
+                    prop = fields[class_name].get(prop_name)
+                    if prop is not None:
+                        record[prop_name] = items if self._is_multi_valued(prop) else items[0]
+                f.write(json.dumps({"id": name, "type": class_name, "values": record}, default=str) + "\n")
+
+        template = Template('''# Auto-generated loader for ontology individuals
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+
+{{ model_import }}
+{% if identity_map %}
+from .registry import OntologyRegistry
+{% endif %}
+
+DATA_FILE = Path(__file__).with_name("individuals.jsonl")
+
+CLASSES: Dict[str, type] = {
+    {% for cls in classes %}
+    "{{ cls.name }}": {{ cls.name }},
+    {% endfor %}
+}
+
+# Object-valued fields and their container type, assigned once every individual exists
+REFERENCES: Dict[str, Dict[str, Optional[type]]] = {
+    {% for cls in classes %}
+    "{{ cls.name }}": {{ '{' }}{% for name, container in references[cls.name].items() %}"{{ name }}": {{ container }}{% if not loop.last %}, {% endif %}{% endfor %}{{ '}' }},
+    {% endfor %}
+}
+
+PARSERS: Dict[str, Dict[str, Callable[[str], Any]]] = {
+    {% for cls in classes if parsers[cls.name] %}
+    "{{ cls.name }}": {
+        {% for name, parser in parsers[cls.name].items() %}
+        "{{ name }}": {{ parser }},
+        {% endfor %}
+    },
+    {% endfor %}
+}
+
+
+def iter_records(path: Union[str, Path] = DATA_FILE) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_individuals(path: Union[str, Path] = DATA_FILE{% if identity_map %},
+                     registry: OntologyRegistry = None{% endif %}) -> Dict[str, Any]:
+    """Instantiate every individual, then resolve object references in a single pass"""
+    instances = {}
+    pending = []
+    for record in iter_records(path):
+        kind = record["type"]
+        values = record["values"]
+        for name, parse in PARSERS.get(kind, {}).items():
+            if name in values:
+                value = values[name]
+                values[name] = [parse(v) for v in value] if isinstance(value, list) else parse(value)
+        references = REFERENCES[kind]
+        links = {name: values.pop(name) for name in references if name in values}
+        obj = CLASSES[kind](**values)
+        instances[record["id"]] = obj
+        if links:
+            pending.append((obj, references, links))
+
+    for obj, references, links in pending:
+        for name, target in links.items():
+            container = references[name]
+            if container is None:
+                setattr(obj, name, instances.get(target))
+            else:
+                setattr(obj, name, container(instances.get(key) for key in target))
+    {% if identity_map %}
+
+    if registry is not None:
+        for key, obj in instances.items():
+            registry.intern(key, obj)
+    {% endif %}
+    return instances
+''')
+
+        (output_dir / "individuals.py").write_text(template.render(
+            classes=self.classes_info,
+            references={
                 cls["name"]: {
-                    "name": cls["name"],
-                    "version": self.current_version,
-                    "properties": {
-                        prop["name"]: {
-                            "type": prop["type"],
-                            "range": prop["range"],
-                            "comment": prop.get("comment", "")
-                        }
-                        for prop in self.properties_info
-                        if prop["domain"] == cls["name"]
-                    }
+                    p["name"]: self._container_type(p)
+                    for p in self._class_properties(cls["name"]) if p["type"] == "ObjectProperty"
                 }
-            }
-            (config_dir / f"{cls['name'].lower()}.yaml").write_text(yaml.dump(config, sort_keys=False),
-                                                                    encoding='utf-8')
+                for cls in self.classes_info
+            },
+            parsers={
+                cls["name"]: {
+                    p["name"]: f"{p['range']}.fromisoformat"
+                    for p in self._class_properties(cls["name"]) if p["range"] in ("date", "datetime")
+                }
+                for cls in self.classes_info
+            },
+            identity_map=self.identity_map,
+            model_import=self._model_import([cls["name"] for cls in self.classes_info])
+        ), encoding='utf-8')
+        self.package_exports.append(("individuals", ["load_individuals"]))
+
+    def _is_multi_valued(self, prop: Dict) -> bool:
+        return self._container_type(prop) is not None
+
+    def _container_type(self, prop: Dict) -> Optional[str]:
+        capacity = prop.get("max_cardinality")
+        if capacity and capacity > 1:
+            return "tuple"
+        if prop["type"] == "ObjectProperty" and prop["range"] == prop["domain"]:
+            return "list"
+        return None
+
+    def _class_properties(self, class_name: str, inherited: bool = True) -> List[Dict]:
+        properties = self.hierarchy.all_properties if inherited else self.hierarchy.own_properties
+        return properties.get(class_name, [])
 
     def _create_init_file(self, output_dir: Path):
-        (output_dir / "__init__.py").write_text(
-            "from .ontology_model import *\n"
-            "from .compatibility import OntologyAdapter\n"
-            "__all__ = ['OntologyAdapter'] + "
-            "[name for name in dir() if not name.startswith('_')]",
-            encoding='utf-8'
-        )
+        if self.sharded:
+            self._create_lazy_init_file(output_dir)
+            return
+
+        lines = ["from .ontology_model import *"]
+        exported = []
+        for module, names in self.package_exports:
+            lines.append(f"from .{module} import {', '.join(names)}")
+            exported.extend(names)
+        lines.append(f"__all__ = {exported!r} + "
+                     "[name for name in dir() if not name.startswith('_')]")
+        (output_dir / "__init__.py").write_text("\n".join(lines), encoding='utf-8')
+
+    def _create_lazy_init_file(self, output_dir: Path):
+        template = Template('''# Auto-generated package: names are imported on first access (PEP 562)
+import importlib
+
+_MODULES = {
+    {% for name, module in modules %}
+    "{{ name }}": "{{ module }}",
+    {% endfor %}
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
+''')
+        modules = [(cls["name"], f".models.{self.model_modules[cls['name']]}") for cls in self.classes_info]
+        for module, names in self.package_exports:
+            modules.extend((name, f".{module}") for name in names)
+        (output_dir / "__init__.py").write_text(template.render(modules=modules), encoding='utf-8')
+
+    def _module_names(self) -> Dict[str, str]:
+        modules = {}
+        used = set()
+        for cls in self.classes_info:
+            base = re.sub(r"(?<!^)(?=[A-Z])", "_", cls["name"]).lower()
+            module = base
+            index = 1
+            while module in used or keyword.iskeyword(module):
+                index += 1
+                module = f"{base}_{index}"
+            used.add(module)
+            modules[cls["name"]] = module
+        return modules
 
     def _uri_to_name(self, uri: Union[URIRef, str]) -> str:
         uri_str = str(uri)
         return uri_str.split('#')[-1] if '#' in uri_str else uri_str.split('/')[-1]
 
-    def _get_class_comment(self, g: Graph, class_uri: URIRef) -> Optional[str]:
-        comment = g.value(class_uri, RDFS.comment)
-        return str(comment) if comment else None
-
-    def _get_property_comment(self, g: Graph, prop: URIRef) -> Optional[str]:
-        comment = g.value(prop, RDFS.comment)
+    def _get_comment(self, index: OntologyGraphIndex, uri: URIRef) -> Optional[str]:
+        comment = index.comments.get(uri)
         return str(comment) if comment else None
 
-    def _get_property_domain(self, g: Graph, prop: URIRef) -> Optional[str]:
-        domain = g.value(prop, RDFS.domain)
-        return self._uri_to_name(domain) if domain else None
-
-    def _get_property_range(self, g: Graph, prop: URIRef, prop_type: str) -> str:
+    def _get_property_range(self, range_: Optional[URIRef], prop_type: str) -> str:
         if prop_type == "DatatypeProperty":
-            range_ = g.value(prop, RDFS.range)
             if str(range_) == str(XSD.string):
                 return "str"
             elif str(range_) == str(XSD.integer):
@@ -513,13 +1393,17 @@ class {{ cls.name }}{% if cls.parent_classes %}({{ cls.parent_classes|join(', ')
                 return "bool"
             return "str"
         else:
-            range_ = g.value(prop, RDFS.range)
             return self._uri_to_name(range_) if range_ else "Any"
 
-
 def generate_python_classes(owl_file: str, base_output_dir: str = "generated",
                           hydra_mode: bool = False, version: str = None,
-                          previous_version: str = None, folder_prefix: str = None) -> str:
+                          previous_version: str = None, folder_prefix: str = None,
+                          identity_map: bool = False, columnar: bool = False,
+                          loaders: bool = False, validators: bool = False, sharded: bool = False,
+                          schema_yaml: bool = False, subtrees: Optional[List[str]] = None,
+                          graph: Optional[Graph] = None, previous_graph: Optional[Graph] = None,
+                          migration_rules: Optional[Dict] = None,
+                          progress: Optional[ProgressCallback] = None) -> str:
     converter = OwlToPythonConverter()
     return converter.convert(
         owl_file=owl_file,
@@ -527,12 +1411,25 @@ def generate_python_classes(owl_file: str, base_output_dir: str = "generated",
         hydra_mode=hydra_mode,
         version=version,
         previous_version=previous_version,
-        folder_prefix=folder_prefix
+        folder_prefix=folder_prefix,
+        identity_map=identity_map,
+        columnar=columnar,
+        loaders=loaders,
+        validators=validators,
+        sharded=sharded,
+        schema_yaml=schema_yaml,
+        subtrees=subtrees,
+        graph=graph,
+        previous_graph=previous_graph,
+        migration_rules=migration_rules,
+        progress=progress
     )
 
 if __name__ == "__main__":
     import argparse
 
+    logging.basicConfig(level=logging.INFO)
+
     parser = argparse.ArgumentParser(description="Convert OWL ontology to Python classes")
     parser.add_argument("owl_file", help="Path to input OWL file")
     parser.add_argument("--output", default="generated", help="Output directory")
@@ -540,6 +1437,13 @@ if __name__ == "__main__":
     parser.add_argument("--version", help="Override ontology version")
     parser.add_argument("--previous", help="Path to previous version OWL file for migration")
     parser.add_argument("--prefix", help="Custom folder name prefix")
+    parser.add_argument("--identity-map", action="store_true", help="Generate an identity-mapped object registry")
+    parser.add_argument("--columnar", action="store_true", help="Generate NumPy-backed columnar table classes")
+    parser.add_argument("--loaders", action="store_true", help="Generate streaming CSV/JSONL loaders")
+    parser.add_argument("--validators", action="store_true", help="Generate precompiled runtime validators")
+    parser.add_argument("--sharded", action="store_true", help="Write one lazily imported module per class")
+    parser.add_argument("--schema-yaml", action="store_true", help="Also write the Hydra class schema to hydra_config/ontology.yaml")
+    parser.add_argument("--subtree", action="append", help="Only generate this class and its subclasses (repeatable)")
     args = parser.parse_args()
 
     try:
@@ -549,7 +1453,14 @@ if __name__ == "__main__":
             args.hydra,
             args.version,
             args.previous,
-            args.prefix
+            args.prefix,
+            args.identity_map,
+            args.columnar,
+            args.loaders,
+            args.validators,
+            args.sharded,
+            args.schema_yaml,
+            args.subtree
         )
         print(f"Successfully generated code in: {output_path}")
     except Exception as e:
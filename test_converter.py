@@ -0,0 +1,90 @@
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+from converter import OntologyConverter
+
+SOURCE = """classes:
+  Person:
+    comment: A person
+    properties:
+      name: {type: data, range: string}
+  Student:
+    parent: Person
+    properties:
+      name: {type: data, range: string}
+      courses: {type: data, range: string, maxCardinality: 3}
+"""
+
+
+def fresh_graph(source, tmp_path) -> Graph:
+    converter = OntologyConverter()
+    converter.convert(str(source), str(tmp_path / "fresh.owl"))
+    return converter.graph
+
+
+def test_update_matches_full_conversion(tmp_path):
+    source = tmp_path / "uni.yaml"
+    owl_file = tmp_path / "uni.owl"
+    source.write_text(SOURCE, encoding="utf-8")
+    converter = OntologyConverter()
+
+    changes = converter.update(str(source), str(owl_file))
+    assert changes == {'added': ['Person', 'Student'], 'changed': [], 'removed': []}
+    assert converter.update(str(source), str(owl_file)) == {'added': [], 'changed': [], 'removed': []}
+
+    # Student stops declaring the shared "name" property, which Person still owns
+    source.write_text(
+        SOURCE.replace("      name: {type: data, range: string}\n      courses", "      courses")
+        + "  Course:\n    properties:\n      title: {type: data, range: string}\n",
+        encoding="utf-8"
+    )
+    assert converter.update(str(source), str(owl_file)) == {'added': ['Course'], 'changed': ['Student'], 'removed': []}
+    assert isomorphic(converter.graph, fresh_graph(source, tmp_path))
+    assert isomorphic(Graph().parse(owl_file), converter.graph)
+
+    source.write_text(SOURCE.split("  Student:")[0], encoding="utf-8")
+    changes = converter.update(str(source), str(owl_file))
+    assert changes == {'added': [], 'changed': [], 'removed': ['Student', 'Course']}
+    assert isomorphic(converter.graph, fresh_graph(source, tmp_path))
+
+
+def test_convert_keeps_no_update_state(tmp_path):
+    source = tmp_path / "uni.yaml"
+    source.write_text(SOURCE, encoding="utf-8")
+    converter = OntologyConverter()
+    converter.convert(str(source), str(tmp_path / "uni.owl"))
+
+    assert not converter._owned
+    assert converter.update(str(source), str(tmp_path / "uni.owl"))['added'] == ['Person', 'Student']
+
+
+def test_convert_many_merges_fragments_and_reports_conflicts(tmp_path):
+    people = tmp_path / "people.yaml"
+    people.write_text(SOURCE.split("  Student:")[0], encoding="utf-8")
+    students = tmp_path / "students.yaml"
+    student = SOURCE.split("  Student:")[1].replace("      name: {type: data, range: string}\n", "")
+    students_source = "classes:\n  Student:" + student
+    students.write_text(students_source, encoding="utf-8")
+    combined = tmp_path / "combined.yaml"
+    combined.write_text(people.read_text(encoding="utf-8") + students_source[len("classes:\n"):], encoding="utf-8")
+
+    converter = OntologyConverter()
+    conflicts = converter.convert_many([str(people), str(students)], str(tmp_path / "merged.owl"), max_workers=2)
+    assert conflicts == []
+    assert isomorphic(converter.graph, fresh_graph(combined, tmp_path))
+
+    retyped = tmp_path / "retyped.yaml"
+    retyped.write_text(
+        "classes:\n  Person:\n    properties:\n      name: {type: data, range: integer}\n", encoding="utf-8"
+    )
+    conflicts = converter.convert_many([str(people), str(retyped)], str(tmp_path / "merged.owl"))
+    assert sorted((conflict.kind, conflict.name) for conflict in conflicts) == [
+        ('duplicate_class', 'Person'), ('property_range', 'name')
+    ]
+    try:
+        converter.convert_many([str(people), str(retyped)], str(tmp_path / "strict.owl"), strict=True)
+    except ValueError as e:
+        assert "Person" in str(e)
+    else:
+        raise AssertionError("strict merge accepted conflicting fragments")
+    assert not (tmp_path / "strict.owl").exists()
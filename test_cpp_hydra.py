@@ -1,8 +1,11 @@
 import os
 import logging
+import shutil
+import subprocess
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 import pytest
+from converter import OntologyConverter
 from owl_to_cpp import generate_cpp_from_owl
 
 BASE_DIR = Path(__file__).parent
@@ -162,5 +165,104 @@ def test_cpp_hydra():
         print(generate_report(changes))
 
 
+def compile_and_run(src_dir: Path, includes: List[str], main_body: str) -> str:
+    if shutil.which("g++") is None:
+        pytest.skip("g++ is not installed")
+
+    main_file = src_dir / "test_main.cpp"
+    main_file.write_text(
+        "".join(f'#include "{include}"\n' for include in includes)
+        + f"int main() {{\n{main_body}\n}}\n",
+        encoding="utf-8"
+    )
+    sources = [str(main_file)] + [str(src_dir / name) for name in os.listdir(src_dir)
+                                  if name.startswith("OntologyData") and name.endswith(".cpp")]
+    binary = src_dir / "test_main"
+    subprocess.run(["g++", "-std=c++17", "-o", str(binary)] + sources, check=True, capture_output=True)
+    return subprocess.run([str(binary)], check=True, capture_output=True, text=True).stdout
+
+
+def test_cpp_visitor_sees_filled_slots(tmp_path):
+    source = tmp_path / "bounded.yaml"
+    source.write_text(
+        "classes:\n"
+        "  Sensor:\n"
+        "    properties:\n"
+        "      readings: {type: data, range: integer, maxCardinality: 4}\n"
+        "      label: {type: data, range: string}\n",
+        encoding="utf-8"
+    )
+    owl_file = tmp_path / "bounded.owl"
+    OntologyConverter().convert(str(source), str(owl_file))
+    output_dir = Path(generate_cpp_from_owl(str(owl_file), str(tmp_path / "out")))
+
+    output = compile_and_run(output_dir / "src", ["Sensor.cpp"], """
+    Sensor sensor;
+    sensor.addReadings(7);
+    sensor.addReadings(9);
+    sensor.for_each_field([](const char* name, const auto& value) {
+        if constexpr (!std::is_same_v<std::decay_t<decltype(value)>, std::string>) {
+            std::cout << name << ":";
+            for (int reading : value) std::cout << " " << reading;
+            std::cout << "\\n";
+        }
+    });
+    """)
+    assert output == "readings: 7 9\n"
+
+
+def test_cpp_individuals_link_objects(tmp_path):
+    output_dir = Path(generate_cpp_from_owl(str(BASE_DIR / "uni_ind.owl"), str(tmp_path)))
+
+    output = compile_and_run(output_dir / "src", ["OntologyData.hpp"], """
+    OntologyData data = load_ontology_data();
+    Schedule* schedule = data.studentIndex.at("st1")->getEnrolledin()->getSchedule();
+    std::cout << (schedule == data.scheduleIndex.at("sch1")) << " "
+              << schedule->getRoom()->getCapacity() << " "
+              << data.professorIndex.at("prof1")->getTeachesCount() << "\\n";
+    """)
+    assert output == "1 30 2\n"
+
+
+def test_cpp_fields_with_multiple_inheritance(tmp_path):
+    output_dir = Path(generate_cpp_from_owl(str(BASE_DIR / "uni_multi.owl"), str(tmp_path)))
+
+    output = compile_and_run(output_dir / "src", ["A.cpp", "B.cpp", "P.cpp", "C.cpp"], """
+    C c;
+    c.setA1("a");
+    c.setB1(true);
+    c.setC1(3);
+    c.for_each_field([](const char* name, const auto&) { std::cout << name << " "; });
+    std::cout << C::field_count << " " << c.getA1() << c.getB1() << c.getC1() << "\\n";
+    """)
+    assert output == "a2 a1 b1 p1 c1 5 a13\n"
+
+
+def test_cpp_migration_adapter_applies_rules(tmp_path):
+    rules = {
+        "field_renames": {"name": "fullName"},
+        "added_fields": {"email": {"type": "str", "default": ""}, "age": {"type": "int", "default": 0}},
+        "type_changes": {"age": {"old": "str", "new": "int"}, "score": {"old": "int", "new": "float"}}
+    }
+    output_dir = Path(generate_cpp_from_owl(str(BASE_DIR / "uni_3.owl"), str(tmp_path),
+                                            previous_version=str(BASE_DIR / "uni_2.owl"), migration_rules=rules))
+
+    output = compile_and_run(output_dir / "src", ["OntologyAdapter.hpp", "iostream"], """
+    using Value = OntologyAdapter::Value;
+    OntologyAdapter::Payload data{
+        {"st1", {{"name", Value{std::string("Ann")}}, {"age", Value{std::string("21")}}, {"score", Value{4LL}}}},
+        {"st2", {{"name", Value{std::string("Bob")}}, {"age", Value{std::string("n/a")}}}}
+    };
+    OntologyAdapter::migrate(data, OntologyAdapter::PREVIOUS_VERSION);
+    for (const char* key : {"st1", "st2"}) {
+        auto& entity = data.at(key);
+        std::cout << std::get<std::string>(entity.at("fullName")) << " " << entity.count("name") << " "
+                  << std::get<long long>(entity.at("age")) << " " << entity.count("email") << " "
+                  << (entity.count("score") ? std::get<double>(entity.at("score")) : -1.0) << "\\n";
+    }
+    """)
+    assert output == "Ann 0 21 1 4\nBob 0 0 1 -1\n"
+
+
 if __name__ == "__main__":
     test_cpp_hydra()
@@ -0,0 +1,27 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+
+
+def test_multirun_sweeps_ontologies_and_targets(tmp_path):
+    subprocess.run([
+        sys.executable, str(BASE_DIR / "generate_app.py"), "--multirun",
+        f"ontology={BASE_DIR / 'uni_2.owl'},{BASE_DIR / 'uni_3.owl'}",
+        "target=python,java",
+        f"output={tmp_path / 'generated'}",
+        f"cache_dir={tmp_path / 'cache'}",
+        f"hydra.sweep.dir={tmp_path / 'multirun'}",
+        "hydra.launcher.n_jobs=2"
+    ], cwd=tmp_path, check=True, capture_output=True, timeout=300)
+
+    jobs = [json.loads(path.read_text(encoding="utf-8")) for path in (tmp_path / "multirun").glob("*/timing.json")]
+    assert sorted((Path(job["ontology"]).name, job["target"]) for job in jobs) == [
+        ("uni_2.owl", "java"), ("uni_2.owl", "python"), ("uni_3.owl", "java"), ("uni_3.owl", "python")
+    ]
+    for job in jobs:
+        assert Path(job["output"]).is_dir()
+        assert job["seconds"]["total"] >= job["seconds"]["generate"]
+    assert sorted(path.name for path in (tmp_path / "generated").iterdir()) == ["uni_2_v1_1_0", "uni_3_v2_0_0"]
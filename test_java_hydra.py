@@ -3,6 +3,7 @@ import javalang
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Any
 import semver
+from owl_to_java import generate_java_classes
 
 BASE_DIR = Path(__file__).parent
 GENERATED_DIR = BASE_DIR / "generated"
@@ -233,5 +234,63 @@ def main():
         print(generate_report(name, changes))
 
 
+def parse_java_class(java_dir: Path, name: str) -> javalang.tree.ClassDeclaration:
+    tree = javalang.parse.parse((java_dir / f"{name}.java").read_text(encoding="utf-8"))
+    return next(node for _, node in tree.filter(javalang.tree.ClassDeclaration) if node.name == name)
+
+
+def full_constructor_types(node: javalang.tree.ClassDeclaration) -> List[str]:
+    constructor = max(node.constructors, key=lambda constructor: len(constructor.parameters))
+    return [param.type.name for param in constructor.parameters]
+
+
+def test_java_super_call_matches_parent_with_multiple_inheritance(tmp_path):
+    output_dir = Path(generate_java_classes(str(BASE_DIR / "uni_multi.owl"), str(tmp_path), immutable=True))
+    java_dir = output_dir / "main" / "java" / "generated"
+
+    for name, parent in (("P", "A"), ("C", "P")):
+        node = parse_java_class(java_dir, name)
+        constructor = max(node.constructors, key=lambda constructor: len(constructor.parameters))
+        types = {param.name: param.type.name for param in constructor.parameters}
+        call = next(statement.expression for statement in constructor.body
+                    if isinstance(getattr(statement, "expression", None), javalang.tree.SuperConstructorInvocation))
+        assert [types[argument.member] for argument in call.arguments] == full_constructor_types(
+            parse_java_class(java_dir, parent)
+        )
+    assert full_constructor_types(parse_java_class(java_dir, "C")) == ["int", "String", "boolean", "String", "int"]
+
+
+def test_java_immutable_classes_with_equals_and_hash(tmp_path):
+    output_dir = Path(generate_java_classes(str(BASE_DIR / "uni_3.owl"), str(tmp_path), equals_hash=True, immutable=True))
+    student = parse_java_class(output_dir / "main" / "java" / "generated", "Student")
+
+    fields = {declarator.name: field for field in student.fields for declarator in field.declarators}
+    assert all("final" in fields[name].modifiers for name in ("enrolledIn", "advisor", "studentId"))
+    assert "transient" in fields["cachedHash"].modifiers
+    methods = {method.name: method for method in student.methods}
+    assert not any(name.startswith("set") for name in methods)
+    assert {"equals", "hashCode"} <= set(methods)
+
+    equals_calls = {node.member for _, node in methods["equals"].filter(javalang.tree.SuperMethodInvocation)}
+    assert equals_calls == {"equals"}
+    hash_fields = {node.member for _, node in methods["hashCode"].filter(javalang.tree.MemberReference)}
+    assert "cachedHash" in hash_fields
+
+    builder = next(node for node in student.body if isinstance(node, javalang.tree.ClassDeclaration))
+    assert builder.name == "Builder"
+    assert [method.name for method in builder.methods][-1] == "build"
+
+
+def test_java_mutable_classes_with_equals_and_hash(tmp_path):
+    output_dir = Path(generate_java_classes(str(BASE_DIR / "uni_3.owl"), str(tmp_path), equals_hash=True))
+    student = parse_java_class(output_dir / "main" / "java" / "generated", "Student")
+
+    fields = {declarator.name for field in student.fields for declarator in field.declarators}
+    methods = {method.name.lower() for method in student.methods}
+    assert "cachedHash" not in fields
+    assert {"setenrolledin", "setadvisor", "setstudentid", "equals", "hashcode"} <= methods
+    assert not any(isinstance(node, javalang.tree.ClassDeclaration) for node in student.body)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from rdflib import Graph
+
+from ontology_browser import OntologyBrowserModel, PrefixIndex
+
+BASE_DIR = Path(__file__).parent
+
+
+def test_prefix_index_matches_word_starts():
+    index = PrefixIndex(["GraduateStudent", "Student", "student_group", "Course", "StudyPlan"])
+
+    assert index.search("stud") == ["Student", "student_group", "StudyPlan", "GraduateStudent"]
+    assert index.search("STUDENT") == ["Student", "student_group", "GraduateStudent"]
+    assert index.search("group") == ["student_group"]
+    assert index.search("stud", limit=2) == ["Student", "student_group"]
+    assert index.search("x") == []
+
+
+def test_browser_model_searches_classes():
+    model = OntologyBrowserModel(Graph().parse(BASE_DIR / "uni_3.owl"))
+
+    assert model.search("p") == ["Person", "Professor"]
+    assert model.search("sch", limit=1) == ["Schedule"]
+    assert len(model.search("")) == len(model)
@@ -0,0 +1,26 @@
+import os
+import shutil
+from pathlib import Path
+
+import ontology_cache
+from ontology_cache import clear_memory_cache, load_ontology
+
+BASE_DIR = Path(__file__).parent
+
+
+def test_load_ontology_keeps_one_version_per_file(tmp_path):
+    clear_memory_cache()
+    owl_file = tmp_path / "uni.owl"
+    shutil.copy(BASE_DIR / "uni_3.owl", owl_file)
+
+    first = load_ontology(owl_file)
+    assert load_ontology(owl_file) is first
+
+    shutil.copy(BASE_DIR / "uni_2.owl", owl_file)
+    stat = owl_file.stat()
+    os.utime(owl_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = load_ontology(owl_file)
+
+    assert second is not first
+    assert list(ontology_cache._loaded.values()) == [second]
+    clear_memory_cache()
@@ -0,0 +1,44 @@
+from typing import Dict
+
+from ontology_core import ClassHierarchy, OntologyVersionManager
+
+
+def make_class(name: str, *parents: str) -> Dict:
+    return {"name": name, "parent_classes": list(parents), "comment": ""}
+
+
+def test_hierarchy_ignores_self_loops():
+    hierarchy = ClassHierarchy([make_class("Thing", "Thing"), make_class("Person", "Thing")], [])
+
+    assert hierarchy.parents("Thing") == []
+    assert hierarchy.roots() == ["Thing"]
+    assert hierarchy.ancestors("Person") == ["Thing"]
+
+
+def test_hierarchy_breaks_only_cycle_edges():
+    classes = [make_class("D", "C"), make_class("C", "E", "A"), make_class("E", "C"), make_class("A")]
+    hierarchy = ClassHierarchy(classes, [])
+
+    assert hierarchy.parents("C") == ["A"]
+    assert hierarchy.parents("E") == []
+    assert hierarchy.parents("D") == ["C"]
+    assert hierarchy.ancestors("D") == ["A", "C"]
+    # The caller's class records are left as they were
+    assert classes[1]["parent_classes"] == ["E", "A"]
+
+
+def test_apply_migration_renames_adds_and_converts():
+    rules = {
+        "field_renames": {"name": "fullName"},
+        "added_fields": {"email": {"type": "str", "default": ""}, "age": {"type": "int", "default": 0}},
+        "type_changes": {"age": {"old": "str", "new": "int"}, "score": {"old": "int", "new": "float"}}
+    }
+    data = {"st1": {"name": "Ann", "age": "21", "score": 4}, "st2": {"name": "Bob", "age": "n/a"}}
+
+    migrated = OntologyVersionManager.apply_migration(rules, data)
+
+    assert migrated == {
+        "st1": {"fullName": "Ann", "age": 21, "score": 4.0, "email": ""},
+        "st2": {"fullName": "Bob", "age": 0, "email": ""}
+    }
+    assert data["st1"]["name"] == "Ann"
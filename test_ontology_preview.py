@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+from rdflib import Graph
+
+from converter import OntologyConverter
+from ontology_core import OntologyGraphIndex, OntologyVersionManager
+from ontology_preview import preview_file
+
+BASE_DIR = Path(__file__).parent
+
+
+def graph_counts(graph: Graph):
+    index = OntologyGraphIndex(graph)
+    return len(index.classes), len(index.object_properties), len(index.datatype_properties)
+
+
+@pytest.mark.parametrize("name", ["uni_ind.owl", "uni_multi.owl"])
+def test_owl_preview_matches_parsed_graph(name):
+    preview = preview_file(BASE_DIR / name)
+    graph = Graph().parse(BASE_DIR / name)
+
+    assert (preview.classes, preview.object_properties, preview.datatype_properties) == graph_counts(graph)
+    assert preview.format == "owl" and preview.estimated_convert_seconds is None
+    assert preview.version == OntologyVersionManager.load_version(graph)
+
+
+def test_owl_preview_counts_individuals_and_depth():
+    assert preview_file(BASE_DIR / "uni_ind.owl").individuals == 6
+    # C -> P -> A
+    assert preview_file(BASE_DIR / "uni_multi.owl").depth == 2
+
+
+@pytest.mark.parametrize("name", ["uni_1.yaml", "uni_2.json", "uni_3.xml"])
+def test_source_preview_matches_conversion(name, tmp_path):
+    preview = preview_file(BASE_DIR / name)
+    converter = OntologyConverter()
+    converter.convert(str(BASE_DIR / name), str(tmp_path / "out.owl"))
+
+    assert (preview.classes, preview.object_properties, preview.datatype_properties) == graph_counts(converter.graph)
+    assert preview.estimated_convert_seconds > 0 and preview.estimated_generate_seconds > 0
+
+
+def test_preview_rejects_unknown_and_missing_files(tmp_path):
+    (tmp_path / "notes.txt").write_text("", encoding="utf-8")
+    with pytest.raises(ValueError):
+        preview_file(tmp_path / "notes.txt")
+    with pytest.raises(FileNotFoundError):
+        preview_file(tmp_path / "missing.owl")
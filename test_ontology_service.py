@@ -0,0 +1,43 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ontology_service
+from ontology_service import OntologyService
+
+
+def test_converts_to_one_output_run_one_at_a_time(tmp_path, monkeypatch):
+    running = []
+    overlaps = []
+    guard = threading.Lock()
+
+    def fake_run(endpoint, params):
+        with guard:
+            overlaps.extend(output for output in running if output == params["output"])
+            running.append(params["output"])
+        time.sleep(0.05)
+        with guard:
+            running.remove(params["output"])
+        return params["version"]
+
+    monkeypatch.setattr(ontology_service, "_run", fake_run)
+    service = OntologyService(workers=1)
+    service.pool.shutdown()
+    service.pool = ThreadPoolExecutor(max_workers=4)
+
+    async def convert_all():
+        shared = str(tmp_path / "uni.owl")
+        requests = [
+            {"source": str(tmp_path / "uni.yaml"), "output": shared, "version": "1.0.0"},
+            {"source": str(tmp_path / "uni.yaml"), "output": shared, "version": "1.1.0"},
+            {"source": str(tmp_path / "other.yaml"), "output": shared, "version": "2.0.0"},
+            {"source": str(tmp_path / "other.yaml"), "output": str(tmp_path / "other.owl"), "version": "3.0.0"}
+        ]
+        return await asyncio.gather(*(service.call("convert", params) for params in requests))
+
+    try:
+        assert asyncio.run(convert_all()) == ["1.0.0", "1.1.0", "2.0.0", "3.0.0"]
+    finally:
+        service.close()
+    assert overlaps == []
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from ontology_cache import load_ontology
+from ontology_core import ConversionCancelled
+from ontology_targets import TARGETS, generate_targets
+
+BASE_DIR = Path(__file__).parent
+
+
+def read_tree(root: Path):
+    # Python and C++ both write CHANGES.md into the shared output folder; the last one wins
+    return {
+        path.relative_to(root): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file() and "__pycache__" not in path.parts and path.name != "CHANGES.md"
+    }
+
+
+def test_parallel_targets_match_in_process_run(tmp_path):
+    ontology = load_ontology(BASE_DIR / "uni_ind.owl")
+    previous = load_ontology(BASE_DIR / "uni_2.owl")
+    stages = []
+
+    parallel = generate_targets(ontology, tmp_path / "parallel", previous=previous, max_workers=3,
+                                progress=lambda stage, done, total: stages.append(stage))
+    serial = generate_targets(ontology, tmp_path / "serial", previous=previous, max_workers=1)
+
+    assert all(result.ok for result in parallel.values())
+    assert list(parallel) == list(TARGETS)
+    assert read_tree(tmp_path / "parallel") == read_tree(tmp_path / "serial")
+    assert {stage.split(":")[0] for stage in stages} == set(TARGETS)
+
+
+def test_cancelling_progress_stops_parallel_targets(tmp_path):
+    ontology = load_ontology(BASE_DIR / "uni_3.owl")
+
+    def progress(stage, done, total):
+        raise ConversionCancelled(stage)
+
+    try:
+        generate_targets(ontology, tmp_path, max_workers=3, progress=progress)
+    except ConversionCancelled:
+        pass
+    else:
+        raise AssertionError("cancellation was ignored")
@@ -0,0 +1,27 @@
+import marshal
+from pathlib import Path
+
+from ontology_watch import OntologyWatcher
+
+BASE_DIR = Path(__file__).parent
+
+
+def test_watch_skips_unchanged_classes_and_keeps_bytecode(tmp_path):
+    source = tmp_path / "uni.yaml"
+    source.write_text((BASE_DIR / "uni_1.yaml").read_text(encoding="utf-8"), encoding="utf-8")
+    output_dir = tmp_path / "out"
+    watcher = OntologyWatcher([source], output_dir, targets=["python"], options={"python": {"sharded": True}},
+                              debounce=0)
+
+    [update] = watcher.poll()
+    assert update.ok and update.written
+    package_dir = Path(update.results["python"].output_dir)
+    compiled = list(package_dir.rglob("__pycache__/*.pyc"))
+    assert compiled
+    for pyc in compiled:
+        code = marshal.loads(pyc.read_bytes()[16:])
+        assert Path(code.co_filename).parent == pyc.parent.parent
+
+    with open(source, "a", encoding="utf-8") as f:
+        f.write("# formatting only\n")
+    assert watcher.poll() == []
@@ -1,7 +1,12 @@
 import os
 import ast
+import gc
+import importlib.util
+import sys
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Any
+from converter import OntologyConverter
+from owl_to_python import generate_python_classes
 
 BASE_DIR = Path(__file__).parent
 GENERATED_DIR = BASE_DIR / "generated"
@@ -161,5 +166,197 @@ def main():
         print(generate_report(name, changes))
 
 
+def import_generated(package_dir: Path, name: str):
+    spec = importlib.util.spec_from_file_location(
+        name, package_dir / "__init__.py", submodule_search_locations=[str(package_dir)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_registry_resolves_and_forgets_instances(tmp_path):
+    package_dir = generate_python_classes(str(BASE_DIR / "uni_3.owl"), str(tmp_path), identity_map=True)
+    package = import_generated(Path(package_dir), "generated_registry")
+
+    registry = package.OntologyRegistry()
+    student = registry.intern("st1", package.Student(enrolledIn=package.Reference("c1")))
+    assert [ref.key for ref in registry.resolve()] == ["c1"]
+
+    course = registry.intern("c1", package.Course(title="Algebra"))
+    assert registry.resolve() == []
+    assert student.enrolledIn is course
+
+    orphan = registry.intern("st2", package.Student(enrolledIn=package.Reference("missing")))
+    del orphan
+    gc.collect()
+    assert "st2" not in registry
+    assert registry.resolve() == []
+
+
+def test_models_with_multiple_inheritance(tmp_path):
+    package_dir = generate_python_classes(str(BASE_DIR / "uni_multi.owl"), str(tmp_path))
+    package = import_generated(Path(package_dir), "generated_multi")
+
+    c = package.C.from_config({"a1": "a", "a2": 2, "b1": True, "p1": "p", "c1": 3})
+    assert isinstance(c, package.A) and isinstance(c, package.B)
+    assert (c.a1, c.a2, c.b1, c.p1, c.c1) == ("a", 2, True, "p", 3)
+
+
+def test_from_configs_resolves_interpolations_into_typed_instances(tmp_path):
+    from datetime import date
+    from omegaconf import OmegaConf
+
+    package_dir = generate_python_classes(str(BASE_DIR / "uni_3.owl"), str(tmp_path), hydra_mode=True)
+    package = import_generated(Path(package_dir), "generated_configs")
+
+    cfg = OmegaConf.create({
+        "term_start": "2001-09-01",
+        "advisor": {"name": "Ada", "birthDate": "1815-12-10"},
+        "students": [
+            {"name": "Ann", "birthDate": "${term_start}", "advisor": "${advisor}"},
+            {"name": "Bob", "birthDate": "2002-01-${oc.env:BIRTH_DAY,15}"}
+        ]
+    })
+    students = package.Student.from_configs(cfg.students)
+
+    assert [student.name for student in students] == ["Ann", "Bob"]
+    assert [student.birthDate for student in students] == [date(2001, 9, 1), date(2002, 1, 15)]
+    assert isinstance(students[0].advisor, package.Professor)
+    assert students[0].advisor.birthDate == date(1815, 12, 10)
+    assert package.Professor.from_config(cfg.advisor).name == "Ada"
+
+
+def test_schema_yaml_matches_config_defaults(tmp_path):
+    import dataclasses
+    import yaml
+
+    assert not (Path(generate_python_classes(str(BASE_DIR / "uni_3.owl"), str(tmp_path / "plain"), hydra_mode=True))
+                / "hydra_config").exists()
+
+    package_dir = Path(generate_python_classes(str(BASE_DIR / "uni_3.owl"), str(tmp_path), hydra_mode=True, schema_yaml=True))
+    schema = yaml.safe_load((package_dir / "hydra_config" / "ontology.yaml").read_text(encoding="utf-8"))
+    import_generated(package_dir, "generated_schema")
+    hydra_configs = importlib.import_module("generated_schema.hydra_configs")
+    assert schema == hydra_configs.SCHEMA
+
+    expected = {"str": "", "int": 0, "bool": False}
+    for name, cls_schema in schema.items():
+        fields = {field.name: field for field in dataclasses.fields(hydra_configs.config_class(name))}
+        for prop_name, prop in cls_schema["properties"].items():
+            field = fields[prop_name]
+            if field.default_factory is list:
+                # Multi-valued fields start out empty whatever their range
+                continue
+            default = None if prop["type"] == "ObjectProperty" else expected.get(prop["range"])
+            assert field.default == default, f"{name}.{prop_name}"
+
+
+def test_bounded_properties_become_checked_tuples(tmp_path):
+    source = tmp_path / "bounded.yaml"
+    source.write_text(
+        "classes:\n"
+        "  Sensor:\n"
+        "    properties:\n"
+        "      readings: {type: data, range: integer, maxCardinality: 3}\n"
+        "      label: {type: data, range: string}\n",
+        encoding="utf-8"
+    )
+    owl_file = tmp_path / "bounded.owl"
+    OntologyConverter().convert(str(source), str(owl_file))
+    package_dir = generate_python_classes(str(owl_file), str(tmp_path / "out"))
+    package = import_generated(Path(package_dir), "generated_bounded")
+
+    assert package.Sensor().readings == ()
+    assert package.Sensor.from_config({"readings": [1, 2, 3]}).readings == (1, 2, 3)
+    try:
+        package.Sensor(readings=[1, 2, 3, 4])
+    except ValueError as e:
+        assert "at most 3" in str(e)
+    else:
+        raise AssertionError("a fourth reading was accepted")
+
+
+def test_tables_round_trip_instances_and_references(tmp_path):
+    package_dir = generate_python_classes(str(BASE_DIR / "uni_ind.owl"), str(tmp_path), columnar=True)
+    package = import_generated(Path(package_dir), "generated_columns")
+
+    courses = [package.Course(title="Algebra", credits=5), package.Course(title="Logic", credits=3)]
+    table = package.CourseTable.from_instances(courses)
+    table.append_batch({"title": ["Topology"], "credits": [4]})
+    assert len(table) == 3
+    assert table["credits"].tolist() == [5, 3, 4]
+    assert [course.title for course in table.filter(table["credits"] > 3).to_instances()] == ["Algebra", "Topology"]
+    assert table.to_instances()[:2] == courses
+
+    professor = package.Professor(name="Ada", teaches=(courses[1],))
+    professors = package.ProfessorTable.from_instances([professor], references={"teaches": courses})
+    assert professors.to_instances(references={"teaches": courses}) == [professor]
+
+
+def test_loaders_stream_typed_batches(tmp_path):
+    from datetime import date
+
+    package_dir = generate_python_classes(str(BASE_DIR / "uni_3.owl"), str(tmp_path), loaders=True)
+    package = import_generated(Path(package_dir), "generated_loaders")
+    csv_file = tmp_path / "professors.csv"
+    csv_file.write_text(
+        "name,birthDate,department\n"
+        "Ada,1815-12-10,Math\n"
+        "Alan,1912-06-23,\n"
+        "Grace,1906-12-09,Navy\n",
+        encoding="utf-8"
+    )
+    jsonl_file = tmp_path / "professors.jsonl"
+    jsonl_file.write_text('{"name": "Ada", "department": "Math"}\n\n{"name": "Alan"}\n', encoding="utf-8")
+
+    loader = package.RecordLoader("Professor", chunk_size=2)
+    batches = list(loader.iter_csv(str(csv_file)))
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert batches[0][0] == package.Professor(name="Ada", birthDate=date(1815, 12, 10), department="Math")
+    assert batches[0][1].department == ""
+
+    columns = list(loader.iter_jsonl(str(jsonl_file), columns=True))
+    assert columns == [{"name": ["Ada", "Alan"], "birthDate": [None, None], "teaches": [(), ()],
+                        "department": ["Math", ""]}]
+    parallel = list(loader.iter_parallel(str(csv_file), workers=2, block_size=16))
+    assert [row for batch in parallel for row in batch] == [row for batch in batches for row in batch]
+
+
+def test_sharded_package_imports_classes_on_first_use(tmp_path):
+    package_dir = generate_python_classes(str(BASE_DIR / "uni_3.owl"), str(tmp_path), sharded=True)
+    package = import_generated(Path(package_dir), "generated_sharded")
+
+    def loaded():
+        return {name.rsplit(".", 1)[1] for name in sys.modules if name.startswith("generated_sharded.models.")}
+
+    assert loaded() == set()
+    assert {"Student", "Course", "Professor"} <= set(package.__all__) <= set(dir(package))
+    student = package.Student(studentId="st1")
+    assert loaded() == {"person", "student"}
+    assert isinstance(student, package.Person)
+
+    advised = package.Student.from_config({"advisor": {"name": "Ada"}})
+    assert type(advised.advisor) is package.Professor
+    assert "course" not in loaded()
+
+
+def test_validate_columns_accepts_table_indexes(tmp_path):
+    package_dir = generate_python_classes(str(BASE_DIR / "uni_ind.owl"), str(tmp_path), columnar=True, validators=True)
+    package = import_generated(Path(package_dir), "generated_tables")
+    validators = sys.modules["generated_tables.validators"]
+
+    courses = [package.Course(title="Algebra"), package.Course(title="Logic")]
+    professor = package.Professor(name="Ada", teaches=tuple(courses))
+    table = package.ProfessorTable.from_instances([professor], references={"teaches": courses})
+    columns = {name: table[name] for name in table.DTYPE.names}
+    assert validators.validate_columns("Professor", columns) == []
+
+    columns["name"] = [42]
+    failures = validators.validate_columns("Professor", columns, raise_errors=False)
+    assert failures == [(0, "Professor.name: expected str, got int")]
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file